@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+📏 BENCHMARK DE REAMOSTRADORES
+==============================
+Para fontes de 44.1/48 kHz, a reamostragem para 16 kHz é uma parte
+visível do tempo de CPU. Este script mede, para cada reamostrador:
+- Vazão de decodificação (decodificação + reamostragem), em x tempo real
+- WER (taxa de erro de palavras) da transcrição do clipe de referência
+
+Com --reference, o WER é medido contra o texto correto. Sem ele, a
+transcrição com soxr_vhq serve de referência (WER relativo: mostra quanto
+cada reamostrador muda o resultado, não a qualidade absoluta).
+
+Uso:
+    python benchmark_reamostragem.py --file clipe_48k.wav --reference clipe.txt
+    python benchmark_reamostragem.py --file aula.mp3 --model base --repeat 5 --json resultado.json
+Depois: --resampler na CLI/API ou TRANSCRITOR_RESAMPLER na implantação.
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from typing import Dict, Any, List, Optional
+
+from decodificacao_audio import REAMOSTRADORES, TAXA_WHISPER, carregar_audio
+
+def normalizar_texto(texto: str) -> List[str]:
+    """Palavras em minúsculas, sem pontuação"""
+    return re.sub(r'[^\w\s]', ' ', texto.lower()).split()
+
+def taxa_erro_palavras(referencia: str, hipotese: str) -> float:
+    """WER = (substituições + inserções + remoções) / palavras da referência"""
+    ref, hip = normalizar_texto(referencia), normalizar_texto(hipotese)
+    if not ref:
+        return 0.0 if not hip else 1.0
+
+    # Distância de edição por palavras, uma linha da matriz por vez
+    anterior = list(range(len(hip) + 1))
+    for i, palavra_ref in enumerate(ref, 1):
+        atual = [i] + [0] * len(hip)
+        for j, palavra_hip in enumerate(hip, 1):
+            atual[j] = min(anterior[j] + 1, atual[j - 1] + 1,
+                           anterior[j - 1] + (palavra_ref != palavra_hip))
+        anterior = atual
+    return anterior[-1] / len(ref)
+
+def medir_decodificacao(arquivo: str, reamostrador: str, repeticoes: int) -> Dict[str, Any]:
+    """Melhor tempo de carregar_audio() em `repeticoes` execuções"""
+    tempos = []
+    audio = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        audio, _ = carregar_audio(arquivo, TAXA_WHISPER, reamostrador)
+        tempos.append(time.perf_counter() - inicio)
+    duracao = len(audio) / TAXA_WHISPER
+    melhor = min(tempos)
+    return {
+        'audio': audio,
+        'duration': duracao,
+        'decode_seconds': round(melhor, 4),
+        'decode_x_realtime': round(duracao / melhor, 1) if melhor > 0 else 0.0
+    }
+
+def transcrever(modelo_whisper, audio, idioma: Optional[str]) -> str:
+    resultado = modelo_whisper.transcribe(audio, language=idioma, temperature=0.0, fp16=False, verbose=None)
+    return resultado['text']
+
+def main():
+    parser = argparse.ArgumentParser(description="📏 Benchmark de reamostradores (vazão x WER)")
+    parser.add_argument('--file', '-f', required=True, help='Clipe de referência (de preferência 44.1/48 kHz, 30-120s)')
+    parser.add_argument('--reference', '-r', help='Texto correto do clipe (.txt); sem ele o WER é relativo a soxr_vhq')
+    parser.add_argument('--model', '-m', default='base', help='Modelo Whisper (padrão: base)')
+    parser.add_argument('--language', '-l', default='pt', help='Idioma ou auto (padrão: pt)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições da decodificação; vale o melhor tempo (padrão: 3)')
+    parser.add_argument('--backends', default=','.join(REAMOSTRADORES),
+                        help=f"Reamostradores separados por vírgula (padrão: {','.join(REAMOSTRADORES)})")
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(',') if b.strip()]
+    invalidos = [b for b in backends if b not in REAMOSTRADORES]
+    if invalidos:
+        print(f"❌ Reamostradores inválidos: {', '.join(invalidos)}. Opções: {', '.join(REAMOSTRADORES)}")
+        sys.exit(1)
+
+    import librosa
+    import whisper
+
+    idioma = None if args.language == 'auto' else args.language
+    taxa_original = librosa.get_samplerate(args.file)
+    print("📏 BENCHMARK DE REAMOSTRADORES")
+    print("=" * 70)
+    print(f"📁 Clipe: {args.file} ({taxa_original} Hz)")
+    print(f"🤖 Modelo: {args.model}")
+    print("=" * 70)
+
+    print(f"\n🤖 Carregando modelo Whisper '{args.model}'...")
+    modelo_whisper = whisper.load_model(args.model)
+
+    if args.reference:
+        with open(args.reference, 'r', encoding='utf-8') as f:
+            referencia = f.read()
+        origem_referencia = args.reference
+    else:
+        print("📝 Sem --reference: transcrevendo com soxr_vhq como referência...")
+        audio_ref, _ = carregar_audio(args.file, TAXA_WHISPER, 'soxr_vhq')
+        referencia = transcrever(modelo_whisper, audio_ref, idioma)
+        origem_referencia = 'soxr_vhq (relativo)'
+
+    resultados = []
+    for backend in backends:
+        print(f"\n⏱️  {backend}...")
+        try:
+            medida = medir_decodificacao(args.file, backend, max(1, args.repeat))
+        except ValueError as e:
+            print(f"  ⏭️  {e}")
+            resultados.append({'backend': backend, 'error': str(e)})
+            continue
+
+        texto = transcrever(modelo_whisper, medida.pop('audio'), idioma)
+        medida.update(backend=backend, wer=round(taxa_erro_palavras(referencia, texto), 4))
+        resultados.append(medida)
+        print(f"  ✅ {medida['decode_seconds']:.3f}s ({medida['decode_x_realtime']:.0f}x tempo real), "
+              f"WER {medida['wer']:.2%}")
+
+    print(f"\n{'=' * 70}")
+    print(f"📊 RESULTADOS (WER contra: {origem_referencia})")
+    print(f"{'=' * 70}")
+    print(f"{'Reamostrador':<14}{'Decodificação':>15}{'x tempo real':>14}{'WER':>10}")
+    for r in resultados:
+        if 'error' in r:
+            print(f"{r['backend']:<14}{'n/a (fonte não está em 16 kHz)':>39}")
+        else:
+            print(f"{r['backend']:<14}{r['decode_seconds']:>14.3f}s{r['decode_x_realtime']:>13.0f}x{r['wer']:>10.2%}")
+
+    validos = [r for r in resultados if 'error' not in r]
+    if validos:
+        melhor_wer = min(r['wer'] for r in validos)
+        # Mais rápido entre os que não pioram o WER em mais de 0,5 ponto percentual
+        candidatos = [r for r in validos if r['wer'] <= melhor_wer + 0.005]
+        escolhido = max(candidatos, key=lambda r: r['decode_x_realtime'])
+        print(f"\n💡 Sugestão: --resampler {escolhido['backend']} "
+              f"(mais rápido com WER até 0,5 p.p. do melhor)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'file': args.file, 'source_rate': taxa_original, 'model': args.model,
+                       'reference': origem_referencia, 'results': resultados}, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados em {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+🏁 SUITE DE BENCHMARK DE TRANSCRIÇÃO
+====================================
+Substitui o antigo teste_tecnologias.py, que media uma única execução de
+30s de um MP3 fora do repositório. Aqui cada caso é uma combinação de:
+- modelo (tiny, base, ...)
+- formato de entrada (wav, flac, ogg, mp3)
+- duração do áudio (segundos)
+- decodificador: file (librosa.load do caminho), memory (bytes via
+  SoundFile) ou stream (blocos de 30s)
+- reamostrador (soxr_hq, soxr_qq, polyphase, ...)
+- modo: plain (um transcribe), vad (só a fala) ou windows (janelas de
+  ~28s com prompt). O decodificador stream sempre usa janelas: stream x
+  windows é o mesmo caso que stream x plain e vira um só (vad = janelas
+  com VAD por janela)
+
+Cada caso roda num subprocesso novo (pico de RSS isolado, sem modelo ou
+cache aquecido por outro caso): carga do modelo, `--warmup` execuções
+descartadas e `--repeat` medidas. Relata mediana e p95 da latência
+(decodificação + inferência), fator de tempo real, pico de RSS e a
+mediana de cada etapa (CronometroEtapas).
+
+O áudio é gerado de forma determinística (semente fixa, 44.1 kHz, fala
+sintética com pausas) e guardado em --fixtures-dir: a mesma linha de
+comando mede sempre os mesmos arquivos, sem rede nem arquivos externos.
+Com --source, uma gravação real é cortada (ou repetida) na duração pedida.
+
+Uso:
+    python benchmark_transcricao.py run --models tiny,base --durations 30,120 --json atual.json
+    python benchmark_transcricao.py run --formats wav,mp3 --decoders file,memory,stream --modes plain,vad
+    python benchmark_transcricao.py compare baseline.json atual.json --tolerance 10
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import hashlib
+import argparse
+import platform
+import itertools
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+DIRETORIO_FIXTURES_PADRAO = os.environ.get(
+    'TRANSCRITOR_BENCHMARK_DIR',
+    str(Path.home() / '.cache' / 'transcritor' / 'benchmark')
+)
+TAXA_FIXTURE = 44100  # taxa comum de gravações: a reamostragem para 16 kHz entra na medida
+SEMENTE = 20240601
+FORMATOS = ('wav', 'flac', 'ogg', 'mp3')
+DECODIFICADORES = ('file', 'memory', 'stream')
+MODOS = ('plain', 'vad', 'windows')
+MARCADOR_RESULTADO = 'RESULTADO_BENCHMARK '
+VERSAO_FORMATO = 1
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil com interpolação linear (p em 0-100)"""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = (len(ordenados) - 1) * p / 100
+    baixo, alto = math.floor(posicao), math.ceil(posicao)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (posicao - baixo)
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memória residente deste processo"""
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024  # bytes no macOS, KB no Linux
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)  # Windows
+        except (ImportError, AttributeError):
+            return None
+
+# ---------------------------------------------------------------------------
+# Áudio de teste
+# ---------------------------------------------------------------------------
+
+def gerar_fala_sintetica(duracao: float, taxa: int = TAXA_FIXTURE, semente: int = SEMENTE):
+    """
+    Sinal determinístico com a estrutura de fala: sílabas (~4 Hz) com
+    harmônicos de uma f0 que varia, separadas por pausas e ruído de fundo.
+    Não tem palavras; serve para medir tempo, não qualidade.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(semente)
+    total = int(duracao * taxa)
+    audio = (rng.standard_normal(total) * 0.002).astype(np.float32)  # ruído de fundo
+    posicao = int(rng.uniform(0.2, 0.8) * taxa)
+    while posicao < total:
+        fala = int(rng.uniform(0.6, 3.0) * taxa)
+        fim = min(total, posicao + fala)
+        t = np.arange(fim - posicao) / taxa
+        f0 = rng.uniform(100, 220) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+        fase = 2 * np.pi * np.cumsum(f0) / taxa
+        voz = sum(np.sin(k * fase) / k for k in range(1, 8))
+        silabas = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t), 0, None) ** 2
+        audio[posicao:fim] += (0.2 * voz * silabas).astype(np.float32)
+        posicao = fim + int(rng.uniform(0.2, 1.5) * taxa)  # pausa
+    return audio
+
+def preparar_fixture(diretorio: str, formato: str, duracao: float, fonte: Optional[str] = None) -> str:
+    """Caminho do áudio de teste (gerado uma vez e reaproveitado)"""
+    import numpy as np
+    import soundfile as sf
+
+    if fonte:
+        with open(fonte, 'rb') as f:
+            origem = hashlib.sha256(f.read()).hexdigest()[:12]
+    else:
+        origem = f"sintetico{SEMENTE}"
+    caminho = Path(diretorio) / f"{origem}_{duracao:g}s_{TAXA_FIXTURE}.{formato}"
+    if caminho.exists():
+        return str(caminho)
+
+    if fonte:
+        import librosa
+        base, _ = librosa.load(fonte, sr=TAXA_FIXTURE)
+        repeticoes = math.ceil(duracao * TAXA_FIXTURE / max(1, len(base)))
+        audio = np.tile(base, repeticoes)[:int(duracao * TAXA_FIXTURE)]
+    else:
+        audio = gerar_fala_sintetica(duracao)
+
+    formato_sf = formato.upper()
+    if formato_sf not in sf.available_formats():
+        raise ValueError(f"libsndfile desta máquina não grava {formato}")
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(f".tmp.{formato}")
+    subtipo = 'VORBIS' if formato == 'ogg' else None
+    sf.write(str(temporario), audio, TAXA_FIXTURE, format=formato_sf, subtype=subtipo)
+    os.replace(temporario, caminho)
+    return str(caminho)
+
+# ---------------------------------------------------------------------------
+# Execução de um caso (no subprocesso)
+# ---------------------------------------------------------------------------
+
+def identificador_caso(caso: Dict[str, Any]) -> str:
+    return (f"{caso['model']}/{caso['format']}/{caso['duration']:g}s/"
+            f"{caso['decoder']}/{caso['resampler']}/{caso['mode']}")
+
+def executar_caso(caso: Dict[str, Any]) -> Dict[str, Any]:
+    """Carrega o modelo, aquece e mede `repeat` execuções de decodificação + inferência"""
+    from motor_inferencia import configurar_threads_torch
+    if caso.get('threads'):
+        configurar_threads_torch(caso['threads'])
+
+    from cronometro_etapas import CronometroEtapas, etapa, instrumentar_whisper
+    from decodificacao_audio import (configurar_reamostrador, decodificar_audio, decodificar_em_blocos,
+                                     TAXA_WHISPER)
+    from deteccao_voz import aplicar_vad
+    from transcricao_longa import transcrever_em_janelas, transcrever_em_fluxo
+    import whisper
+
+    configurar_reamostrador(caso['resampler'])
+    inicio = time.perf_counter()
+    modelo = whisper.load_model(caso['model'])
+    carga_modelo = time.perf_counter() - inicio
+    instrumentar_whisper()
+
+    opcoes = {'language': caso['language'], 'temperature': 0.0, 'fp16': False, 'verbose': None}
+    caminho, sufixo = caso['fixture'], Path(caso['fixture']).suffix
+    executar = lambda funcao, *args: funcao(lambda _nome: modelo, *args)
+    usar_vad = caso['mode'] == 'vad'
+
+    def uma_execucao() -> Dict[str, float]:
+        with CronometroEtapas() as cronometro:
+            inicio = time.perf_counter()
+            if caso['decoder'] == 'stream':
+                janelas = transcrever_em_fluxo(executar, decodificar_em_blocos(caminho, sufixo), TAXA_WHISPER,
+                                               caso['model'], opcoes, vad=usar_vad)
+                texto = ''.join(seg['text'] for janela in janelas for seg in janela['segments'])
+            else:
+                if caso['decoder'] == 'memory':
+                    with open(caminho, 'rb') as f:
+                        fonte = f.read()
+                else:
+                    fonte = caminho
+                audio, sr, _ = decodificar_audio(fonte, sufixo, usar_cache_pcm=False)
+                if usar_vad:
+                    audio, _, _ = aplicar_vad(audio, sr)
+                if caso['mode'] == 'windows':
+                    janelas = transcrever_em_janelas(executar, audio, sr, caso['model'], opcoes)
+                    texto = ''.join(seg['text'] for janela in janelas for seg in janela['segments'])
+                else:
+                    with etapa('inference'):
+                        texto = modelo.transcribe(audio, **opcoes)['text']
+            latencia = time.perf_counter() - inicio
+        return {'latency': latencia, 'stages': cronometro.como_dict(), 'characters': len(texto)}
+
+    for _ in range(caso['warmup']):
+        uma_execucao()
+    medidas = [uma_execucao() for _ in range(caso['repeat'])]
+
+    latencias = [m['latency'] for m in medidas]
+    etapas = sorted({nome for m in medidas for nome in m['stages']})
+    mediana = percentil(latencias, 50)
+    return {
+        'latencies': [round(v, 4) for v in latencias],
+        'median_seconds': round(mediana, 4),
+        'p95_seconds': round(percentil(latencias, 95), 4),
+        'rtf': round(mediana / caso['duration'], 4),
+        'peak_rss_mb': round(pico_rss_mb() or 0.0, 1) or None,
+        'model_load_seconds': round(carga_modelo, 3),
+        'stages_median': {nome: round(percentil([m['stages'].get(nome, 0.0) for m in medidas], 50), 4)
+                          for nome in etapas},
+        'characters': medidas[-1]['characters'] if medidas else 0
+    }
+
+def _executar_caso_subprocesso(caso: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    """Roda o caso num processo novo e lê o JSON da última linha marcada"""
+    try:
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '_caso', json.dumps(caso)],
+            capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {'error': f'timeout ({timeout:.0f}s)'}
+
+    for linha in reversed(processo.stdout.splitlines()):
+        if linha.startswith(MARCADOR_RESULTADO):
+            return json.loads(linha[len(MARCADOR_RESULTADO):])
+    erro = (processo.stderr.strip().splitlines() or [f'código de saída {processo.returncode}'])[-1]
+    return {'error': erro}
+
+# ---------------------------------------------------------------------------
+# run / compare
+# ---------------------------------------------------------------------------
+
+def _lista(texto: str) -> List[str]:
+    return [item.strip() for item in texto.split(',') if item.strip()]
+
+def _versao(modulo: str) -> Optional[str]:
+    try:
+        from importlib.metadata import version
+        return version(modulo)
+    except Exception:
+        return None
+
+def _commit_git() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def ambiente() -> Dict[str, Any]:
+    """Máquina e versões: comparações só valem entre ambientes iguais"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'packages': {nome: _versao(nome) for nome in ('openai-whisper', 'torch', 'librosa', 'numpy',
+                                                      'soundfile', 'soxr')},
+        'git_commit': _commit_git()
+    }
+
+def comando_run(args) -> int:
+    from decodificacao_audio import REAMOSTRADORES
+
+    eixos = {
+        'model': _lista(args.models),
+        'format': _lista(args.formats),
+        'duration': [float(d) for d in _lista(args.durations)],
+        'decoder': _lista(args.decoders),
+        'resampler': _lista(args.resamplers),
+        'mode': _lista(args.modes)
+    }
+    validos = {'format': FORMATOS, 'decoder': DECODIFICADORES, 'resampler': REAMOSTRADORES, 'mode': MODOS}
+    for eixo, opcoes in validos.items():
+        invalidos = [v for v in eixos[eixo] if v not in opcoes]
+        if invalidos:
+            print(f"❌ {eixo} inválido: {', '.join(invalidos)}. Opções: {', '.join(opcoes)}")
+            return 2
+
+    casos, vistos = [], set()
+    for valores in itertools.product(*eixos.values()):
+        caso = dict(zip(eixos, valores))
+        if caso['decoder'] == 'stream' and caso['mode'] == 'windows':
+            caso['mode'] = 'plain'  # mesmo caminho de código: mediria o mesmo caso duas vezes
+        if identificador_caso(caso) not in vistos:
+            vistos.add(identificador_caso(caso))
+            casos.append(caso)
+    print("🏁 SUITE DE BENCHMARK DE TRANSCRIÇÃO")
+    print("=" * 70)
+    print(f"🧪 {len(casos)} casos x ({args.warmup} aquecimento + {args.repeat} medidas), um processo por caso")
+    print(f"📁 Áudio: {args.source or f'sintético (semente {SEMENTE})'} → {args.fixtures_dir}")
+    print("=" * 70)
+
+    resultados = []
+    for numero, caso in enumerate(casos, 1):
+        caso.update(language=args.language, warmup=max(0, args.warmup), repeat=max(1, args.repeat),
+                    threads=args.threads)
+        caso_id = identificador_caso(caso)
+        try:
+            caso['fixture'] = preparar_fixture(args.fixtures_dir, caso['format'], caso['duration'], args.source)
+        except Exception as e:
+            medida = {'error': f"fixture: {e}"}
+        else:
+            medida = _executar_caso_subprocesso(caso, args.timeout)
+
+        resultados.append({'id': caso_id, **{k: v for k, v in caso.items() if k != 'fixture'}, **medida})
+        if 'error' in medida:
+            print(f"[{numero}/{len(casos)}] ❌ {caso_id}: {medida['error']}")
+        else:
+            print(f"[{numero}/{len(casos)}] ✅ {caso_id}: mediana {medida['median_seconds']:.2f}s, "
+                  f"p95 {medida['p95_seconds']:.2f}s, RTF {medida['rtf']:.3f}, "
+                  f"RSS {medida['peak_rss_mb'] or 0:.0f} MB")
+
+    relatorio = {
+        'format_version': VERSAO_FORMATO,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': ambiente(),
+        'parameters': {**{eixo: valores for eixo, valores in eixos.items()}, 'language': args.language,
+                       'warmup': args.warmup, 'repeat': args.repeat, 'threads': args.threads,
+                       'source': args.source, 'seed': None if args.source else SEMENTE},
+        'cases': resultados
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados em {args.json}")
+    else:
+        print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+    return 0 if all('error' not in r for r in resultados) else 1
+
+def comparar(baseline: Dict[str, Any], atual: Dict[str, Any], tolerancia: float,
+             tolerancia_rss: float) -> List[Dict[str, Any]]:
+    """Variação por caso e métrica; `regression` quando piora além da tolerância (em %)"""
+    base_por_id = {c['id']: c for c in baseline['cases'] if 'error' not in c}
+    linhas = []
+    for caso in atual['cases']:
+        base = base_por_id.get(caso['id'])
+        if base is None or 'error' in caso:
+            continue
+        for metrica, limite in (('median_seconds', tolerancia), ('p95_seconds', tolerancia),
+                                ('peak_rss_mb', tolerancia_rss)):
+            antes, depois = base.get(metrica), caso.get(metrica)
+            if not antes or depois is None:
+                continue
+            variacao = (depois - antes) / antes * 100
+            linhas.append({'id': caso['id'], 'metric': metrica, 'baseline': antes, 'current': depois,
+                           'change_pct': round(variacao, 1), 'regression': variacao > limite})
+    return linhas
+
+def comando_compare(args) -> int:
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        atual = json.load(f)
+
+    print("🏁 COMPARAÇÃO COM O BASELINE")
+    print("=" * 70)
+    amb_base, amb_atual = baseline.get('environment', {}), atual.get('environment', {})
+    for chave in ('platform', 'cpu_count', 'python', 'packages'):
+        if amb_base.get(chave) != amb_atual.get(chave):
+            print(f"⚠️  Ambiente diferente em '{chave}': {amb_base.get(chave)} → {amb_atual.get(chave)}")
+
+    linhas = comparar(baseline, atual, args.tolerance, args.rss_tolerance)
+    ids_atual = {c['id'] for c in atual['cases']}
+    ausentes = [c['id'] for c in baseline['cases'] if 'error' not in c and c['id'] not in ids_atual]
+    falhas = [c['id'] for c in atual['cases'] if 'error' in c]
+
+    print(f"{'Caso':<44}{'Métrica':<16}{'Baseline':>10}{'Atual':>10}{'Δ':>9}")
+    for linha in linhas:
+        marca = '  ❌ REGRESSÃO' if linha['regression'] else ''
+        print(f"{linha['id']:<44}{linha['metric']:<16}{linha['baseline']:>10.3f}{linha['current']:>10.3f}"
+              f"{linha['change_pct']:>+8.1f}%{marca}")
+    for caso_id in ausentes:
+        print(f"⚠️  Caso do baseline sem medida atual: {caso_id}")
+    for caso_id in falhas:
+        print(f"❌ Caso falhou na execução atual: {caso_id}")
+
+    regressoes = [l for l in linhas if l['regression']]
+    print("=" * 70)
+    if regressoes or falhas:
+        print(f"❌ {len(regressoes)} regressões (tolerância {args.tolerance:g}% tempo, "
+              f"{args.rss_tolerance:g}% RSS), {len(falhas)} falhas")
+        return 1
+    print(f"✅ Sem regressões em {len(linhas)} comparações")
+    return 0
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="🏁 Suite de benchmark de transcrição (offline, reproduzível)")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    run = subparsers.add_parser('run', help='Mede a matriz de casos e gera o JSON')
+    run.add_argument('--models', default='tiny', help='Modelos separados por vírgula (padrão: tiny)')
+    run.add_argument('--formats', default='wav,mp3', help=f"Formatos de entrada: {','.join(FORMATOS)} (padrão: wav,mp3)")
+    run.add_argument('--durations', default='30,120', help='Durações do áudio em segundos (padrão: 30,120)')
+    run.add_argument('--decoders', default='file', help=f"Decodificadores: {','.join(DECODIFICADORES)} (padrão: file)")
+    run.add_argument('--resamplers', default='soxr_hq', help='Reamostradores (padrão: soxr_hq)')
+    run.add_argument('--modes', default='plain', help=f"Modos: {','.join(MODOS)} (padrão: plain)")
+    run.add_argument('--language', default='pt', help='Idioma passado ao Whisper (padrão: pt)')
+    run.add_argument('--warmup', type=int, default=1, help='Execuções descartadas por caso (padrão: 1)')
+    run.add_argument('--repeat', type=int, default=5, help='Execuções medidas por caso (padrão: 5)')
+    run.add_argument('--threads', type=int, default=None, help='Threads do torch/BLAS (padrão: as da máquina)')
+    run.add_argument('--source', help='Gravação real usada no lugar do áudio sintético')
+    run.add_argument('--fixtures-dir', default=DIRETORIO_FIXTURES_PADRAO,
+                     help='Onde guardar os áudios de teste (padrão: $TRANSCRITOR_BENCHMARK_DIR ou ~/.cache/transcritor/benchmark)')
+    run.add_argument('--timeout', type=float, default=None, help='Tempo máximo por caso, em segundos')
+    run.add_argument('--json', help='Grava o relatório neste arquivo (padrão: imprime na saída)')
+
+    compare = subparsers.add_parser('compare', help='Compara um relatório com o baseline e sinaliza regressões')
+    compare.add_argument('baseline', help='JSON de referência (ex.: gerado no commit anterior)')
+    compare.add_argument('current', help='JSON da execução atual')
+    compare.add_argument('--tolerance', type=float, default=10.0,
+                         help='Piora máxima aceita em mediana/p95, em %% (padrão: 10)')
+    compare.add_argument('--rss-tolerance', type=float, default=10.0,
+                         help='Piora máxima aceita no pico de RSS, em %% (padrão: 10)')
+
+    caso = subparsers.add_parser('_caso')  # interno: um caso no subprocesso
+    caso.add_argument('caso')
+    return parser
+
+def main():
+    args = criar_parser().parse_args()
+    if args.comando == '_caso':
+        try:
+            resultado = executar_caso(json.loads(args.caso))
+        except Exception as e:
+            resultado = {'error': f"{type(e).__name__}: {e}"}
+        print(MARCADOR_RESULTADO + json.dumps(resultado))
+        return
+    sys.exit(comando_run(args) if args.comando == 'run' else comando_compare(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+🎚️ CACHE DE PCM DECODIFICADO
+============================
+Guarda em disco o áudio já decodificado e reamostrado (16 kHz, mono) como
+arquivos .npy, chaveados pelo SHA-256 da fonte. Na segunda vez que o mesmo
+arquivo é transcrito (outro modelo, outro idioma, outra execução) o
+MP3 não é decodificado de novo: o .npy é aberto com
+np.load(mmap_mode='r') e as páginas vêm direto do page cache do SO.
+
+- float32 (padrão): leitura sem cópia via memmap
+- float16: metade do espaço em disco, convertido para float32 ao ler
+- Limite de tamanho com despejo LRU (mtime = último acesso)
+
+Desligado por padrão: cada primeira decodificação grava um .npy do áudio
+inteiro em float32 (~230 MB por hora de áudio), o que só compensa quando
+os mesmos arquivos voltam a ser transcritos. Configuração por variáveis
+de ambiente (herdadas pelos workers do motor): TRANSCRITOR_PCM_CACHE=1
+ativa, TRANSCRITOR_PCM_CACHE_DIR, TRANSCRITOR_PCM_CACHE_MB e
+TRANSCRITOR_PCM_DTYPE (float32/float16).
+"""
+
+import os
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from cache_transcricao import medir_arquivos, despejar_lru
+
+DIRETORIO_PCM_PADRAO = str(Path.home() / '.cache' / 'transcritor' / 'pcm')
+LIMITE_PCM_MB_PADRAO = 4096
+TIPOS_PCM = ('float32', 'float16')
+
+def hash_fonte(fonte: Union[str, bytes], tamanho_chunk: int = 1024 * 1024) -> str:
+    """SHA-256 dos bytes da fonte (caminho em disco ou conteúdo em memória)"""
+    if isinstance(fonte, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(fonte).hexdigest()
+
+    sha = hashlib.sha256()
+    with open(fonte, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_chunk), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+class CachePCM:
+    """PCM decodificado em .npy mapeados em memória, com limite de disco e despejo LRU"""
+
+    def __init__(self, diretorio: str = DIRETORIO_PCM_PADRAO,
+                 max_disco_mb: float = LIMITE_PCM_MB_PADRAO, dtype: str = 'float32'):
+        if dtype not in TIPOS_PCM:
+            raise ValueError(f"dtype inválido: {dtype}. Opções: {', '.join(TIPOS_PCM)}")
+        self.diretorio = Path(diretorio)
+        self.max_disco_bytes = int(max_disco_mb * 1024 * 1024)
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        self._bytes_disco: Optional[int] = None  # calculado na primeira gravação
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+    def _caminho(self, sha256: str, sr: int, variante: str = '') -> Path:
+        # variante: reamostrador fora do padrão (PCM diferente para a mesma fonte)
+        sufixo = f"{variante}_{self.dtype}" if variante else self.dtype
+        return self.diretorio / sha256[:2] / f"{sha256}_{sr}_{sufixo}.npy"
+
+    def obter(self, sha256: str, sr: int, variante: str = ''):
+        """Array float32 mapeado do disco, ou None se não estiver no cache"""
+        import numpy as np
+
+        caminho = self._caminho(sha256, sr, variante)
+        try:
+            audio = np.load(caminho, mmap_mode='r')
+            os.utime(caminho)  # mtime = último acesso, base do despejo LRU
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self.stats['hits'] += 1
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        return audio
+
+    def guardar(self, sha256: str, sr: int, audio, variante: str = ''):
+        """Grava o PCM (escrita atômica) e aplica o limite de disco"""
+        import numpy as np
+
+        caminho = self._caminho(sha256, sr, variante)
+        try:
+            caminho.parent.mkdir(exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=caminho.parent, suffix='.tmp')
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(audio, dtype=self.dtype))
+            os.replace(temp_path, caminho)
+            tamanho = caminho.stat().st_size
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self.stats['writes'] += 1
+            if self._bytes_disco is None:
+                self._bytes_disco = self._medir_disco()
+            else:
+                self._bytes_disco += tamanho
+            excedeu = self._bytes_disco > self.max_disco_bytes
+        if excedeu:
+            self._despejar_disco()
+
+    def _arquivos_disco(self):
+        return [p for p in self.diretorio.glob('*/*.npy') if p.is_file()]
+
+    def _medir_disco(self) -> int:
+        return medir_arquivos(self._arquivos_disco())
+
+    def _despejar_disco(self):
+        """Remove os arquivos menos acessados até ficar em 90% do limite"""
+        # Leitores com o memmap aberto continuam válidos no POSIX
+        total, removidos = despejar_lru(self._arquivos_disco(), self.max_disco_bytes)
+        with self._lock:
+            self._bytes_disco = total
+            self.stats['evictions'] += removidos
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / consultas, 4) if consultas else 0.0,
+                'disk_mb': round(self._bytes_disco / (1024 * 1024), 2) if self._bytes_disco is not None else None,
+                'disk_limit_mb': round(self.max_disco_bytes / (1024 * 1024), 1),
+                'dtype': self.dtype,
+                'directory': str(self.diretorio)
+            }
+
+_cache_padrao = None  # None = ainda não criado, False = indisponível
+_cache_padrao_lock = threading.Lock()
+
+def cache_pcm_padrao() -> Optional[CachePCM]:
+    """Instância do processo configurada pelo ambiente (None se desativado, o padrão)"""
+    global _cache_padrao
+
+    if os.environ.get('TRANSCRITOR_PCM_CACHE', '0').lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    with _cache_padrao_lock:
+        if _cache_padrao is None:
+            try:
+                _cache_padrao = CachePCM(
+                    os.environ.get('TRANSCRITOR_PCM_CACHE_DIR') or DIRETORIO_PCM_PADRAO,
+                    max_disco_mb=float(os.environ.get('TRANSCRITOR_PCM_CACHE_MB', LIMITE_PCM_MB_PADRAO)),
+                    dtype=os.environ.get('TRANSCRITOR_PCM_DTYPE', 'float32')
+                )
+            except (OSError, ValueError) as e:
+                # Cache é otimização: sem diretório gravável, decodifica sempre
+                print(f"⚠️  Cache de PCM desativado: {e}")
+                _cache_padrao = False
+        return _cache_padrao or None
+
+def configurar_cache_pcm(ativo: Optional[bool] = True, diretorio: Optional[str] = None,
+                         max_disco_mb: Optional[float] = None, dtype: Optional[str] = None):
+    """Ajusta o cache padrão via ambiente, para valer também nos workers (spawn); ativo=None mantém o do ambiente"""
+    global _cache_padrao
+
+    if dtype is not None and dtype not in TIPOS_PCM:
+        raise ValueError(f"dtype inválido: {dtype}. Opções: {', '.join(TIPOS_PCM)}")
+    if ativo is not None:
+        os.environ['TRANSCRITOR_PCM_CACHE'] = '1' if ativo else '0'
+    if diretorio:
+        os.environ['TRANSCRITOR_PCM_CACHE_DIR'] = diretorio
+    if max_disco_mb is not None:
+        os.environ['TRANSCRITOR_PCM_CACHE_MB'] = str(max_disco_mb)
+    if dtype:
+        os.environ['TRANSCRITOR_PCM_DTYPE'] = dtype
+    with _cache_padrao_lock:
+        _cache_padrao = None
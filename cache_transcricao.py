@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+💾 CACHE DE RESULTADOS DE TRANSCRIÇÃO
+=====================================
+Cache endereçado por conteúdo: a chave é o SHA-256 do áudio + modelo +
+idioma + timestamps + opções de decodificação. Reenvios do mesmo arquivo
+(retries, re-uploads, a mesma reunião enviada por várias pessoas) não
+passam de novo pelo Whisper.
+
+Dois níveis:
+- Memória: LRU com número máximo de itens
+- Disco: um JSON por chave, sobrevive a reinícios; quando passa do limite
+  de tamanho, os arquivos acessados há mais tempo são removidos
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+DIRETORIO_CACHE_PADRAO = os.environ.get(
+    'TRANSCRITOR_CACHE_DIR',
+    str(Path.home() / '.cache' / 'transcritor' / 'resultados')
+)
+VERSAO_CHAVE = 1  # mudar invalida todas as entradas (ex.: formato do resultado mudou)
+CHAVES_DA_EXECUCAO = ('timings', 'decode_time')  # medições da execução que gerou o resultado, não guardadas
+
+def hash_arquivo(caminho: str, tamanho_chunk: int = 1024 * 1024) -> str:
+    """SHA-256 do arquivo lido em blocos"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_chunk), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def medir_arquivos(arquivos: Iterable[Path]) -> int:
+    """Soma dos tamanhos em bytes (arquivos removidos no meio do caminho são ignorados)"""
+    total = 0
+    for arquivo in arquivos:
+        try:
+            total += arquivo.stat().st_size
+        except OSError:
+            pass
+    return total
+
+def despejar_lru(arquivos: Iterable[Path], limite_bytes: int, fracao_alvo: float = 0.9) -> Tuple[int, int]:
+    """
+    Remove os arquivos menos acessados (mtime = último acesso) até o total
+    ficar em `fracao_alvo` do limite. Retorna (bytes restantes, arquivos removidos).
+    """
+    entradas = []
+    for arquivo in arquivos:
+        try:
+            info = arquivo.stat()
+            entradas.append((info.st_mtime, info.st_size, arquivo))
+        except OSError:
+            pass
+    entradas.sort()
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    alvo = limite_bytes * fracao_alvo
+    removidos = 0
+    for _, tamanho, arquivo in entradas:
+        if total <= alvo:
+            break
+        try:
+            arquivo.unlink()
+            total -= tamanho
+            removidos += 1
+        except OSError:
+            pass
+    return total, removidos
+
+def gerar_chave(sha256_audio: str, modelo: str, opcoes: Dict[str, Any]) -> str:
+    """Chave do cache: hash do áudio + modelo + opções de transcrição/decodificação"""
+    descritor = json.dumps(
+        {'v': VERSAO_CHAVE, 'audio': sha256_audio, 'modelo': modelo, 'opcoes': opcoes},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(descritor.encode('utf-8')).hexdigest()
+
+class CacheTranscricao:
+    """Cache de resultados em dois níveis (memória LRU + disco com limite de tamanho)"""
+
+    def __init__(self, diretorio: Optional[str] = DIRETORIO_CACHE_PADRAO,
+                 max_itens_memoria: int = 256, max_disco_mb: float = 1024):
+        self.diretorio = Path(diretorio) if diretorio else None
+        self.max_itens_memoria = max_itens_memoria
+        self.max_disco_bytes = int(max_disco_mb * 1024 * 1024)
+        self._memoria: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes_disco: Optional[int] = None  # calculado na primeira gravação
+        self.stats = {'hits_memory': 0, 'hits_disk': 0, 'misses': 0, 'writes': 0,
+                      'evictions_memory': 0, 'evictions_disk': 0}
+
+        if self.diretorio:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+
+    def _caminho(self, chave: str) -> Path:
+        return self.diretorio / chave[:2] / f"{chave}.json"
+
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        """Resultado salvo para a chave, ou None"""
+        with self._lock:
+            resultado = self._memoria.get(chave)
+            if resultado is not None:
+                self._memoria.move_to_end(chave)
+                self.stats['hits_memory'] += 1
+                return resultado
+
+        if self.diretorio:
+            caminho = self._caminho(chave)
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    resultado = json.load(f)
+                os.utime(caminho)  # mtime = último acesso, base do despejo LRU em disco
+            except (OSError, ValueError):
+                resultado = None
+            if resultado is not None:
+                with self._lock:
+                    self.stats['hits_disk'] += 1
+                    self._guardar_memoria(chave, resultado)
+                return resultado
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def guardar(self, chave: str, resultado: Dict[str, Any]):
+        """Salva o resultado nos dois níveis"""
+        resultado = {chave_resultado: valor for chave_resultado, valor in resultado.items()
+                     if chave_resultado not in CHAVES_DA_EXECUCAO}
+        with self._lock:
+            self._guardar_memoria(chave, resultado)
+            self.stats['writes'] += 1
+
+        if not self.diretorio:
+            return
+
+        caminho = self._caminho(chave)
+        caminho.parent.mkdir(exist_ok=True)
+        dados = json.dumps(resultado, ensure_ascii=False).encode('utf-8')
+
+        # Escrita atômica: outro processo nunca lê um JSON pela metade
+        fd, temp_path = tempfile.mkstemp(dir=caminho.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dados)
+            os.replace(temp_path, caminho)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._bytes_disco is None:
+                self._bytes_disco = self._medir_disco()
+            else:
+                self._bytes_disco += len(dados)
+            excedeu = self._bytes_disco > self.max_disco_bytes
+        if excedeu:
+            self._despejar_disco()
+
+    def _guardar_memoria(self, chave: str, resultado: Dict[str, Any]):
+        self._memoria[chave] = resultado
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_itens_memoria:
+            self._memoria.popitem(last=False)
+            self.stats['evictions_memory'] += 1
+
+    def _arquivos_disco(self):
+        return [p for p in self.diretorio.glob('*/*.json') if p.is_file()]
+
+    def _medir_disco(self) -> int:
+        return medir_arquivos(self._arquivos_disco())
+
+    def _despejar_disco(self):
+        """Remove os arquivos menos acessados até ficar em 90% do limite"""
+        total, removidos = despejar_lru(self._arquivos_disco(), self.max_disco_bytes)
+        with self._lock:
+            self._bytes_disco = total
+            self.stats['evictions_disk'] += removidos
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats['hits_memory'] + self.stats['hits_disk']
+            consultas = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(hits / consultas, 4) if consultas else 0.0,
+                'memory_items': len(self._memoria),
+                'disk_mb': round(self._bytes_disco / (1024 * 1024), 2) if self._bytes_disco is not None else None,
+                'disk_limit_mb': round(self.max_disco_bytes / (1024 * 1024), 1),
+                'directory': str(self.diretorio) if self.diretorio else None
+            }
+
+_caches: Dict[str, CacheTranscricao] = {}
+_caches_lock = threading.Lock()
+
+def cache_padrao(diretorio: Optional[str] = None) -> CacheTranscricao:
+    """Instância compartilhada por diretório (evita reescanear o disco a cada arquivo)"""
+    diretorio = diretorio or DIRETORIO_CACHE_PADRAO
+    with _caches_lock:
+        if diretorio not in _caches:
+            _caches[diretorio] = CacheTranscricao(diretorio)
+        return _caches[diretorio]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+📌 CHECKPOINT DE TRANSCRIÇÕES LONGAS
+====================================
+Um arquivo de horas com o modelo `large` fica horas dentro de um único
+model.transcribe(): se o processo morre aos 90%, tudo se perde. Com
+checkpoint, o áudio é transcrito em blocos (transcrever_em_janelas) e, a
+cada bloco concluído, os segmentos e o deslocamento já decodificado vão
+para um JSON no disco. Rodar de novo no mesmo arquivo com as mesmas opções
+continua do último bloco salvo.
+
+A chave é a mesma do cache de resultados (hash do áudio + modelo + opções),
+então áudio ou opções diferentes nunca reaproveitam um checkpoint.
+
+Uso:
+    checkpoint = CheckpointTranscricao(chave)
+    estado = checkpoint.carregar()      # None ou {'offset', 'segments', 'language', ...}
+    for bloco in transcrever_em_janelas(..., janela=300, retomar=estado):
+        checkpoint.atualizar(bloco)
+    checkpoint.remover()
+"""
+
+import os
+import json
+import time
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+DIRETORIO_CHECKPOINT_PADRAO = os.environ.get(
+    'TRANSCRITOR_CHECKPOINT_DIR',
+    str(Path.home() / '.cache' / 'transcritor' / 'checkpoints')
+)
+BLOCO_CHECKPOINT = 300.0  # segundos de áudio por bloco (trabalho perdido no pior caso)
+VERSAO_CHECKPOINT = 1
+
+class CheckpointTranscricao:
+    """Segmentos concluídos + deslocamento decodificado de uma transcrição em andamento"""
+
+    def __init__(self, chave: str, diretorio: Optional[str] = None):
+        self.chave = chave
+        self.caminho = Path(diretorio or DIRETORIO_CHECKPOINT_PADRAO) / f"{chave}.json"
+        self.estado: Dict[str, Any] = {'offset': 0.0, 'segments': [], 'language': None,
+                                       'inference_time': 0.0, 'blocks': 0}
+
+    def carregar(self) -> Optional[Dict[str, Any]]:
+        """Estado salvo por uma execução anterior, ou None"""
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if dados.get('version') != VERSAO_CHECKPOINT or dados.get('key') != self.chave:
+            return None
+        self.estado = {chave: dados[chave] for chave in self.estado}
+        return self.estado
+
+    def atualizar(self, bloco: Dict[str, Any]):
+        """Acrescenta um bloco concluído (resultado de transcrever_trecho) e grava no disco"""
+        self.estado['segments'].extend(bloco['segments'])
+        self.estado['offset'] = bloco['offset'] + bloco['duration']
+        self.estado['language'] = self.estado['language'] or bloco.get('language')
+        self.estado['inference_time'] += bloco['inference_time']
+        self.estado['blocks'] += 1
+        self.salvar()
+
+    def salvar(self):
+        dados = json.dumps({'version': VERSAO_CHECKPOINT, 'key': self.chave,
+                            'updated_at': time.time(), **self.estado}, ensure_ascii=False)
+        try:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            # Escrita atômica: um crash no meio da gravação mantém o checkpoint anterior
+            fd, temp_path = tempfile.mkstemp(dir=self.caminho.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(dados)
+            os.replace(temp_path, self.caminho)
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o checkpoint: {e}")
+
+    def remover(self):
+        """Transcrição concluída: o checkpoint não serve mais"""
+        try:
+            self.caminho.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+🎙️ CLIENTE DE TESTE - TRANSCRIÇÃO AO VIVO
+=========================================
+Envia um arquivo de áudio para ws://.../api/v1/transcribe/live como se fosse
+um microfone (quadros de 100 ms em tempo real) e mostra as legendas:
+provisórias na mesma linha, finais em linhas novas.
+
+Uso:
+    python transcritor_api_flask.py            # em outro terminal (requer flask-sock)
+    python cliente_tempo_real.py --file reuniao.wav
+    python cliente_tempo_real.py --file aula.mp3 --stride 0.5 --speed 2
+
+Requer: pip install websocket-client
+WAV 16 kHz mono 16-bit é enviado direto; outros formatos usam o librosa.
+"""
+
+import sys
+import json
+import time
+import wave
+import argparse
+import threading
+from urllib.parse import urlencode
+
+TAXA = 16000
+QUADRO_SEGUNDOS = 0.1
+
+def carregar_pcm16(arquivo: str) -> bytes:
+    """PCM int16 little-endian mono 16 kHz do arquivo"""
+    try:
+        with wave.open(arquivo, 'rb') as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (TAXA, 1, 2):
+                return wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        pass
+
+    # Outro formato/taxa: converte com o librosa
+    import numpy as np
+    import librosa
+
+    audio, _ = librosa.load(arquivo, sr=TAXA, mono=True)
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+def receber(ws, fim: threading.Event, inicio_envio: list):
+    """Imprime os eventos do servidor até o 'done'"""
+    primeira_legenda = None
+    largura = 0
+    while True:
+        try:
+            evento = json.loads(ws.recv())
+        except Exception:
+            break
+
+        tipo = evento.get('type')
+        if tipo in ('partial', 'final') and primeira_legenda is None and inicio_envio:
+            primeira_legenda = time.time() - inicio_envio[0]
+
+        if tipo == 'partial':
+            linha = f"… [{evento['start']:7.2f}s] {evento['text']}"
+            print('\r' + linha.ljust(largura), end='', flush=True)
+            largura = len(linha)
+        elif tipo == 'final':
+            print('\r' + f"✅ [{evento['start']:7.2f}s - {evento['end']:7.2f}s] {evento['text']}".ljust(largura))
+            largura = 0
+        elif tipo == 'ready':
+            print(f"🔗 Conectado: modelo {evento['model']}, janela {evento['window']}s, passo {evento['stride']}s")
+        elif tipo == 'done':
+            print('\r'.ljust(largura))
+            print("=" * 60)
+            print("📊 ESTATÍSTICAS DA SESSÃO")
+            for chave, valor in evento['stats'].items():
+                print(f"  {chave}: {valor}")
+            if primeira_legenda is not None:
+                print(f"  first_caption_latency: {primeira_legenda:.2f}s")
+            break
+        elif tipo == 'error':
+            print(f"\n❌ Erro do servidor: {evento['error']}")
+            break
+    fim.set()
+
+def main():
+    parser = argparse.ArgumentParser(description="🎙️ Cliente de teste do WebSocket de transcrição ao vivo")
+    parser.add_argument('--file', '-f', required=True, help='Arquivo de áudio a transmitir')
+    parser.add_argument('--url', default='ws://localhost:5000/api/v1/transcribe/live', help='Endpoint WebSocket')
+    parser.add_argument('--model', '-m', default='base', help='Modelo Whisper (padrão: base)')
+    parser.add_argument('--language', '-l', default='pt', help='Idioma ou auto (padrão: pt)')
+    parser.add_argument('--window', type=float, default=None, help='Janela em segundos (padrão: a do servidor)')
+    parser.add_argument('--stride', type=float, default=None, help='Passo em segundos (padrão: o do servidor)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Velocidade de envio: 1 = tempo real, 0 = o mais rápido possível')
+    args = parser.parse_args()
+
+    try:
+        import websocket
+    except ImportError:
+        print("❌ websocket-client não instalado. Execute: pip install websocket-client")
+        sys.exit(1)
+
+    pcm = carregar_pcm16(args.file)
+    print(f"📁 {args.file}: {len(pcm) / 2 / TAXA:.1f}s de áudio")
+
+    consulta = {'model': args.model, 'language': args.language}
+    if args.window is not None:
+        consulta['window'] = args.window
+    if args.stride is not None:
+        consulta['stride'] = args.stride
+    ws = websocket.create_connection(f"{args.url}?{urlencode(consulta)}")
+
+    fim = threading.Event()
+    inicio_envio = []
+    receptor = threading.Thread(target=receber, args=(ws, fim, inicio_envio), daemon=True)
+    receptor.start()
+
+    tamanho_quadro = int(TAXA * QUADRO_SEGUNDOS) * 2
+    inicio_envio.append(time.time())
+    try:
+        for i, posicao in enumerate(range(0, len(pcm), tamanho_quadro)):
+            if fim.is_set():
+                break
+            ws.send_binary(pcm[posicao:posicao + tamanho_quadro])
+            if args.speed > 0:
+                # Ritmo de microfone: o quadro i sai em i * 100 ms / speed
+                atraso = inicio_envio[0] + (i + 1) * QUADRO_SEGUNDOS / args.speed - time.time()
+                if atraso > 0:
+                    time.sleep(atraso)
+        ws.send('EOF')
+        fim.wait()
+    except KeyboardInterrupt:
+        print("\n🛑 Interrompido")
+    finally:
+        ws.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+⏱️ CRONÔMETRO POR ETAPA
+=======================
+Um único "tempo de processamento" mistura carga do modelo, I/O de arquivos
+temporários, decodificação e inferência. CronometroEtapas separa cada
+etapa: model_load, spool (gravação de upload/temporário), decode, resample,
+vad, inference, alignment (timestamps por palavra) e output.
+
+As funções de decodificação, VAD, inferência e o registro de modelos
+marcam suas etapas com `etapa(nome)`, que registra no cronômetro ativo da
+thread atual (e não faz nada se não houver um). Etapas aninhadas contam
+só o tempo próprio: o alinhamento de palavras roda dentro do
+model.transcribe() e é descontado da inferência.
+
+Workers do MotorInferencia rodam em outro processo: as funções de tarefa
+devolvem o dicionário em resultado['timings'] e quem chamou faz mesclar().
+
+Uso:
+    with CronometroEtapas() as cronometro:
+        with etapa('decode'):
+            ...
+    print(cronometro.formatar())   # decode 1.20s | inference 8.31s
+"""
+
+import sys
+import time
+import functools
+import importlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+ETAPAS = ('model_load', 'spool', 'decode', 'resample', 'vad', 'inference', 'alignment', 'output')
+
+_local = threading.local()
+_whisper_instrumentado = False
+
+def _pilha_ativos() -> List['CronometroEtapas']:
+    pilha = getattr(_local, 'ativos', None)
+    if pilha is None:
+        pilha = _local.ativos = []
+    return pilha
+
+def cronometro_atual() -> Optional['CronometroEtapas']:
+    """Cronômetro ativo nesta thread (o mais interno), ou None"""
+    pilha = _pilha_ativos()
+    return pilha[-1] if pilha else None
+
+@contextmanager
+def etapa(nome: str):
+    """Mede o bloco no cronômetro ativo da thread; sem cronômetro ativo não mede nada"""
+    cronometro = cronometro_atual()
+    if cronometro is None:
+        yield
+    else:
+        with cronometro.etapa(nome):
+            yield
+
+class CronometroEtapas:
+    """Tempo (próprio) acumulado por etapa de uma transcrição"""
+
+    def __init__(self):
+        self.tempos: Dict[str, float] = {}
+        self._abertas: List[List[float]] = []  # [inicio, tempo das etapas filhas]
+
+    def ativar(self) -> 'CronometroEtapas':
+        """Torna este o cronômetro de etapa() nesta thread (até desativar())"""
+        _pilha_ativos().append(self)
+        return self
+
+    def desativar(self):
+        pilha = _pilha_ativos()
+        if self in pilha:
+            pilha.remove(self)
+
+    def __enter__(self) -> 'CronometroEtapas':
+        return self.ativar()
+
+    def __exit__(self, *exc):
+        self.desativar()
+
+    @contextmanager
+    def etapa(self, nome: str):
+        aberta = [time.perf_counter(), 0.0]
+        self._abertas.append(aberta)
+        try:
+            yield
+        finally:
+            self._abertas.pop()
+            decorrido = time.perf_counter() - aberta[0]
+            if self._abertas:
+                self._abertas[-1][1] += decorrido  # a etapa de fora não conta este tempo
+            self.adicionar(nome, decorrido - aberta[1])
+
+    def adicionar(self, nome: str, segundos: float):
+        if segundos > 0:
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + segundos
+
+    def mesclar(self, tempos: Optional[Dict[str, float]]):
+        """Soma tempos medidos em outro lugar (ex.: resultado['timings'] de um worker)"""
+        for nome, segundos in (tempos or {}).items():
+            self.adicionar(nome, segundos)
+
+    @property
+    def total(self) -> float:
+        return sum(self.tempos.values())
+
+    def como_dict(self) -> Dict[str, float]:
+        """Etapas medidas, na ordem do pipeline, em segundos"""
+        ordem = [nome for nome in ETAPAS if nome in self.tempos]
+        ordem += sorted(nome for nome in self.tempos if nome not in ETAPAS)
+        return {nome: round(self.tempos[nome], 3) for nome in ordem}
+
+    def formatar(self) -> str:
+        return ' | '.join(f"{nome} {segundos:.2f}s" for nome, segundos in self.como_dict().items())
+
+def instrumentar_whisper():
+    """
+    Mede o alinhamento de palavras (whisper.timing.add_word_timestamps) como
+    etapa própria. Só age se o Whisper já foi importado; chamar após carregar o modelo.
+    """
+    global _whisper_instrumentado
+    if _whisper_instrumentado or 'whisper' not in sys.modules:
+        return
+    try:
+        modulo = importlib.import_module('whisper.transcribe')
+        original = modulo.add_word_timestamps
+    except (ImportError, AttributeError):
+        return  # versão do Whisper sem esse ponto: o alinhamento fica dentro da inferência
+
+    @functools.wraps(original)
+    def add_word_timestamps(*args, **kwargs):
+        with etapa('alignment'):
+            return original(*args, **kwargs)
+
+    modulo.add_word_timestamps = add_word_timestamps
+    _whisper_instrumentado = True
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+🔊 CAMADA DE DECODIFICAÇÃO DE ÁUDIO
+===================================
+Converte a fonte de áudio (caminho em disco ou bytes em memória) para o
+array float32 mono em 16 kHz que o Whisper espera:
+- Bytes de WAV/FLAC/OGG/MP3 são lidos direto da memória via SoundFile (BytesIO)
+- Formatos que exigem um caminho real (M4A, MP4, AAC...) caem num arquivo
+  temporário em tmpfs (/dev/shm), evitando o round trip em disco
+- Caminhos seguem para o librosa.load como sempre
+- Com o cache de PCM ativo (cache_pcm.py), uma fonte já vista é lida do
+  .npy mapeado em memória, sem decodificar nem reamostrar de novo
+
+O caminho usado é retornado para que a API possa reportá-lo.
+
+decodificar_em_blocos() é o modo streaming para arquivos de horas: lê
+blocos de ~30s (SoundFile.blocks, ou audioread para M4A/AAC) e reamostra
+de forma incremental (soxr.ResampleStream), então a memória de pico
+depende do bloco e não da duração (~230 MB por hora em float32).
+
+Reamostrador configurável (TRANSCRITOR_RESAMPLER, herdado pelos workers):
+soxr_hq (padrão do librosa), soxr_mq, soxr_qq (mais rápido), polyphase
+(scipy) ou none (só aceita fontes já em 16 kHz). Compare com
+benchmark_reamostragem.py antes de trocar numa implantação.
+"""
+
+import io
+import os
+import tempfile
+from typing import Dict, Union, Tuple, Optional, Iterator
+
+from cronometro_etapas import etapa
+
+TAXA_WHISPER = 16000
+BLOCO_STREAM = 30.0  # segundos por bloco no modo streaming
+
+REAMOSTRADORES = ('soxr_hq', 'soxr_mq', 'soxr_qq', 'polyphase', 'none')
+REAMOSTRADOR_PADRAO = 'soxr_hq'  # o mesmo do librosa.load
+_QUALIDADE_SOXR = {'soxr_hq': 'HQ', 'soxr_mq': 'MQ', 'soxr_qq': 'QQ'}
+
+# Containers que o libsndfile lê de um buffer (MP3 exige libsndfile >= 1.1)
+FORMATOS_MEMORIA = {'.wav', '.flac', '.ogg', '.mp3'}
+
+def _diretorio_tmpfs() -> Optional[str]:
+    """Diretório em RAM para o fallback (None = temporário padrão do SO)"""
+    candidato = os.environ.get('TRANSCRITOR_TMPFS_DIR', '/dev/shm')
+    if os.path.isdir(candidato) and os.access(candidato, os.W_OK):
+        return candidato
+    return None
+
+DIRETORIO_TMPFS = _diretorio_tmpfs()
+
+def reamostrador_atual() -> str:
+    """Reamostrador configurado no ambiente (vale também para os workers do motor)"""
+    nome = os.environ.get('TRANSCRITOR_RESAMPLER', REAMOSTRADOR_PADRAO)
+    return nome if nome in REAMOSTRADORES else REAMOSTRADOR_PADRAO
+
+def configurar_reamostrador(nome: str):
+    """Define o reamostrador via ambiente (chamar antes de criar o pool: spawn herda o ambiente)"""
+    if nome not in REAMOSTRADORES:
+        raise ValueError(f"Reamostrador inválido: {nome}. Opções: {', '.join(REAMOSTRADORES)}")
+    os.environ['TRANSCRITOR_RESAMPLER'] = nome
+
+def opcoes_reamostragem() -> Dict[str, str]:
+    """Entra nas chaves de cache: vazio no padrão, para não invalidar as entradas existentes"""
+    nome = reamostrador_atual()
+    return {} if nome == REAMOSTRADOR_PADRAO else {'resampler': nome}
+
+def reamostrar(audio_data, taxa: int, sr: int = TAXA_WHISPER, reamostrador: Optional[str] = None):
+    """Converte `audio_data` de `taxa` para `sr` Hz com o reamostrador escolhido"""
+    import librosa
+
+    reamostrador = reamostrador or reamostrador_atual()
+    if taxa == sr:
+        return audio_data
+    if reamostrador == 'none':
+        raise ValueError(f"Fonte em {taxa} Hz com reamostrador 'none': converta para {sr} Hz "
+                         f"ou use {', '.join(REAMOSTRADORES[:-1])}")
+    with etapa('resample'):
+        return librosa.resample(audio_data, orig_sr=taxa, target_sr=sr, res_type=reamostrador)
+
+def carregar_audio(caminho: str, sr: int = TAXA_WHISPER, reamostrador: Optional[str] = None) -> Tuple:
+    """
+    librosa.load(caminho, sr) com o reamostrador configurado; retorna (audio, sr).
+    Decodifica na taxa original e reamostra em seguida (o mesmo que o librosa.load
+    faz internamente), para medir as duas etapas em separado.
+    """
+    import librosa
+
+    with etapa('decode'):
+        audio_data, taxa = librosa.load(caminho, sr=None)
+    return reamostrar(audio_data, taxa, sr, reamostrador), sr
+
+def normalizar_para_whisper(audio_data):
+    """Garante float32 no intervalo [-1, 1]"""
+    import numpy as np
+
+    if audio_data.dtype != np.float32:
+        audio_data = audio_data.astype(np.float32)
+    return np.clip(audio_data, -1.0, 1.0)
+
+def _decodificar_memoria(dados: bytes, sr: int):
+    import soundfile as sf
+
+    with etapa('decode'):
+        audio_data, taxa = sf.read(io.BytesIO(dados), dtype='float32', always_2d=True)
+        audio_data = audio_data.mean(axis=1)
+    return reamostrar(audio_data, taxa, sr), sr
+
+def _gravar_temporario(dados: bytes, sufixo: str) -> str:
+    # delete=False: no Windows o arquivo não pode ser reaberto enquanto aberto
+    with etapa('spool'), tempfile.NamedTemporaryFile(suffix=sufixo, dir=DIRETORIO_TMPFS, delete=False) as temp_file:
+        temp_file.write(dados)
+        return temp_file.name
+
+def _decodificar_tempfile(dados: bytes, sufixo: str, sr: int):
+    temp_path = _gravar_temporario(dados, sufixo)
+    try:
+        return carregar_audio(temp_path, sr)
+    finally:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+def _decodificar(fonte: Union[str, bytes], sufixo: str, sr: int) -> Tuple:
+    if isinstance(fonte, (str, os.PathLike)):
+        audio_data, taxa = carregar_audio(fonte, sr)
+        return normalizar_para_whisper(audio_data), taxa, 'file'
+
+    dados = bytes(fonte)
+    sufixo = sufixo.lower()
+    if sufixo in FORMATOS_MEMORIA:
+        try:
+            audio_data, taxa = _decodificar_memoria(dados, sr)
+            return normalizar_para_whisper(audio_data), taxa, 'memory'
+        except Exception:
+            pass  # ex.: MP3 com libsndfile antigo -> fallback com caminho real
+
+    audio_data, taxa = _decodificar_tempfile(dados, sufixo, sr)
+    return normalizar_para_whisper(audio_data), taxa, 'tmpfs_tempfile' if DIRETORIO_TMPFS else 'tempfile'
+
+def decodificar_audio(fonte: Union[str, bytes], sufixo: str = '', sr: int = TAXA_WHISPER,
+                      sha256: Optional[str] = None, usar_cache_pcm: bool = True) -> Tuple:
+    """
+    Decodifica a fonte para mono float32 em `sr` Hz.
+    Retorna (audio, sr, caminho) onde caminho é 'pcm_cache', 'file', 'memory'
+    ou 'tmpfs_tempfile'/'tempfile'. `sha256` evita recalcular o hash da fonte.
+    """
+    from cache_pcm import cache_pcm_padrao, hash_fonte
+
+    cache = cache_pcm_padrao() if usar_cache_pcm else None
+    variante = opcoes_reamostragem().get('resampler', '')
+    if cache is not None:
+        sha256 = sha256 or hash_fonte(fonte)
+        with etapa('decode'):
+            audio_data = cache.obter(sha256, sr, variante)
+        if audio_data is not None:
+            return audio_data, sr, 'pcm_cache'
+
+    audio_data, taxa, caminho = _decodificar(fonte, sufixo, sr)
+    if cache is not None:
+        cache.guardar(sha256, taxa, audio_data, variante)
+    return audio_data, taxa, caminho
+
+def _reamostrador(taxa_origem: int, sr: int):
+    """Função (bloco, ultimo) -> bloco em `sr` Hz; com soxr o filtro mantém estado entre blocos"""
+    reamostrador = reamostrador_atual()
+    if taxa_origem == sr:
+        return lambda bloco, ultimo=False: bloco
+    if reamostrador in _QUALIDADE_SOXR:
+        try:
+            import soxr
+            fluxo = soxr.ResampleStream(taxa_origem, sr, 1, dtype='float32', quality=_QUALIDADE_SOXR[reamostrador])
+            return lambda bloco, ultimo=False: fluxo.resample_chunk(bloco, last=ultimo)
+        except ImportError:
+            reamostrador = 'polyphase'
+    # Sem estado entre blocos: a emenda a cada 30s tem um artefato desprezível
+    return lambda bloco, ultimo=False: reamostrar(bloco, taxa_origem, sr, reamostrador) if len(bloco) else bloco
+
+def _blocos_soundfile(entrada, segundos: float) -> Tuple[int, Iterator]:
+    import soundfile as sf
+
+    arquivo = sf.SoundFile(entrada)  # formato não suportado levanta exceção aqui, antes do primeiro bloco
+
+    def blocos():
+        with arquivo:
+            for bloco in arquivo.blocks(blocksize=int(segundos * arquivo.samplerate), dtype='float32', always_2d=True):
+                yield bloco.mean(axis=1)
+    return arquivo.samplerate, blocos()
+
+def _blocos_audioread(caminho: str, segundos: float) -> Tuple[int, Iterator]:
+    import numpy as np
+    import audioread
+
+    leitor = audioread.audio_open(caminho)
+    canais = leitor.channels
+
+    def blocos():
+        with leitor:
+            tamanho = int(segundos * leitor.samplerate) * canais
+            partes, acumulado = [], 0
+            for buffer in leitor:
+                partes.append(np.frombuffer(buffer, dtype='<i2'))
+                acumulado += len(partes[-1])
+                if acumulado < tamanho:
+                    continue
+                dados = np.concatenate(partes)
+                util = len(dados) - len(dados) % canais
+                yield dados[:util].reshape(-1, canais).mean(axis=1).astype(np.float32) / 32768.0
+                partes, acumulado = [dados[util:]], len(dados) - util
+            if acumulado:
+                dados = np.concatenate(partes)
+                util = len(dados) - len(dados) % canais
+                yield dados[:util].reshape(-1, canais).mean(axis=1).astype(np.float32) / 32768.0
+    return leitor.samplerate, blocos()
+
+def decodificar_em_blocos(fonte: Union[str, bytes], sufixo: str = '', sr: int = TAXA_WHISPER,
+                          segundos: float = BLOCO_STREAM) -> Iterator:
+    """
+    Gera o áudio mono float32 em `sr` Hz em blocos de ~`segundos`, sem materializar o arquivo.
+    Não passa pelo cache de PCM (que guarda o array inteiro).
+    """
+    import numpy as np
+
+    temp_path = None
+    entrada = fonte if isinstance(fonte, (str, os.PathLike)) else io.BytesIO(bytes(fonte))
+    try:
+        try:
+            taxa, blocos = _blocos_soundfile(entrada, segundos)
+        except Exception:
+            # M4A/MP4/AAC (ou MP3 com libsndfile antigo): audioread precisa de um caminho real
+            if not isinstance(entrada, (str, os.PathLike)):
+                temp_path = _gravar_temporario(bytes(fonte), sufixo.lower())
+                entrada = temp_path
+            taxa, blocos = _blocos_audioread(entrada, segundos)
+
+        reamostrar = _reamostrador(taxa, sr)
+        while True:
+            # Etapas medidas bloco a bloco: um `with` aberto através do yield mediria o consumidor
+            with etapa('decode'):
+                bloco = next(blocos, None)
+            if bloco is None:
+                break
+            with etapa('resample'):
+                saida = reamostrar(np.ascontiguousarray(bloco, dtype=np.float32))
+            if len(saida):
+                yield normalizar_para_whisper(saida)
+        with etapa('resample'):
+            final = reamostrar(np.zeros(0, dtype=np.float32), ultimo=True)
+        if len(final):
+            yield normalizar_para_whisper(final)
+    finally:
+        if temp_path:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
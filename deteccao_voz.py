@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+🗣️ DETECÇÃO DE VOZ (VAD) ANTES DO WHISPER
+=========================================
+Aulas e reuniões têm 20-40% de silêncio. Mandar esse silêncio ao Whisper
+custa tempo de decodificação e às vezes gera texto alucinado. Esta etapa:
+1. Mede energia (dB) e taxa de cruzamentos por zero de cada quadro de 30 ms,
+   tudo vetorizado em NumPy
+2. Marca como fala os quadros acima de um limiar adaptativo ao ruído de
+   fundo (ou um pouco abaixo, se o ZCR for alto: fricativas como "s", "f")
+3. Junta as regiões de fala separadas por pausas curtas, com margem
+4. Concatena só a fala e guarda o mapa para devolver os timestamps
+   à linha do tempo original
+
+Uso:
+    audio_fala, mapa, info = aplicar_vad(audio, 16000)
+    resultado = model.transcribe(audio_fala, ...)
+    remapear_resultado(resultado, mapa)
+"""
+
+import bisect
+from typing import Dict, Any, List, Tuple
+
+from cronometro_etapas import etapa
+
+QUADRO_VAD = 0.03        # segundos por quadro
+MARGEM_FALA = 0.2        # segundos mantidos antes/depois de cada região
+PAUSA_MINIMA = 0.6       # pausas menores que isso não separam regiões
+FALA_MINIMA = 0.25       # regiões menores que isso são cliques/ruído
+SEPARADOR = 0.3          # silêncio inserido entre regiões concatenadas
+ACIMA_DO_RUIDO_DB = 12.0
+LIMIAR_ZCR = 0.25
+
+def _quadros(audio, tamanho_quadro: int):
+    import numpy as np
+
+    n_quadros = len(audio) // tamanho_quadro
+    return np.asarray(audio[:n_quadros * tamanho_quadro], dtype=np.float32).reshape(n_quadros, tamanho_quadro)
+
+def detectar_fala(audio, sr: int, quadro: float = QUADRO_VAD, margem: float = MARGEM_FALA,
+                  pausa_minima: float = PAUSA_MINIMA, fala_minima: float = FALA_MINIMA,
+                  limiar_db: float = None) -> List[Tuple[int, int]]:
+    """Regiões de fala em amostras [(inicio, fim), ...]"""
+    import numpy as np
+
+    tamanho_quadro = max(1, int(sr * quadro))
+    quadros = _quadros(audio, tamanho_quadro)
+    if len(quadros) == 0:
+        return []
+
+    energia_db = 10 * np.log10(np.mean(quadros * quadros, axis=1) + 1e-10)
+    sinais = np.signbit(quadros)
+    zcr = np.mean(sinais[:, 1:] != sinais[:, :-1], axis=1)
+
+    if limiar_db is None:
+        # Ruído de fundo = percentil 10; nunca mais de 50 dB abaixo do pico
+        limiar_db = max(np.percentile(energia_db, 10) + ACIMA_DO_RUIDO_DB, energia_db.max() - 50.0)
+    fala = (energia_db > limiar_db) | ((energia_db > limiar_db - 8.0) & (zcr > LIMIAR_ZCR))
+
+    bordas = np.diff(np.concatenate(([0], fala.astype(np.int8), [0])))
+    inicios = np.flatnonzero(bordas == 1)
+    fins = np.flatnonzero(bordas == -1)
+
+    # Descarta estalos curtos antes de aplicar margem e juntar
+    longas = (fins - inicios) * quadro >= fala_minima
+    inicios, fins = inicios[longas], fins[longas]
+    if len(inicios) == 0:
+        return []
+
+    margem_q = int(round(margem / quadro))
+    inicios = np.maximum(inicios - margem_q, 0)
+    fins = np.minimum(fins + margem_q, len(quadros))
+
+    separa = (inicios[1:] - fins[:-1]) * quadro > pausa_minima
+    inicios = inicios[np.concatenate(([True], separa))]
+    fins = fins[np.concatenate((separa, [True]))]
+
+    regioes = [(int(a) * tamanho_quadro, int(b) * tamanho_quadro) for a, b in zip(inicios, fins)]
+    if fins[-1] == len(quadros):
+        regioes[-1] = (regioes[-1][0], len(audio))  # inclui a sobra que não fechou um quadro
+    return regioes
+
+def aplicar_vad(audio, sr: int, **parametros) -> Tuple[Any, List[Tuple[float, float, float]], Dict[str, Any]]:
+    """
+    Mantém só as regiões de fala.
+    Retorna (audio_fala, mapa, info); mapa = [(inicio_no_audio_fala, inicio_original, duracao)] em segundos.
+    """
+    import numpy as np
+
+    duracao_total = len(audio) / sr
+    with etapa('vad'):
+        regioes = detectar_fala(audio, sr, **parametros)
+
+    if not regioes:
+        # Sem fala detectada: melhor transcrever tudo do que descartar o arquivo inteiro
+        return audio, [(0.0, 0.0, duracao_total)], {
+            'speech_seconds': round(duracao_total, 2), 'skipped_seconds': 0.0,
+            'regions': 0, 'total_seconds': round(duracao_total, 2)
+        }
+
+    separador = np.zeros(int(SEPARADOR * sr), dtype=np.float32)
+    partes, mapa = [], []
+    posicao = 0
+    for i, (a, b) in enumerate(regioes):
+        if i:
+            partes.append(separador)
+            posicao += len(separador)
+        partes.append(np.asarray(audio[a:b], dtype=np.float32))
+        mapa.append((posicao / sr, a / sr, (b - a) / sr))
+        posicao += b - a
+
+    duracao_fala = sum(d for _, _, d in mapa)
+    info = {
+        'speech_seconds': round(duracao_fala, 2),
+        'skipped_seconds': round(duracao_total - duracao_fala, 2),
+        'regions': len(regioes),
+        'total_seconds': round(duracao_total, 2)
+    }
+    with etapa('vad'):
+        audio_fala = np.concatenate(partes)
+    return audio_fala, mapa, info
+
+def mapear_tempo(t: float, mapa: List[Tuple[float, float, float]]) -> float:
+    """Converte um instante do áudio só-fala para a linha do tempo original"""
+    indice = max(0, bisect.bisect_right([inicio for inicio, _, _ in mapa], t) - 1)
+    inicio_fala, inicio_original, duracao = mapa[indice]
+    # Instantes dentro do separador caem no fim da região anterior
+    return inicio_original + min(max(t - inicio_fala, 0.0), duracao)
+
+def remapear_resultado(resultado: Dict[str, Any], mapa: List[Tuple[float, float, float]]) -> Dict[str, Any]:
+    """Ajusta start/end dos segmentos (e palavras, se houver) para o áudio original"""
+    for seg in resultado.get('segments', []):
+        seg['start'] = mapear_tempo(seg['start'], mapa)
+        seg['end'] = mapear_tempo(seg['end'], mapa)
+        for palavra in seg.get('words') or []:
+            palavra['start'] = mapear_tempo(palavra['start'], mapa)
+            palavra['end'] = mapear_tempo(palavra['end'], mapa)
+    return resultado
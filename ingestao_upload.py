@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+📥 INGESTÃO DE UPLOADS EM DISCO
+===============================
+Uploads são gravados em blocos de tamanho fixo direto num arquivo de spool,
+com o SHA-256 calculado durante a escrita. Uploads pequenos de formatos que
+o SoundFile decodifica da memória ficam num buffer até LIMIAR_MEMORIA e só
+vão para o disco se passarem disso; o resto vai direto para o disco e segue
+adiante pelo caminho. A memória por upload fica limitada por uma constante,
+independente do tamanho do arquivo.
+
+Payloads JSON com áudio em base64 também são lidos em stream: o campo de
+áudio é decodificado aos poucos direto para o spool, sem materializar nem o
+corpo da requisição nem a string base64.
+"""
+
+import io
+import os
+import re
+import json
+import base64
+import codecs
+import hashlib
+import binascii
+import tempfile
+from typing import Optional, Union, Dict, Any, List, Set, Tuple, Iterator
+
+from decodificacao_audio import FORMATOS_MEMORIA
+
+TAMANHO_CHUNK = 1024 * 1024  # 1 MB por leitura/escrita
+DIRETORIO_SPOOL = os.environ.get('TRANSCRITOR_SPOOL_DIR') or None  # None = diretório temporário do SO
+LIMIAR_MEMORIA = int(float(os.environ.get('TRANSCRITOR_SPOOL_MEMORY_MB', '16')) * 1024 * 1024)
+
+class ArquivoSpool:
+    """Upload em buffer/disco cujo hash e tamanho são acumulados a cada write()"""
+
+    def __init__(self, sufixo: str = '', diretorio: Optional[str] = DIRETORIO_SPOOL,
+                 limiar_memoria: int = LIMIAR_MEMORIA, tamanho_previsto: Optional[int] = None):
+        self.sufixo = sufixo.lower()
+        self.diretorio = diretorio
+        self._hash = hashlib.sha256()
+        self.caminho: Optional[str] = None
+        self.tamanho_bytes = 0
+        self.sha256: Optional[str] = None
+        self.retido = False  # True quando outro dono (ex.: job assíncrono) vai remover o arquivo
+
+        # Sufixo desconhecido (ex.: nome chega depois no JSON) também pode ficar em memória:
+        # o decodificador cai no tmpfs se o SoundFile não reconhecer o conteúdo
+        cabe_na_memoria = tamanho_previsto is None or tamanho_previsto <= limiar_memoria
+        formato_ok = self.sufixo in FORMATOS_MEMORIA or not self.sufixo
+        self._limiar = limiar_memoria if formato_ok and cabe_na_memoria else 0
+        self._arquivo = io.BytesIO() if self._limiar else self._abrir_em_disco()
+
+    @property
+    def em_memoria(self) -> bool:
+        return self.caminho is None
+
+    def _abrir_em_disco(self):
+        arquivo = tempfile.NamedTemporaryFile(prefix='upload_', suffix=self.sufixo, dir=self.diretorio, delete=False)
+        self.caminho = arquivo.name
+        return arquivo
+
+    def _transbordar(self):
+        """Move o buffer em memória para um arquivo no spool"""
+        buffer = self._arquivo
+        self._arquivo = self._abrir_em_disco()
+        self._arquivo.write(buffer.getbuffer())
+        buffer.close()
+
+    def write(self, dados: bytes) -> int:
+        self._hash.update(dados)
+        self.tamanho_bytes += len(dados)
+        if self.em_memoria and self.tamanho_bytes > self._limiar:
+            self._transbordar()
+        return self._arquivo.write(dados)
+
+    def __getattr__(self, nome):
+        # seek/read/tell/flush etc. vão para o buffer/arquivo real (usado pelo parser do werkzeug)
+        return getattr(self._arquivo, nome)
+
+    def finalizar(self) -> 'ArquivoSpool':
+        """Fecha o arquivo (se em disco) e fixa o SHA-256 do conteúdo"""
+        if self.sha256 is None:
+            if not self.em_memoria:
+                self._arquivo.close()
+            self.sha256 = self._hash.hexdigest()
+        return self
+
+    def fonte(self) -> Union[str, bytes]:
+        """Caminho do arquivo em disco, ou os bytes se o upload ficou em memória"""
+        return self._arquivo.getvalue() if self.em_memoria else self.caminho
+
+    def garantir_em_disco(self) -> str:
+        """Força o conteúdo para o disco e retorna o caminho"""
+        if self.em_memoria:
+            self._transbordar()
+            self._arquivo.close()
+        return self.caminho
+
+    def remover(self):
+        """Fecha e apaga o arquivo (idempotente)"""
+        try:
+            self._arquivo.close()
+        except Exception:
+            pass
+        if self.caminho:
+            try:
+                os.unlink(self.caminho)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.remover()
+
+class UploadMuitoGrande(ValueError):
+    """Upload excedeu o limite de bytes aceito"""
+
+def gravar_stream_em_spool(stream, sufixo: str = '', tamanho_chunk: int = TAMANHO_CHUNK,
+                           limite_bytes: Optional[int] = None) -> ArquivoSpool:
+    """Copia um stream para o spool em blocos; reaproveita o spool se o stream já for um"""
+    if isinstance(stream, ArquivoSpool):
+        spool = stream.finalizar()
+        if limite_bytes is not None and spool.tamanho_bytes > limite_bytes:
+            spool.remover()
+            raise UploadMuitoGrande(f"Upload maior que {limite_bytes} bytes")
+        return spool
+
+    spool = ArquivoSpool(sufixo=sufixo)
+    try:
+        while True:
+            bloco = stream.read(tamanho_chunk)
+            if not bloco:
+                break
+            spool.write(bloco)
+            if limite_bytes is not None and spool.tamanho_bytes > limite_bytes:
+                raise UploadMuitoGrande(f"Upload maior que {limite_bytes} bytes")
+    except BaseException:
+        spool.remover()
+        raise
+    return spool.finalizar()
+
+def gravar_bytes_em_spool(dados: bytes, sufixo: str = '') -> ArquivoSpool:
+    """Grava um payload já em memória no spool (ex.: base64 decodificado)"""
+    spool = ArquivoSpool(sufixo=sufixo, tamanho_previsto=len(dados))
+    visao = memoryview(dados)  # fatias sem cópia
+    for inicio in range(0, len(visao), TAMANHO_CHUNK):
+        spool.write(visao[inicio:inicio + TAMANHO_CHUNK])
+    return spool.finalizar()
+
+class ErroJSON(ValueError):
+    """Corpo JSON malformado"""
+
+class ErroBase64(ValueError):
+    """Conteúdo base64 inválido"""
+
+class _DecodificadorBase64:
+    """Decodifica base64 em pedaços arbitrários, gravando blocos múltiplos de 4 no spool"""
+
+    _FORA_DO_ALFABETO = re.compile(r'[^A-Za-z0-9+/=]')  # descartados, como no b64decode padrão
+
+    def __init__(self, spool: ArquivoSpool):
+        self.spool = spool
+        self.pendente = ''
+
+    def alimentar(self, texto: str):
+        texto = self.pendente + self._FORA_DO_ALFABETO.sub('', texto)
+        limite = len(texto) - len(texto) % 4
+        if limite:
+            try:
+                self.spool.write(base64.b64decode(texto[:limite]))
+            except binascii.Error as e:
+                raise ErroBase64(str(e))
+        self.pendente = texto[limite:]
+
+    def finalizar(self):
+        if self.pendente:
+            raise ErroBase64('Incorrect padding')
+
+_ESCAPES_JSON = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_ESPECIAL_STRING = re.compile(r'["\\]')
+_CARACTERES_LITERAL = set('+-0123456789.eEtrufalsn')
+
+class _LeitorJSONStream:
+    """Parser JSON incremental; strings nos caminhos indicados vão como base64 para o spool"""
+
+    def __init__(self, stream, caminhos_base64: Set[Tuple[str, ...]], sufixo: str, tamanho_chunk: int):
+        self._stream = stream
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._fim = False
+        self.caminhos_base64 = caminhos_base64
+        self.sufixo = sufixo
+        self.tamanho_chunk = tamanho_chunk
+        self.spools: List[ArquivoSpool] = []
+
+    def _carregar(self) -> bool:
+        """Lê o próximo bloco do stream; False quando não há mais dados"""
+        while not self._fim:
+            bloco = self._stream.read(self.tamanho_chunk)
+            try:
+                if not bloco:
+                    self._fim = True
+                    texto = self._utf8.decode(b'', final=True)
+                else:
+                    texto = self._utf8.decode(bloco)
+            except UnicodeDecodeError as e:
+                raise ErroJSON(f'JSON não é UTF-8 válido: {e}')
+            if texto:
+                self._buf = self._buf[self._pos:] + texto
+                self._pos = 0
+                return True
+        return False
+
+    def _garantir(self, n: int):
+        while len(self._buf) - self._pos < n:
+            if not self._carregar():
+                raise ErroJSON('Fim inesperado do JSON')
+
+    def espiar(self) -> str:
+        """Próximo caractere significativo sem consumir ('' no fim)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._carregar():
+                return ''
+
+    def _consumir(self, esperado: str):
+        if self.espiar() != esperado:
+            raise ErroJSON(f"Esperado '{esperado}' na posição do JSON")
+        self._pos += 1
+
+    def valor(self, caminho: Tuple[str, ...] = ()) -> Any:
+        c = self.espiar()
+        if c == '{':
+            return self._objeto(caminho)
+        if c == '[':
+            return self._lista(caminho)
+        if c == '"':
+            if caminho in self.caminhos_base64:
+                return self._string_base64()
+            return ''.join(self._partes_string())
+        if c == '':
+            raise ErroJSON('Fim inesperado do JSON')
+        return self._literal()
+
+    def _objeto(self, caminho: Tuple[str, ...]) -> Dict[str, Any]:
+        self._pos += 1
+        resultado = {}
+        if self.espiar() == '}':
+            self._pos += 1
+            return resultado
+        while True:
+            if self.espiar() != '"':
+                raise ErroJSON('Chave de objeto inválida')
+            chave = ''.join(self._partes_string())
+            self._consumir(':')
+            resultado[chave] = self.valor(caminho + (chave,))
+            c = self.espiar()
+            self._pos += 1
+            if c == '}':
+                return resultado
+            if c != ',':
+                raise ErroJSON("Esperado ',' ou '}'")
+
+    def _lista(self, caminho: Tuple[str, ...]) -> List[Any]:
+        self._pos += 1
+        resultado = []
+        if self.espiar() == ']':
+            self._pos += 1
+            return resultado
+        while True:
+            resultado.append(self.valor(caminho + (str(len(resultado)),)))
+            c = self.espiar()
+            self._pos += 1
+            if c == ']':
+                return resultado
+            if c != ',':
+                raise ErroJSON("Esperado ',' ou ']'")
+
+    def _partes_string(self) -> Iterator[str]:
+        """Gera o conteúdo da string atual em pedaços, já sem escapes"""
+        self._pos += 1  # aspas de abertura
+        while True:
+            if self._pos >= len(self._buf) and not self._carregar():
+                raise ErroJSON('String não terminada')
+            especial = _ESPECIAL_STRING.search(self._buf, self._pos)
+            if especial is None:
+                yield self._buf[self._pos:]
+                self._pos = len(self._buf)
+                continue
+            indice = especial.start()
+            if indice > self._pos:
+                yield self._buf[self._pos:indice]
+            self._pos = indice + 1
+            if self._buf[indice] == '"':
+                return
+            yield self._escape()
+
+    def _escape(self) -> str:
+        self._garantir(1)
+        letra = self._buf[self._pos]
+        self._pos += 1
+        if letra != 'u':
+            if letra not in _ESCAPES_JSON:
+                raise ErroJSON(f'Escape inválido: \\{letra}')
+            return _ESCAPES_JSON[letra]
+
+        self._garantir(4)
+        try:
+            codigo = int(self._buf[self._pos:self._pos + 4], 16)
+        except ValueError:
+            raise ErroJSON('Escape \\u inválido')
+        self._pos += 4
+        if 0xD800 <= codigo < 0xDC00:
+            # Par substituto (\ud83c\udfaf): junta com a metade baixa
+            self._garantir(6)
+            if self._buf[self._pos:self._pos + 2] == '\\u':
+                baixo = int(self._buf[self._pos + 2:self._pos + 6], 16)
+                if 0xDC00 <= baixo < 0xE000:
+                    self._pos += 6
+                    return chr(0x10000 + ((codigo - 0xD800) << 10) + (baixo - 0xDC00))
+        return chr(codigo)
+
+    def _string_base64(self) -> ArquivoSpool:
+        spool = ArquivoSpool(sufixo=self.sufixo)
+        self.spools.append(spool)
+        decodificador = _DecodificadorBase64(spool)
+        for parte in self._partes_string():
+            decodificador.alimentar(parte)
+        decodificador.finalizar()
+        return spool.finalizar()
+
+    def _literal(self) -> Any:
+        partes = []
+        while True:
+            inicio = self._pos
+            while self._pos < len(self._buf) and self._buf[self._pos] in _CARACTERES_LITERAL:
+                self._pos += 1
+            partes.append(self._buf[inicio:self._pos])
+            if self._pos < len(self._buf) or not self._carregar():
+                break
+        token = ''.join(partes)
+        try:
+            return json.loads(token)
+        except ValueError:
+            raise ErroJSON(f'Valor inválido: {token[:20]!r}')
+
+def ler_json_com_base64(stream, caminhos_base64: Set[Tuple[str, ...]], sufixo: str = '',
+                        tamanho_chunk: int = TAMANHO_CHUNK) -> Tuple[Any, List[ArquivoSpool]]:
+    """
+    Lê um corpo JSON em stream. Strings nos caminhos indicados (ex.: {('data',)} ou
+    {('audio_file', 'content')}) são decodificadas de base64 direto para um ArquivoSpool,
+    que ocupa o lugar da string no resultado. Retorna (dados, spools criados).
+    """
+    leitor = _LeitorJSONStream(stream, caminhos_base64, sufixo, tamanho_chunk)
+    try:
+        dados = leitor.valor()
+        if leitor.espiar() != '':
+            raise ErroJSON('Conteúdo extra após o JSON')
+    except BaseException:
+        for spool in leitor.spools:
+            spool.remover()
+        raise
+    return dados, leitor.spools
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+📒 MANIFESTO DE LOTE (RETOMADA)
+===============================
+Registro em SQLite de cada arquivo de um lote: hash do áudio, modelo,
+opções, arquivo de saída e status. Se o lote morre no meio (OOM, reboot),
+a nova execução pula o que já foi concluído e refaz só o que falhou ou
+ficou faltando.
+
+A consulta é uma busca por chave primária (arquivo + configuração) e um
+os.stat(): o hash só é recalculado quando tamanho/mtime mudaram. Um item
+concluído é refeito se o áudio mudou de conteúdo ou se a transcrição
+foi apagada.
+
+Uso:
+    manifesto = ManifestoLote('transcricoes/.manifesto_lote.sqlite3')
+    estado = manifesto.verificar(arquivo, 'base', opcoes)
+    if not estado['concluido']:
+        ...
+        manifesto.registrar(arquivo, 'base', opcoes, 'concluido', saida=saida, sha256=estado['sha256'])
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from cache_transcricao import hash_arquivo
+
+NOME_MANIFESTO = '.manifesto_lote.sqlite3'
+STATUS_CONCLUIDO = 'concluido'
+STATUS_FALHOU = 'falhou'
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS itens (
+    arquivo       TEXT NOT NULL,
+    configuracao  TEXT NOT NULL,
+    sha256        TEXT,
+    tamanho       INTEGER,
+    mtime         REAL,
+    modelo        TEXT NOT NULL,
+    opcoes        TEXT NOT NULL,
+    saida         TEXT,
+    status        TEXT NOT NULL,
+    erro          TEXT,
+    tentativas    INTEGER NOT NULL DEFAULT 1,
+    atualizado_em REAL NOT NULL,
+    PRIMARY KEY (arquivo, configuracao)
+)
+"""
+
+def _configuracao(modelo: str, opcoes: Dict[str, Any]) -> str:
+    """Identificador curto de modelo + opções (o mesmo arquivo pode ser transcrito com várias)"""
+    descritor = json.dumps({'modelo': modelo, 'opcoes': opcoes}, sort_keys=True, default=str)
+    return hashlib.sha256(descritor.encode('utf-8')).hexdigest()[:16]
+
+class ManifestoLote:
+    """Status por arquivo de um lote, persistido em SQLite"""
+
+    def __init__(self, caminho: str):
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(str(self.caminho))
+        # WAL + synchronous=NORMAL: um commit por arquivo sem fsync a cada gravação
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.execute(_ESQUEMA)
+        self._conexao.commit()
+
+    def verificar(self, arquivo: str, modelo: str, opcoes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Estado do arquivo nesta configuração:
+        {'concluido': bool, 'status': str|None, 'saida': str|None, 'sha256': str|None}
+        `sha256` só vem preenchido quando o valor registrado ainda vale para o arquivo atual.
+        """
+        arquivo = os.path.abspath(arquivo)
+        linha = self._conexao.execute(
+            'SELECT sha256, tamanho, mtime, saida, status FROM itens WHERE arquivo = ? AND configuracao = ?',
+            (arquivo, _configuracao(modelo, opcoes))
+        ).fetchone()
+        if linha is None:
+            return {'concluido': False, 'status': None, 'saida': None, 'sha256': None}
+
+        sha256, tamanho, mtime, saida, status = linha
+        try:
+            info = os.stat(arquivo)
+        except OSError:
+            return {'concluido': False, 'status': status, 'saida': saida, 'sha256': None}
+
+        if sha256 and (info.st_size, info.st_mtime) != (tamanho, mtime):
+            # Arquivo tocado: só o conteúdo decide (cópia com novo mtime continua concluída)
+            atual = hash_arquivo(arquivo)
+            if atual == sha256:
+                self._conexao.execute(
+                    'UPDATE itens SET tamanho = ?, mtime = ? WHERE arquivo = ? AND configuracao = ?',
+                    (info.st_size, info.st_mtime, arquivo, _configuracao(modelo, opcoes))
+                )
+                self._conexao.commit()
+            sha_valido = atual
+            mesmo_conteudo = atual == sha256
+        else:
+            sha_valido = sha256
+            mesmo_conteudo = True
+
+        concluido = (status == STATUS_CONCLUIDO and mesmo_conteudo
+                     and bool(saida) and os.path.exists(saida))
+        return {'concluido': concluido, 'status': status, 'saida': saida, 'sha256': sha_valido}
+
+    def registrar(self, arquivo: str, modelo: str, opcoes: Dict[str, Any], status: str,
+                  saida: Optional[str] = None, erro: Optional[str] = None, sha256: Optional[str] = None):
+        """Grava o resultado de uma tentativa (conta as tentativas do arquivo nesta configuração)"""
+        arquivo = os.path.abspath(arquivo)
+        saida = os.path.abspath(saida) if saida else None
+        try:
+            info = os.stat(arquivo)
+            tamanho, mtime = info.st_size, info.st_mtime
+            if sha256 is None and status == STATUS_CONCLUIDO:
+                sha256 = hash_arquivo(arquivo)
+        except OSError:
+            tamanho = mtime = None
+
+        self._conexao.execute(
+            """
+            INSERT INTO itens (arquivo, configuracao, sha256, tamanho, mtime, modelo, opcoes,
+                               saida, status, erro, atualizado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (arquivo, configuracao) DO UPDATE SET
+                sha256 = excluded.sha256, tamanho = excluded.tamanho, mtime = excluded.mtime,
+                saida = COALESCE(excluded.saida, itens.saida), status = excluded.status,
+                erro = excluded.erro, tentativas = itens.tentativas + 1,
+                atualizado_em = excluded.atualizado_em
+            """,
+            (arquivo, _configuracao(modelo, opcoes), sha256, tamanho, mtime, modelo,
+             json.dumps(opcoes, sort_keys=True, default=str), saida, status, erro, time.time())
+        )
+        self._conexao.commit()
+
+    def resumo(self) -> Dict[str, int]:
+        """Quantidade de itens por status"""
+        return dict(self._conexao.execute('SELECT status, COUNT(*) FROM itens GROUP BY status').fetchall())
+
+    def fechar(self):
+        self._conexao.close()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+📈 MÉTRICAS NO FORMATO PROMETHEUS
+=================================
+Contadores, medidores e histogramas em memória, exportados no formato de
+texto do Prometheus (GET /metrics). Sem dependências nem serviços externos:
+quem quiser gráficos aponta um Prometheus/Grafana para o endpoint.
+
+Custo no caminho quente: uma busca em dicionário, um bisect nos limites
+do histograma e um lock por observação (microssegundos). A montagem do
+texto só acontece quando /metrics é lido.
+
+Uso:
+    registro = RegistroMetricas()
+    requisicoes = registro.contador('app_requests_total', 'Requisições', ('endpoint', 'status'))
+    latencia = registro.histograma('app_stage_seconds', 'Tempo por etapa', ('stage',))
+    requisicoes.inc(endpoint='/health', status='200')
+    with latencia.cronometrar(stage='decode'):
+        ...
+    texto = registro.renderizar()
+"""
+
+import math
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+TIPO_CONTEUDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Do upload de poucos KB à inferência de uma hora de áudio com o modelo large
+LIMITES_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                    30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+# Fator de tempo real (inferência / duração do áudio): < 1 é mais rápido que o tempo real
+LIMITES_FATOR_TEMPO_REAL = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _formatar_numero(valor: float) -> str:
+    if math.isinf(valor):
+        return '+Inf' if valor > 0 else '-Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence[str], extra: str = '') -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+class _Metrica:
+    tipo = ''
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: Dict[str, object]) -> Tuple[str, ...]:
+        if len(rotulos) != len(self.rotulos):
+            raise ValueError(f"{self.nome}: rótulos esperados {self.rotulos}, recebidos {tuple(rotulos)}")
+        return tuple(str(rotulos[nome]) for nome in self.rotulos)
+
+    def _amostras(self) -> List[str]:
+        raise NotImplementedError
+
+    def renderizar(self) -> str:
+        linhas = [f'# HELP {self.nome} {_escapar(self.ajuda)}', f'# TYPE {self.nome} {self.tipo}']
+        linhas.extend(self._amostras())
+        return '\n'.join(linhas)
+
+class Contador(_Metrica):
+    """Valor que só cresce (requisições, bytes)"""
+    tipo = 'counter'
+
+    def inc(self, valor: float = 1.0, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return [f'{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}'
+                for chave, valor in itens]
+
+class Medidor(Contador):
+    """Valor que sobe e desce (requisições em andamento)"""
+    tipo = 'gauge'
+
+    def dec(self, valor: float = 1.0, **rotulos):
+        self.inc(-valor, **rotulos)
+
+    def definir(self, valor: float, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = float(valor)
+
+class Histograma(_Metrica):
+    """Distribuição em faixas cumulativas (_bucket, _sum, _count)"""
+    tipo = 'histogram'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                 limites: Sequence[float] = LIMITES_SEGUNDOS):
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor: float, **rotulos):
+        chave = self._chave(rotulos)
+        indice = bisect.bisect_left(self.limites, valor)  # le: valor == limite entra na faixa
+        with self._lock:
+            estado = self._valores.get(chave)
+            if estado is None:
+                # contagens por faixa (não cumulativas) + faixa +Inf, soma
+                estado = self._valores[chave] = [[0] * (len(self.limites) + 1), 0.0]
+            estado[0][indice] += 1
+            estado[1] += valor
+
+    @contextmanager
+    def cronometrar(self, **rotulos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **rotulos)
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            itens = sorted((chave, (list(contagens), soma)) for chave, (contagens, soma) in self._valores.items())
+        linhas = []
+        for chave, (contagens, soma) in itens:
+            acumulado = 0
+            for limite, contagem in zip(self.limites + (math.inf,), contagens):
+                acumulado += contagem
+                rotulos = _formatar_rotulos(self.rotulos, chave, f'le="{_formatar_numero(limite)}"')
+                linhas.append(f'{self.nome}_bucket{rotulos} {acumulado}')
+            rotulos = _formatar_rotulos(self.rotulos, chave)
+            linhas.append(f'{self.nome}_sum{rotulos} {_formatar_numero(soma)}')
+            linhas.append(f'{self.nome}_count{rotulos} {acumulado}')
+        return linhas
+
+class RegistroMetricas:
+    """Conjunto de métricas de um processo, renderizado em /metrics"""
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica: _Metrica) -> _Metrica:
+        with self._lock:
+            if metrica.nome in self._metricas:
+                raise ValueError(f"Métrica já registrada: {metrica.nome}")
+            self._metricas[metrica.nome] = metrica
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self._registrar(Contador(nome, ajuda, rotulos))
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Medidor:
+        return self._registrar(Medidor(nome, ajuda, rotulos))
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   limites: Sequence[float] = LIMITES_SEGUNDOS) -> Histograma:
+        return self._registrar(Histograma(nome, ajuda, rotulos, limites))
+
+    def renderizar(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return '\n'.join(metrica.renderizar() for metrica in metricas) + '\n'
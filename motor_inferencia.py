@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+⚙️ MOTOR DE INFERÊNCIA - POOL DE PROCESSOS
+==========================================
+Cada worker é um processo do SO que carrega seus modelos Whisper uma única
+vez e consome tarefas de uma fila compartilhada. Assim a inferência (CPU)
+sai do processo web e escala com o número de núcleos em vez de disputar o GIL.
+
+Uso:
+    motor = MotorInferencia(num_workers=8, threads_por_worker=4)
+    motor.iniciar()
+    futuro = motor.submeter(transcrever_arquivo, '/tmp/audio.mp3', 'base', {'language': 'pt'})
+    resultado = futuro.result()
+    motor.encerrar()
+"""
+
+import os
+import time
+import queue
+import itertools
+import threading
+import traceback
+import multiprocessing as mp
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Callable, Union
+
+from cronometro_etapas import CronometroEtapas, etapa
+
+MAX_QUEDAS_NA_CARGA = 3      # quedas seguidas antes de ficar pronto (OOM na carga) até desistir
+ESPERA_MAXIMA_REINICIO = 30  # segundos entre tentativas de reiniciar um worker
+
+def configurar_threads_torch(threads: int):
+    """Limita as threads de BLAS/torch do processo atual (chamar antes de importar torch)"""
+    for variavel in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[variavel] = str(threads)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+def transcrever_pcm(obter_modelo: Callable, audio_array, modelo: str, opcoes: Dict[str, Any],
+                    vad: bool = False, decode_path: str = 'memory') -> Dict[str, Any]:
+    """Transcreve um array 16 kHz já decodificado (ex.: pelos decodificadores do pipeline_lote)"""
+    from decodificacao_audio import TAXA_WHISPER
+
+    with CronometroEtapas() as cronometro:
+        whisper_model = obter_modelo(modelo)
+        duracao = len(audio_array) / TAXA_WHISPER
+
+        info_vad = None
+        if vad:
+            from deteccao_voz import aplicar_vad
+            audio_array, mapa_vad, info_vad = aplicar_vad(audio_array, TAXA_WHISPER)
+
+        inicio = time.time()
+        with etapa('inference'):
+            resultado = whisper_model.transcribe(audio_array, **opcoes)
+        tempo_inferencia = time.time() - inicio
+
+    if info_vad is not None:
+        from deteccao_voz import remapear_resultado
+        remapear_resultado(resultado, mapa_vad)
+
+    return {
+        'text': resultado['text'],
+        'segments': [
+            {'start': seg['start'], 'end': seg['end'], 'text': seg['text']}
+            for seg in resultado.get('segments', [])
+        ],
+        'language': resultado.get('language'),
+        'duration': duracao,
+        'inference_time': tempo_inferencia,
+        'decode_path': decode_path,
+        'vad': info_vad,
+        'timings': cronometro.como_dict()
+    }
+
+def transcrever_arquivo(obter_modelo: Callable, fonte: Union[str, bytes], modelo: str,
+                        opcoes: Dict[str, Any], sufixo: str = '',
+                        sha256: Optional[str] = None, vad: bool = False) -> Dict[str, Any]:
+    """Decodifica a fonte (caminho ou bytes) em 16 kHz e transcreve com o modelo indicado"""
+    from decodificacao_audio import decodificar_audio
+
+    with CronometroEtapas() as cronometro:
+        obter_modelo(modelo)  # carrega antes de decodificar: erro de modelo não desperdiça a decodificação
+
+        inicio = time.time()
+        audio_array, _, decode_path = decodificar_audio(fonte, sufixo, sha256=sha256)
+        tempo_decodificacao = time.time() - inicio
+    resultado = transcrever_pcm(obter_modelo, audio_array, modelo, opcoes, vad, decode_path)
+    cronometro.mesclar(resultado['timings'])
+    resultado['decode_time'] = tempo_decodificacao
+    resultado['timings'] = cronometro.como_dict()
+    return resultado
+
+def transcrever_arquivo_em_fluxo(obter_modelo: Callable, fonte: Union[str, bytes], modelo: str,
+                                 opcoes: Dict[str, Any], sufixo: str = '', vad: bool = False) -> Dict[str, Any]:
+    """Decodificação em blocos + janelas de ~30s: memória limitada pela janela, não pela duração"""
+    from decodificacao_audio import decodificar_em_blocos, TAXA_WHISPER
+    from transcricao_longa import transcrever_em_fluxo
+
+    with CronometroEtapas() as cronometro:
+        obter_modelo(modelo)
+
+        def executar(funcao, *args):
+            return funcao(obter_modelo, *args)
+
+        segmentos, duracao, tempo_inferencia, idioma = [], 0.0, 0.0, None
+        info_vad = {'speech_seconds': 0.0, 'skipped_seconds': 0.0, 'regions': 0, 'total_seconds': 0.0} if vad else None
+        for janela in transcrever_em_fluxo(executar, decodificar_em_blocos(fonte, sufixo), TAXA_WHISPER,
+                                           modelo, opcoes, vad=vad):
+            segmentos.extend(janela['segments'])
+            duracao = janela['offset'] + janela['duration']
+            tempo_inferencia += janela['inference_time']
+            idioma = idioma or janela.get('language')
+            if info_vad is not None:
+                for chave in info_vad:
+                    info_vad[chave] = round(info_vad[chave] + janela['vad'][chave], 2)
+
+    return {
+        'text': ''.join(seg['text'] for seg in segmentos),
+        'segments': segmentos,
+        'language': idioma,
+        'duration': duracao,
+        'inference_time': tempo_inferencia,
+        'decode_path': 'stream',
+        'vad': info_vad,
+        'timings': cronometro.como_dict()
+    }
+
+def _loop_worker(indice: int, fila_tarefas, fila_eventos, threads: int,
+                 modelos_precarregar: List[str], orcamento_mb: Optional[float]):
+    """Laço principal de um worker: carrega modelos uma vez e processa tarefas"""
+    configurar_threads_torch(threads)
+    from registro_modelos import RegistroModelos
+
+    registro = RegistroModelos(
+        orcamento_mb=orcamento_mb,
+        ao_carregar=lambda nome, segundos: fila_eventos.put(('carga_modelo', indice, (nome, segundos)))
+    )
+    obter_modelo = registro.obter
+
+    try:
+        preload = registro.precarregar(modelos_precarregar)
+    except Exception as e:
+        # Modelo inexistente, download que falhou, Whisper ausente: reiniciar só repetiria o erro
+        fila_eventos.put(('erro_preload', indice, f"{type(e).__name__}: {e}"))
+        return
+
+    fila_eventos.put(('pronto', indice, {'pid': os.getpid(), 'preload': preload}))
+    fila_eventos.put(('registro', indice, registro.estatisticas()))
+
+    while True:
+        tarefa = fila_tarefas.get()
+        if tarefa is None:
+            break
+
+        id_tarefa, funcao, args = tarefa
+        fila_eventos.put(('inicio', id_tarefa, indice))
+        try:
+            resultado = funcao(obter_modelo, *args)
+            fila_eventos.put(('resultado', id_tarefa, resultado))
+        except Exception as e:
+            fila_eventos.put(('erro', id_tarefa, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"))
+        fila_eventos.put(('registro', indice, registro.estatisticas()))
+
+class ErroWorker(RuntimeError):
+    """Falha ocorrida dentro de um worker do motor de inferência"""
+
+class MotorInferencia:
+    """Pool de N processos, cada um com seus próprios modelos Whisper residentes"""
+
+    def __init__(self, num_workers: int = None, threads_por_worker: int = 1,
+                 modelos_precarregar: Optional[List[str]] = None, orcamento_mb: Optional[float] = None):
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 1) // max(1, threads_por_worker))
+        self.threads_por_worker = threads_por_worker
+        self.modelos_precarregar = list(modelos_precarregar or [])
+        self.orcamento_mb = orcamento_mb  # orçamento de memória de modelos POR worker
+
+        self._ctx = mp.get_context('spawn')  # fork + torch = deadlocks
+        self._fila_tarefas = None
+        self._fila_eventos = None
+        self._workers: Dict[int, Any] = {}
+        self._em_execucao: Dict[int, int] = {}   # indice do worker -> id da tarefa
+        self._futuros: Dict[int, Future] = {}
+        self._contador = itertools.count(1)
+        self._lock = threading.Lock()
+        self._coletor = None
+        self._ativo = False
+        self._prontos = set()
+        self._quedas_na_carga: Dict[int, int] = {}     # indice -> quedas seguidas antes de ficar pronto
+        self._reinicio_agendado: Dict[int, float] = {}  # indice -> quando reiniciar
+        self.erro_inicializacao: Optional[str] = None   # preenchido quando o motor desiste de subir
+        self.preload: Dict[int, Dict[str, Any]] = {}  # tempos de carga/warm-up de cada worker
+        self._registros: Dict[int, Dict[str, Any]] = {}  # estatísticas do registro de cada worker
+        self.stats = {'submetidas': 0, 'concluidas': 0, 'falhas': 0, 'workers_reiniciados': 0}
+        # ao_carregar_modelo(nome, segundos) a cada modelo carregado em algum worker
+        self.ao_carregar_modelo: Optional[Callable[[str, float], None]] = None
+
+    def iniciar(self, aguardar: bool = True, timeout: float = 600):
+        """Sobe os workers; com aguardar=True bloqueia até todos estarem prontos"""
+        with self._lock:
+            if self._ativo:
+                return
+            self._ativo = True
+            self._fila_tarefas = self._ctx.Queue()
+            self._fila_eventos = self._ctx.Queue()
+            for indice in range(self.num_workers):
+                self._iniciar_worker(indice)
+
+        self._coletor = threading.Thread(target=self._coletar_eventos, name='motor-inferencia', daemon=True)
+        self._coletor.start()
+
+        print(f"⚙️  Motor de inferência: {self.num_workers} workers x {self.threads_por_worker} threads")
+        if aguardar:
+            inicio = time.time()
+            while (self._contar_prontos() < self.num_workers and self.erro_inicializacao is None
+                   and time.time() - inicio < timeout):
+                time.sleep(0.1)
+            if self.erro_inicializacao is not None:
+                self.encerrar()
+                raise ErroWorker(self.erro_inicializacao)
+            print(f"✅ {self._contar_prontos()}/{self.num_workers} workers prontos em {time.time() - inicio:.1f}s")
+
+    def _contar_prontos(self) -> int:
+        with self._lock:
+            return len(self._prontos)
+
+    def _iniciar_worker(self, indice: int):
+        processo = self._ctx.Process(
+            target=_loop_worker,
+            args=(indice, self._fila_tarefas, self._fila_eventos,
+                  self.threads_por_worker, self.modelos_precarregar, self.orcamento_mb),
+            name=f'whisper-worker-{indice}',
+            daemon=True
+        )
+        processo.start()
+        self._workers[indice] = processo
+
+    def submeter(self, funcao: Callable, *args) -> Future:
+        """Enfileira funcao(obter_modelo, *args) para o próximo worker livre"""
+        futuro = Future()
+        if self.erro_inicializacao is not None:
+            futuro.set_exception(ErroWorker(self.erro_inicializacao))
+            return futuro
+        if not self._ativo:
+            self.iniciar(aguardar=False)
+
+        with self._lock:
+            id_tarefa = next(self._contador)
+            self._futuros[id_tarefa] = futuro
+            self.stats['submetidas'] += 1
+        self._fila_tarefas.put((id_tarefa, funcao, args))
+        return futuro
+
+    def _coletar_eventos(self):
+        ultima_verificacao = time.time()
+        while self._ativo:
+            if time.time() - ultima_verificacao >= 1.0:
+                self._verificar_workers()
+                ultima_verificacao = time.time()
+            try:
+                evento, chave, valor = self._fila_eventos.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            self._tratar_evento(evento, chave, valor)
+
+    def _tratar_evento(self, evento: str, chave, valor):
+        """Aplica um evento vindo dos workers (coletor, ou o que sobrou na fila ao encerrar)"""
+        if evento == 'pronto':
+            with self._lock:
+                self._prontos.add(chave)
+                self._quedas_na_carga.pop(chave, None)
+            self.preload[chave] = valor['preload']
+        elif evento == 'erro_preload':
+            self._falhar_inicializacao(
+                f"Worker {chave} não conseguiu pré-carregar {', '.join(self.modelos_precarregar)}: {valor}")
+        elif evento == 'registro':
+            with self._lock:
+                self._registros[chave] = valor
+        elif evento == 'carga_modelo':
+            if self.ao_carregar_modelo is not None:
+                self.ao_carregar_modelo(*valor)
+        elif evento == 'inicio':
+            with self._lock:
+                self._em_execucao[valor] = chave
+                futuro = self._futuros.get(chave)
+            if futuro:
+                futuro.set_running_or_notify_cancel()
+        elif evento in ('resultado', 'erro'):
+            with self._lock:
+                futuro = self._futuros.pop(chave, None)
+                for indice, id_tarefa in list(self._em_execucao.items()):
+                    if id_tarefa == chave:
+                        del self._em_execucao[indice]
+                self.stats['concluidas' if evento == 'resultado' else 'falhas'] += 1
+            if futuro is None:
+                return
+            if evento == 'resultado':
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(ErroWorker(valor))
+
+    def _falhar_inicializacao(self, mensagem: str):
+        """Desiste de subir o motor: não reinicia mais workers e falha as tarefas pendentes"""
+        with self._lock:
+            if self.erro_inicializacao is not None:
+                return
+            self.erro_inicializacao = mensagem
+            futuros = list(self._futuros.values())
+            self._futuros.clear()
+            self._em_execucao.clear()
+        print(f"❌ Motor de inferência: {mensagem}")
+        for futuro in futuros:
+            futuro.set_exception(ErroWorker(mensagem))
+
+    def _verificar_workers(self):
+        """Repõe workers que morreram (OOM, segfault) e falha a tarefa que estava neles"""
+        agora = time.time()
+        for indice, processo in list(self._workers.items()):
+            if processo.is_alive() or not self._ativo or self.erro_inicializacao is not None:
+                continue
+            if indice in self._reinicio_agendado:
+                if agora >= self._reinicio_agendado[indice]:
+                    del self._reinicio_agendado[indice]
+                    self._iniciar_worker(indice)
+                continue
+            with self._lock:
+                id_tarefa = self._em_execucao.pop(indice, None)
+                futuro = self._futuros.pop(id_tarefa, None) if id_tarefa else None
+                self.stats['workers_reiniciados'] += 1
+                estava_pronto = indice in self._prontos
+                self._prontos.discard(indice)
+                # Queda antes do 'pronto' (carga/warm-up): conta para desistir e espaça as tentativas
+                quedas = 0 if estava_pronto else self._quedas_na_carga.get(indice, 0) + 1
+                self._quedas_na_carga[indice] = quedas
+            if futuro:
+                futuro.set_exception(ErroWorker(f"Worker {indice} terminou com código {processo.exitcode}"))
+            if quedas >= MAX_QUEDAS_NA_CARGA:
+                self._falhar_inicializacao(f"Worker {indice} caiu {quedas} vezes seguidas ao carregar os modelos "
+                                           f"(último exit {processo.exitcode})")
+                continue
+            espera = min(ESPERA_MAXIMA_REINICIO, 2 ** quedas - 1)
+            print(f"⚠️  Worker {indice} caiu (exit {processo.exitcode}), reiniciando"
+                  f"{f' em {espera}s' if espera else ''}...")
+            if espera:
+                self._reinicio_agendado[indice] = agora + espera
+            else:
+                self._iniciar_worker(indice)
+
+    def encerrar(self, timeout: float = 10):
+        """Sinaliza fim aos workers e aguarda a saída"""
+        with self._lock:
+            if not self._ativo:
+                return
+            # Antes das sentinelas: o coletor veria os workers saindo como quedas e os reiniciaria
+            self._ativo = False
+            self._reinicio_agendado.clear()
+        if self._coletor is not None:
+            self._coletor.join()
+        for _ in self._workers:
+            self._fila_tarefas.put(None)
+        for processo in self._workers.values():
+            processo.join(timeout)
+            if processo.is_alive():
+                processo.terminate()
+
+        # Resultados das tarefas que terminaram depois que o coletor parou
+        while True:
+            try:
+                self._tratar_evento(*self._fila_eventos.get(timeout=0.1))
+            except (queue.Empty, EOFError, OSError):
+                break
+
+        with self._lock:
+            pendentes = list(self._futuros.values())
+            self._futuros.clear()
+            self._em_execucao.clear()
+        for futuro in pendentes:
+            if not futuro.done():
+                futuro.set_exception(ErroWorker("Motor de inferência encerrado antes da conclusão"))
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.num_workers,
+                'workers_prontos': len(self._prontos),
+                'pronto': len(self._prontos) >= self.num_workers,
+                'erro_inicializacao': self.erro_inicializacao,
+                'threads_por_worker': self.threads_por_worker,
+                'em_execucao': len(self._em_execucao),
+                'na_fila': len(self._futuros) - len(self._em_execucao),
+                **self.stats,
+                'registros_modelos': dict(self._registros)
+            }
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+🔬 PERFILADOR DE TRANSCRIÇÕES
+=============================
+Quando uma execução está lenta: o tempo vai para o librosa/audioread, o
+loop do decoder do Whisper ou o alinhamento de palavras? Perfilador roda
+o trabalho sob dois instrumentos ao mesmo tempo:
+- cProfile (determinístico): .pstats para snakeviz/pstats, contagem de
+  chamadas e tempo próprio por função
+- Amostrador de pilhas (a cada 5 ms, thread separada): pilhas completas no
+  formato "collapsed" (a;b;c N), direto para flamegraph.pl ou speedscope
+
+Os dois só enxergam a thread que chamou; com o MotorInferencia a
+transcrição roda em outro processo, então a tarefa vai embrulhada em
+perfilar_tarefa() e o perfil é gravado pelo próprio worker. Só um cProfile
+pode estar ativo por vez no Python 3.12+: com outro já rodando (duas
+requisições perfiladas simultâneas), fica só o amostrador de pilhas.
+
+Uso:
+    with Perfilador() as perfil:
+        transcrever(...)
+    arquivos = perfil.gravar('transcricoes/aula')   # aula.pstats, aula.collapsed
+    perfil.imprimir_principais()
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from typing import Dict, Any, List, Callable
+
+INTERVALO_AMOSTRAGEM = 0.005  # segundos entre amostras de pilha
+PROFUNDIDADE_MAXIMA = 128
+TOP_FUNCOES = 15
+
+def _nome_quadro(quadro) -> str:
+    codigo = quadro.f_code
+    modulo = os.path.splitext(os.path.basename(codigo.co_filename))[0]
+    return f"{modulo}:{codigo.co_name}"
+
+class AmostradorPilhas:
+    """Amostra a pilha de uma thread em intervalos fixos e conta as pilhas iguais"""
+
+    def __init__(self, id_thread: int, intervalo: float = INTERVALO_AMOSTRAGEM):
+        self.id_thread = id_thread
+        self.intervalo = intervalo
+        self.pilhas: Counter = Counter()
+        self.amostras = 0
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            quadro = sys._current_frames().get(self.id_thread)
+            if quadro is None:
+                continue
+            nomes = []
+            while quadro is not None and len(nomes) < PROFUNDIDADE_MAXIMA:
+                nomes.append(_nome_quadro(quadro))
+                quadro = quadro.f_back
+            self.pilhas[';'.join(reversed(nomes))] += 1  # raiz primeiro
+            self.amostras += 1
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._amostrar, name='amostrador-pilhas', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def gravar(self, caminho: str):
+        """Formato collapsed: uma pilha por linha, seguida do número de amostras"""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, contagem in self.pilhas.most_common():
+                f.write(f"{pilha} {contagem}\n")
+
+class Perfilador:
+    """cProfile + amostrador de pilhas sobre a thread atual"""
+
+    def __init__(self, intervalo: float = INTERVALO_AMOSTRAGEM):
+        self.intervalo = intervalo
+        self._perfil = cProfile.Profile()
+        self._amostrador = None
+        self.duracao = 0.0
+        self.cprofile_ativo = False
+
+    def __enter__(self) -> 'Perfilador':
+        self._amostrador = AmostradorPilhas(threading.get_ident(), self.intervalo)
+        self._amostrador.iniciar()
+        self._inicio = time.perf_counter()
+        try:
+            self._perfil.enable()
+            self.cprofile_ativo = True
+        except ValueError:
+            print("⚠️  Outro cProfile já está ativo: perfil só com amostras de pilha")
+        return self
+
+    def __exit__(self, *exc):
+        if self.cprofile_ativo:
+            self._perfil.disable()
+        self.duracao = time.perf_counter() - self._inicio
+        self._amostrador.parar()
+
+    def gravar(self, base: str) -> Dict[str, str]:
+        """Grava <base>.pstats e <base>.collapsed; retorna os caminhos"""
+        os.makedirs(os.path.dirname(os.path.abspath(base)), exist_ok=True)
+        arquivos = {'collapsed': f"{base}.collapsed"}
+        if self.cprofile_ativo:
+            arquivos['pstats'] = f"{base}.pstats"
+            self._perfil.dump_stats(arquivos['pstats'])
+        self._amostrador.gravar(arquivos['collapsed'])
+        return arquivos
+
+    def principais(self, n: int = TOP_FUNCOES) -> List[Dict[str, Any]]:
+        """Funções com mais tempo próprio (fora das funções que chamam)"""
+        if not self.cprofile_ativo:
+            # Estimativa pelas amostras: o topo de cada pilha é quem estava executando
+            topos = Counter()
+            for pilha, contagem in self._amostrador.pilhas.items():
+                topos[pilha.rsplit(';', 1)[-1]] += contagem
+            return [{'function': nome, 'calls': None, 'self_seconds': round(contagem * self.intervalo, 4),
+                     'cumulative_seconds': None} for nome, contagem in topos.most_common(n)]
+        estatisticas = pstats.Stats(self._perfil, stream=io.StringIO())
+        linhas = []
+        for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in estatisticas.stats.items():
+            nome = funcao if arquivo == '~' else f"{os.path.basename(arquivo)}:{linha}({funcao})"
+            linhas.append({'function': nome, 'calls': chamadas,
+                           'self_seconds': round(proprio, 4), 'cumulative_seconds': round(acumulado, 4)})
+        linhas.sort(key=lambda item: item['self_seconds'], reverse=True)
+        return linhas[:n]
+
+    def imprimir_principais(self, n: int = TOP_FUNCOES):
+        print(f"\n🔬 FUNÇÕES MAIS QUENTES (tempo próprio, {self.duracao:.1f}s perfilados, "
+              f"{self._amostrador.amostras} amostras de pilha)")
+        print(f"{'Próprio':>10} {'Acumulado':>10} {'Chamadas':>10}  Função")
+        for item in self.principais(n):
+            acumulado = f"{item['cumulative_seconds']:>9.3f}s" if item['cumulative_seconds'] is not None else f"{'-':>10}"
+            chamadas = f"{item['calls']:>10,}" if item['calls'] is not None else f"{'-':>10}"
+            print(f"{item['self_seconds']:>9.3f}s {acumulado} {chamadas}  {item['function']}")
+
+def perfilar_tarefa(obter_modelo: Callable, base: str, funcao: Callable, *args) -> Dict[str, Any]:
+    """
+    Tarefa do MotorInferencia: roda funcao(obter_modelo, *args) sob o Perfilador
+    no próprio worker e anexa resultado['profile'] com os arquivos e o top.
+    """
+    with Perfilador() as perfil:
+        resultado = funcao(obter_modelo, *args)
+    resultado['profile'] = {'files': perfil.gravar(base), 'top': perfil.principais(),
+                            'seconds': round(perfil.duracao, 3)}
+    return resultado
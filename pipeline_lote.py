@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+🏭 PIPELINE DECODIFICAÇÃO → INFERÊNCIA
+======================================
+Sem pipeline, cada worker decodifica (librosa.load: decodificação +
+reamostragem) e só depois transcreve: nesse intervalo o modelo fica parado.
+Aqui threads decodificadoras preparam os arrays 16 kHz dos próximos
+arquivos enquanto os workers do MotorInferencia transcrevem os atuais.
+
+- Com o cache de PCM ativo, o decodificador grava o .npy e o worker só o
+  mapeia em memória (nada de arrays grandes atravessando a fila do pool)
+- Sem o cache, o array decodificado segue para o worker (transcrever_pcm)
+- A quantidade de arquivos entre o início da decodificação e o fim da
+  inferência é limitada, então a memória não cresce com o tamanho do lote
+
+estatisticas() mostra a utilização de cada etapa: a mais próxima de 100%
+é o gargalo.
+
+Uso:
+    pipeline = PipelineLote(motor, 'base', {'language': 'pt'}, decodificadores=2)
+    for contexto, resultado, erro in pipeline.executar([(arquivo, sha256, contexto), ...]):
+        ...
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+class PipelineLote:
+    """Decodificadores (threads) → fila limitada → workers de inferência"""
+
+    def __init__(self, motor, modelo: str, opcoes: Dict[str, Any], decodificadores: int = 2,
+                 max_em_voo: Optional[int] = None, vad: bool = False):
+        self.motor = motor
+        self.modelo = modelo
+        self.opcoes = opcoes
+        self.decodificadores = max(1, decodificadores)
+        # Padrão: decodificadores ocupados + por worker, um arquivo em inferência e um esperando
+        self.max_em_voo = max_em_voo or self.decodificadores + 2 * motor.num_workers
+        self.vad = vad
+        self._lock = threading.Lock()
+        self.stats = {'arquivos': 0, 'tempo_decodificacao': 0.0, 'tempo_inferencia': 0.0,
+                      'tempo_fila': 0.0, 'max_em_voo': 0, 'tempo_total': 0.0}
+
+    def _decodificar(self, arquivo: str, sha256: Optional[str]):
+        """Etapa 1 (thread): decodifica; com cache de PCM devolve só a referência ao arquivo"""
+        from cache_pcm import cache_pcm_padrao, hash_fonte
+        from cronometro_etapas import CronometroEtapas
+        from decodificacao_audio import decodificar_audio
+
+        inicio = time.time()
+        com_cache = cache_pcm_padrao() is not None
+        if com_cache:
+            sha256 = sha256 or hash_fonte(arquivo)  # o worker reaproveita em vez de reler o arquivo
+        with CronometroEtapas() as cronometro:
+            audio, _, caminho = decodificar_audio(arquivo, sha256=sha256)
+        if com_cache:
+            audio = None  # o worker lê o .npy que acabou de ser gravado
+        else:
+            import numpy as np
+            audio = np.asarray(audio)
+        with self._lock:
+            self.stats['tempo_decodificacao'] += time.time() - inicio
+        return audio, sha256, caminho, time.time(), cronometro
+
+    def executar(self, itens: Iterable[Tuple[str, Optional[str], Any]]) -> Iterator[Tuple[Any, Optional[Dict], Optional[str]]]:
+        """
+        Processa (arquivo, sha256, contexto) e gera (contexto, resultado, erro) na ordem de conclusão.
+        """
+        from motor_inferencia import transcrever_arquivo, transcrever_pcm
+
+        concluidos: "queue.Queue" = queue.Queue()
+        vagas = threading.Semaphore(self.max_em_voo)
+        em_voo = [0]
+        inicio = time.time()
+
+        def terminar(contexto, resultado, erro):
+            with self._lock:
+                em_voo[0] -= 1
+            vagas.release()
+            concluidos.put((contexto, resultado, erro))
+
+        def decodificado(futuro_decodificacao, arquivo, sha256, contexto):
+            """Etapa 2: entrega o áudio pronto ao motor (roda na thread decodificadora)"""
+            try:
+                audio, sha256, caminho, pronto_em, cronometro = futuro_decodificacao.result()
+                if audio is None:
+                    futuro = self.motor.submeter(transcrever_arquivo, arquivo, self.modelo, self.opcoes,
+                                                 '', sha256, self.vad)
+                else:
+                    futuro = self.motor.submeter(transcrever_pcm, audio, self.modelo, self.opcoes,
+                                                 self.vad, caminho)
+            except Exception as e:
+                terminar(contexto, None, f"Decodificação: {str(e).strip() or type(e).__name__}")
+                return
+
+            def inferido(futuro):
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    erro = str(e).strip()
+                    terminar(contexto, None, erro.splitlines()[0] if erro else type(e).__name__)
+                    return
+                resultado['decode_path'] = caminho
+                # Etapas do decodificador (nesta thread) + as do worker
+                cronometro.mesclar(resultado.get('timings'))
+                resultado['timings'] = cronometro.como_dict()
+                with self._lock:
+                    self.stats['tempo_inferencia'] += resultado['inference_time']
+                    # Tempo entre ficar decodificado e sair do worker, menos a inferência em si
+                    self.stats['tempo_fila'] += max(0.0, time.time() - pronto_em - resultado['inference_time'])
+                terminar(contexto, resultado, None)
+
+            futuro.add_done_callback(inferido)
+
+        def alimentar(decodificadores: ThreadPoolExecutor, lista: list):
+            for arquivo, sha256, contexto in lista:
+                vagas.acquire()  # limite de memória: espera um arquivo terminar
+                with self._lock:
+                    em_voo[0] += 1
+                    self.stats['max_em_voo'] = max(self.stats['max_em_voo'], em_voo[0])
+                futuro = decodificadores.submit(self._decodificar, arquivo, sha256)
+                futuro.add_done_callback(
+                    lambda f, a=arquivo, s=sha256, c=contexto: decodificado(f, a, s, c)
+                )
+
+        lista = list(itens)
+        with ThreadPoolExecutor(max_workers=self.decodificadores, thread_name_prefix='decodificador') as decodificadores:
+            alimentador = threading.Thread(target=alimentar, args=(decodificadores, lista),
+                                           name='pipeline-lote', daemon=True)
+            alimentador.start()
+            for _ in range(len(lista)):
+                yield concluidos.get()
+            alimentador.join()
+
+        with self._lock:
+            self.stats['arquivos'] += len(lista)
+            self.stats['tempo_total'] += time.time() - inicio
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Utilização de cada etapa (tempo ocupado / capacidade no tempo total)"""
+        with self._lock:
+            total = self.stats['tempo_total']
+            util_decodificacao = (self.stats['tempo_decodificacao'] / (total * self.decodificadores)
+                                  if total else 0.0)
+            util_inferencia = (self.stats['tempo_inferencia'] / (total * self.motor.num_workers)
+                               if total else 0.0)
+            return {
+                **{chave: round(valor, 2) if isinstance(valor, float) else valor
+                   for chave, valor in self.stats.items()},
+                'decodificadores': self.decodificadores,
+                'workers_inferencia': self.motor.num_workers,
+                'utilizacao_decodificacao': round(util_decodificacao, 3),
+                'utilizacao_inferencia': round(util_inferencia, 3),
+                'gargalo': 'decodificacao' if util_decodificacao > util_inferencia else 'inferencia'
+            }
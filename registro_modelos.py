@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🗂️ REGISTRO DE MODELOS WHISPER
+==============================
+Cache thread-safe de modelos carregados:
+- Cada modelo é carregado UMA vez, mesmo com requisições simultâneas (single-flight)
+- O tamanho residente de cada modelo é medido (parâmetros + buffers)
+- Acima do orçamento de memória, o modelo usado há mais tempo é descarregado (LRU)
+"""
+
+import gc
+import time
+import itertools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+from cronometro_etapas import etapa, instrumentar_whisper
+
+def medir_modelo_mb(modelo) -> float:
+    """Memória residente do modelo em MB (parâmetros + buffers do torch)"""
+    try:
+        tensores = itertools.chain(modelo.parameters(), modelo.buffers())
+        return sum(t.numel() * t.element_size() for t in tensores) / (1024 * 1024)
+    except AttributeError:
+        return 0.0
+
+def aquecer_modelo(modelo, segundos: float = 2.0) -> float:
+    """Roda uma transcrição sintética curta para aquecer kernels/caches; retorna o tempo"""
+    import numpy as np
+
+    # Ruído baixo e determinístico: exercita o encoder e o loop do decoder
+    audio = (np.random.default_rng(0).standard_normal(int(16000 * segundos)) * 0.01).astype(np.float32)
+    inicio = time.time()
+    modelo.transcribe(audio, language='pt', fp16=False, verbose=None,
+                      temperature=0.0, condition_on_previous_text=False)
+    return time.time() - inicio
+
+def _carregar_whisper(nome: str):
+    import whisper
+    modelo = whisper.load_model(nome)
+    instrumentar_whisper()
+    return modelo
+
+class _CargaEmAndamento:
+    """Carga de um modelo em curso; outras threads esperam no evento"""
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.erro: Optional[BaseException] = None
+
+class RegistroModelos:
+    """Modelos Whisper residentes com carga única e despejo LRU por orçamento de memória"""
+
+    def __init__(self, orcamento_mb: Optional[float] = None, carregador: Callable = None,
+                 ao_carregar: Optional[Callable[[str, float], None]] = None):
+        self.orcamento_mb = orcamento_mb
+        self._carregador = carregador or _carregar_whisper
+        self.ao_carregar = ao_carregar  # ao_carregar(nome, segundos) após cada carga (ex.: métricas)
+        self._modelos: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # ordem = LRU -> MRU
+        self._cargas: Dict[str, _CargaEmAndamento] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'load_errors': 0, 'load_time_total': 0.0}
+
+    def obter(self, nome: str):
+        """Retorna o modelo, carregando-o se necessário (apenas uma carga por nome)"""
+        while True:
+            with self._lock:
+                entrada = self._modelos.get(nome)
+                if entrada is not None:
+                    self._modelos.move_to_end(nome)
+                    entrada['last_used'] = time.time()
+                    entrada['hits'] += 1
+                    self.stats['hits'] += 1
+                    return entrada['model']
+
+                carga = self._cargas.get(nome)
+                dono = carga is None
+                if dono:
+                    carga = self._cargas[nome] = _CargaEmAndamento()
+                    self.stats['misses'] += 1
+
+            if dono:
+                return self._carregar(nome, carga)
+
+            # Outra thread já está carregando: espera e reaproveita
+            carga.evento.wait()
+            if carga.erro is not None:
+                raise carga.erro
+
+    def _carregar(self, nome: str, carga: _CargaEmAndamento):
+        print(f"🤖 Carregando modelo Whisper '{nome}'...")
+        inicio = time.time()
+        try:
+            with etapa('model_load'):
+                modelo = self._carregador(nome)
+        except BaseException as e:
+            carga.erro = e
+            with self._lock:
+                self.stats['load_errors'] += 1
+                del self._cargas[nome]
+            carga.evento.set()
+            raise
+
+        tempo_carga = time.time() - inicio
+        tamanho_mb = medir_modelo_mb(modelo)
+        with self._lock:
+            self._modelos[nome] = {
+                'model': modelo,
+                'size_mb': tamanho_mb,
+                'load_time': tempo_carga,
+                'loaded_at': time.time(),
+                'last_used': time.time(),
+                'hits': 0
+            }
+            self.stats['load_time_total'] += tempo_carga
+            del self._cargas[nome]
+            despejados = self._despejar_excesso(manter=nome)
+        carga.evento.set()
+        if self.ao_carregar is not None:
+            self.ao_carregar(nome, tempo_carga)
+
+        print(f"✅ Modelo '{nome}' carregado em {tempo_carga:.1f}s ({tamanho_mb:.0f} MB)")
+        if despejados:
+            print(f"♻️  Orçamento de {self.orcamento_mb:.0f} MB excedido, descarregados: {', '.join(despejados)}")
+            self._liberar_memoria()
+        return modelo
+
+    def _despejar_excesso(self, manter: str) -> List[str]:
+        """Remove modelos LRU até caber no orçamento (chamar com o lock)"""
+        despejados = []
+        if not self.orcamento_mb:
+            return despejados
+
+        while self._residente_mb() > self.orcamento_mb:
+            candidato = next((nome for nome in self._modelos if nome != manter), None)
+            if candidato is None:
+                break
+            del self._modelos[candidato]
+            self.stats['evictions'] += 1
+            despejados.append(candidato)
+        return despejados
+
+    def _residente_mb(self) -> float:
+        return sum(entrada['size_mb'] for entrada in self._modelos.values())
+
+    @staticmethod
+    def _liberar_memoria():
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    def precarregar(self, nomes: List[str], aquecer: bool = True) -> Dict[str, Dict[str, float]]:
+        """Carrega (e aquece) os modelos indicados; retorna tempos de carga e warm-up"""
+        tempos = {}
+        for nome in nomes:
+            inicio = time.time()
+            modelo = self.obter(nome)
+            tempos[nome] = {'load_time': round(time.time() - inicio, 2), 'warmup_time': None}
+            if aquecer:
+                tempos[nome]['warmup_time'] = round(aquecer_modelo(modelo), 2)
+                print(f"🔥 Modelo '{nome}' aquecido em {tempos[nome]['warmup_time']:.1f}s")
+        return tempos
+
+    def descarregar(self, nome: str) -> bool:
+        """Remove um modelo do registro; retorna False se não estava carregado"""
+        with self._lock:
+            removido = self._modelos.pop(nome, None) is not None
+        if removido:
+            self._liberar_memoria()
+        return removido
+
+    def carregados(self) -> List[str]:
+        with self._lock:
+            return list(self._modelos.keys())
+
+    def __contains__(self, nome: str) -> bool:
+        with self._lock:
+            return nome in self._modelos
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / consultas, 4) if consultas else 0.0,
+                'resident_mb': round(self._residente_mb(), 1),
+                'budget_mb': self.orcamento_mb,
+                'models': {
+                    nome: {
+                        'size_mb': round(entrada['size_mb'], 1),
+                        'load_time': round(entrada['load_time'], 2),
+                        'hits': entrada['hits'],
+                        'last_used': datetime.fromtimestamp(entrada['last_used']).isoformat()
+                    }
+                    for nome, entrada in self._modelos.items()
+                }
+            }
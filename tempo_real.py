@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+🎙️ TRANSCRIÇÃO EM TEMPO REAL - BUFFER DESLIZANTE
+================================================
+Legendas ao vivo a partir de quadros PCM 16 kHz (int16 little-endian, mono).
+
+O buffer guarda só a "cauda instável": o áudio depois do último segmento
+finalizado. A cada `passo` segundos de áudio novo a cauda é transcrita de
+novo e:
+- todos os segmentos menos o último viram `final` (o Whisper corta
+  segmentos em pausas, então não mudam mais) e o áudio deles sai do buffer
+- o último segmento é enviado como `partial` e pode mudar na próxima passada
+
+`janela` limita o custo: passando dela, tudo o que foi reconhecido é
+finalizado. A memória por conexão fica em ~2x `janela` de áudio (o excesso
+de um cliente mais rápido que o tempo real é descartado e contabilizado).
+
+Latência x CPU: `passo` menor = legendas mais rápidas e mais decodificações;
+`janela` maior = mais contexto por decodificação e mais CPU por passo.
+"""
+
+import time
+from typing import Dict, Any, List, Callable
+
+from decodificacao_audio import TAXA_WHISPER
+from transcricao_longa import transcrever_trecho, _remover_repeticao, TAMANHO_PROMPT
+
+JANELA_PADRAO = 10.0  # segundos
+PASSO_PADRAO = 1.0    # segundos
+
+class TranscricaoTempoReal:
+    """Estado de uma conexão ao vivo: buffer da cauda instável + texto já finalizado"""
+
+    def __init__(self, executar: Callable, modelo: str, opcoes: Dict[str, Any],
+                 janela: float = JANELA_PADRAO, passo: float = PASSO_PADRAO):
+        if passo <= 0 or janela < passo:
+            raise ValueError("Use 0 < passo <= janela")
+        self.executar = executar
+        self.modelo = modelo
+        self.opcoes = dict(opcoes)
+        self.janela = janela
+        self.passo = passo
+
+        self._partes: List[Any] = []       # quadros float32 ainda não concatenados
+        self._amostras = 0                 # amostras no buffer
+        self._novas = 0                    # amostras desde a última decodificação
+        self._inicio = 0.0                 # tempo absoluto do início do buffer (s)
+        self._limite = int(2 * janela * TAXA_WHISPER)
+        self._texto_final = ''             # fim do texto finalizado (contexto)
+        self.stats = {'audio_seconds': 0.0, 'decodes': 0, 'decode_time': 0.0,
+                      'finals': 0, 'partials': 0, 'dropped_seconds': 0.0}
+
+    def adicionar_pcm16(self, dados: bytes) -> List[Dict[str, Any]]:
+        """Acrescenta quadros PCM int16; retorna eventos se uma decodificação foi feita"""
+        import numpy as np
+
+        quadro = np.frombuffer(dados[:len(dados) - len(dados) % 2], dtype='<i2').astype(np.float32) / 32768.0
+        if len(quadro) == 0:
+            return []
+        self._partes.append(quadro)
+        self._amostras += len(quadro)
+        self._novas += len(quadro)
+        self.stats['audio_seconds'] += len(quadro) / TAXA_WHISPER
+
+        if self._amostras > self._limite:
+            self._descartar_excesso()
+
+        if self._novas < self.passo * TAXA_WHISPER:
+            return []
+        return self._decodificar(finalizar_tudo=False)
+
+    def finalizar(self) -> List[Dict[str, Any]]:
+        """Fim do stream: transcreve o que sobrou e finaliza tudo"""
+        if self._amostras == 0:
+            return []
+        return self._decodificar(finalizar_tudo=True)
+
+    def _buffer(self):
+        import numpy as np
+
+        if len(self._partes) > 1:
+            self._partes = [np.concatenate(self._partes)]
+        return self._partes[0] if self._partes else np.zeros(0, dtype=np.float32)
+
+    def _descartar_excesso(self):
+        """Cliente mais rápido que a decodificação: perde o áudio mais antigo, não a memória"""
+        excesso = self._amostras - self._limite
+        self._partes = [self._buffer()[excesso:]]
+        self._amostras -= excesso
+        self._inicio += excesso / TAXA_WHISPER
+        self.stats['dropped_seconds'] += excesso / TAXA_WHISPER
+
+    def _decodificar(self, finalizar_tudo: bool) -> List[Dict[str, Any]]:
+        audio = self._buffer()
+        fim_buffer = self._inicio + len(audio) / TAXA_WHISPER
+        self._novas = 0
+
+        opcoes = dict(self.opcoes)
+        if self._texto_final:
+            opcoes['initial_prompt'] = self._texto_final[-TAMANHO_PROMPT:]
+
+        inicio = time.time()
+        resultado = self.executar(transcrever_trecho, audio, self.modelo, opcoes, self._inicio)
+        self.stats['decodes'] += 1
+        self.stats['decode_time'] += time.time() - inicio
+
+        if self.opcoes.get('language') is None and resultado.get('language'):
+            self.opcoes['language'] = resultado['language']
+
+        segmentos = resultado['segments']
+        estourou_janela = len(audio) / TAXA_WHISPER >= self.janela
+        if finalizar_tudo or estourou_janela:
+            n_finais = len(segmentos)
+        else:
+            n_finais = max(0, len(segmentos) - 1)
+        finais, provisorios = segmentos[:n_finais], segmentos[n_finais:]
+
+        eventos = []
+        for seg in finais:
+            texto = _remover_repeticao(self._texto_final, seg['text']) if self._texto_final else seg['text']
+            if not texto.strip():
+                continue
+            # Só o fim do texto é guardado (prompt/deduplicação): memória constante por conexão
+            self._texto_final = (self._texto_final + texto)[-TAMANHO_PROMPT:]
+            eventos.append({'type': 'final', 'start': round(seg['start'], 2),
+                            'end': round(seg['end'], 2), 'text': texto.strip()})
+        self.stats['finals'] += len(eventos)
+
+        # Remove do buffer o áudio já finalizado (janela estourada sem fala = silêncio, sai tudo)
+        if finalizar_tudo or estourou_janela:
+            corte = fim_buffer
+        elif finais:
+            corte = finais[-1]['end']
+        else:
+            corte = self._inicio
+        amostras_corte = min(len(audio), max(0, int(round((corte - self._inicio) * TAXA_WHISPER))))
+        if amostras_corte:
+            self._partes = [audio[amostras_corte:]]
+            self._amostras = len(audio) - amostras_corte
+            self._inicio += amostras_corte / TAXA_WHISPER
+
+        if provisorios:
+            self.stats['partials'] += 1
+            eventos.append({'type': 'partial', 'start': round(provisorios[0]['start'], 2),
+                            'end': round(fim_buffer, 2),
+                            'text': ''.join(seg['text'] for seg in provisorios).strip()})
+        return eventos
+
+    def estatisticas(self) -> Dict[str, Any]:
+        stats = {chave: round(valor, 2) if isinstance(valor, float) else valor
+                 for chave, valor in self.stats.items()}
+        stats['buffer_seconds'] = round(self._amostras / TAXA_WHISPER, 2)
+        stats['real_time_factor'] = (round(self.stats['decode_time'] / self.stats['audio_seconds'], 3)
+                                     if self.stats['audio_seconds'] else 0.0)
+        return stats
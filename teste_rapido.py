@@ -1,10 +1,17 @@
 """
 Script de teste rápido para o sistema de transcrição
 Use este script para testar rapidamente se tudo está funcionando
+(python teste_rapido.py --inicio-cli: só a regressão de tempo de import da CLI;
+ --lote-concluido: só a regressão do lote em que todos os arquivos são pulados)
 """
 
 import os
 import sys
+import subprocess
+
+# Orçamento de início da CLI (--list-models, --help, validação): sem torch/librosa/whisper
+ORCAMENTO_INICIO_CLI = float(os.environ.get('TRANSCRITOR_ORCAMENTO_INICIO_CLI', '0.5'))  # segundos
+MODULOS_PESADOS = ('torch', 'librosa', 'whisper', 'numpy')
 
 def verificar_arquivo():
     """Verifica se o arquivo MP3 está presente"""
@@ -88,9 +95,83 @@ def teste_whisper_simples():
         print(f"✗ Erro no teste: {e}")
         return False
 
+def teste_inicio_rapido_cli(orcamento: float = ORCAMENTO_INICIO_CLI) -> bool:
+    """Regressão de tempo de import: a CLI com --list-models não pode carregar módulos pesados"""
+    print("=== TESTE DE INÍCIO RÁPIDO DA CLI ===")
+    
+    # Processo novo: mede import + parse + --list-models do zero, como o usuário vê
+    codigo = (
+        "import sys, time\n"
+        "inicio = time.perf_counter()\n"
+        "sys.argv = ['transcritor_avancado_cli.py', '--list-models']\n"
+        "import transcritor_avancado_cli as cli\n"
+        "cli.main()\n"
+        "pesados = [m for m in %r if m in sys.modules]\n"
+        "print('RESULTADO', time.perf_counter() - inicio, ','.join(pesados))\n"
+    ) % (MODULOS_PESADOS,)
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=diretorio,
+                           capture_output=True, text=True, timeout=120)
+    linhas = [l for l in saida.stdout.splitlines() if l.startswith('RESULTADO')]
+    if saida.returncode != 0 or not linhas:
+        print(f"✗ A CLI falhou: {saida.stderr.strip()[-500:]}")
+        return False
+    
+    _, tempo, pesados = (linhas[-1].split(' ', 2) + [''])[:3]
+    tempo = float(tempo)
+    ok = tempo <= orcamento and not pesados
+    print(f"{'✓' if tempo <= orcamento else '✗'} Início da CLI: {tempo * 1000:.0f} ms (orçamento: {orcamento * 1000:.0f} ms)")
+    if pesados:
+        print(f"✗ Módulos pesados importados no caminho rápido: {pesados}")
+    return ok
+
+def teste_lote_concluido() -> bool:
+    """Regressão: rodar de novo um lote já concluído no manifesto não cria pool nem pipeline"""
+    import tempfile
+    from pathlib import Path
+    
+    print("=== TESTE DE LOTE JÁ CONCLUÍDO ===")
+    from transcritor_avancado_cli import transcrever_lote, montar_opcoes_whisper, opcoes_chave_cache
+    from manifesto_lote import ManifestoLote, STATUS_CONCLUIDO
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        diretorio = Path(diretorio)
+        arquivo, saida, caminho_manifesto = diretorio / 'aula.wav', diretorio / 'aula.txt', diretorio / 'manifesto.db'
+        arquivo.write_bytes(b'RIFF' + bytes(64))
+        saida.write_text('transcrição anterior', encoding='utf-8')
+        
+        # Mesma configuração que transcrever_lote() usa com os padrões abaixo
+        opcoes_chave = opcoes_chave_cache(montar_opcoes_whisper('pt', 0.0, True))
+        manifesto = ManifestoLote(str(caminho_manifesto))
+        manifesto.registrar(str(arquivo), 'tiny', opcoes_chave, STATUS_CONCLUIDO, saida=str(saida))
+        manifesto.fechar()
+        
+        try:
+            resumo = transcrever_lote([str(arquivo)], modelo='tiny', diretorio_saida=str(diretorio),
+                                      usar_cache=False, caminho_manifesto=str(caminho_manifesto),
+                                      decodificadores=2, verboso=False)
+        except Exception as e:
+            print(f"✗ Lote já concluído falhou: {type(e).__name__}: {e}")
+            return False
+    
+    ok = resumo['pulados'] == 1 and resumo['falhas'] == 0
+    print(f"{'✓' if ok else '✗'} Lote já concluído: {resumo['pulados']} pulado(s), {resumo['falhas']} falha(s)")
+    return ok
+
 def main():
+    if '--inicio-cli' in sys.argv:
+        # Modo não interativo (CI): só a regressão de tempo de import
+        sys.exit(0 if teste_inicio_rapido_cli() else 1)
+    if '--lote-concluido' in sys.argv:
+        sys.exit(0 if teste_lote_concluido() else 1)
+    
     print("=== TESTE RÁPIDO DO SISTEMA DE TRANSCRIÇÃO ===\n")
     
+    teste_inicio_rapido_cli()
+    print()
+    teste_lote_concluido()
+    print()
+    
     # Verificar arquivo
     if not verificar_arquivo():
         print("\nColoque o arquivo MP3 na pasta raiz e tente novamente.")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+🧩 TRANSCRIÇÃO LONGA EM TRECHOS PARALELOS
+=========================================
+Um model.transcribe() num arquivo de horas percorre a janela de 30s do
+Whisper em série, num único núcleo. Aqui o array decodificado é cortado
+em trechos nos pontos de menor energia (silêncio), cada trecho vai para
+um worker do MotorInferencia e os segmentos voltam costurados:
+- `start`/`end` deslocados para o tempo absoluto do arquivo
+- Segmentos alucinados além do fim do trecho são descartados
+- Palavras repetidas na fronteira entre dois trechos são removidas
+
+Para streaming, transcrever_em_janelas() percorre o áudio em janelas de
+~28s, em ordem, usando o fim do texto anterior como prompt, e entrega cada
+janela assim que fica pronta (primeiro texto em segundos, não em minutos).
+transcrever_em_fluxo() faz o mesmo a partir de blocos decodificados aos
+poucos, sem o array do arquivo inteiro em memória.
+
+Uso:
+    motor = MotorInferencia(num_workers=4, modelos_precarregar=['base'])
+    motor.iniciar()
+    resultado = transcrever_em_paralelo(motor, audio, 16000, 'base', {'language': 'pt'}, 4)
+"""
+
+import re
+import math
+import time
+from collections import Counter
+from typing import Dict, Any, List, Tuple, Callable, Iterable, Iterator, Optional
+
+from decodificacao_audio import TAXA_WHISPER
+from cronometro_etapas import etapa
+
+DURACAO_MINIMA_TRECHO = 60.0   # segundos; trechos menores perdem contexto e não compensam
+JANELA_BUSCA_SILENCIO = 10.0   # segundos procurados em torno de cada corte ideal
+QUADRO_ENERGIA = 0.03          # segundos por quadro na medição de energia
+MAX_PALAVRAS_REPETIDAS = 8
+JANELA_STREAM = 28.0           # segundos; com a busca de silêncio ainda cabe na janela de 30s
+TAMANHO_PROMPT = 200           # caracteres do texto anterior passados como initial_prompt
+
+def _energia_quadros(audio, tamanho_quadro: int):
+    """RMS de cada quadro de `tamanho_quadro` amostras"""
+    import numpy as np
+
+    n_quadros = len(audio) // tamanho_quadro
+    quadros = np.asarray(audio[:n_quadros * tamanho_quadro], dtype=np.float32).reshape(n_quadros, tamanho_quadro)
+    return np.sqrt(np.mean(quadros * quadros, axis=1))
+
+def encontrar_cortes(audio, sr: int, n_trechos: int,
+                     janela_busca: float = JANELA_BUSCA_SILENCIO) -> List[Tuple[int, int]]:
+    """Divide o áudio em até `n_trechos` intervalos (amostras), cortando no silêncio mais próximo"""
+    total = len(audio)
+    if n_trechos <= 1 or total == 0:
+        return [(0, total)]
+
+    tamanho_quadro = max(1, int(sr * QUADRO_ENERGIA))
+    energia = _energia_quadros(audio, tamanho_quadro)
+    raio = max(1, int(janela_busca / QUADRO_ENERGIA))
+
+    cortes = [0]
+    for k in range(1, n_trechos):
+        ideal = (k * total // n_trechos) // tamanho_quadro
+        inicio = max(ideal - raio, cortes[-1] // tamanho_quadro + 1)
+        fim = min(ideal + raio, len(energia))
+        if inicio >= fim:
+            continue
+        quadro = inicio + int(energia[inicio:fim].argmin())
+        cortes.append(quadro * tamanho_quadro + tamanho_quadro // 2)
+    cortes.append(total)
+
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+def numero_de_trechos(duracao: float, workers: int) -> int:
+    """Dois trechos por worker (equilibra a carga), respeitando o tamanho mínimo"""
+    return max(1, min(workers * 2, int(duracao // DURACAO_MINIMA_TRECHO)))
+
+def transcrever_trecho(obter_modelo: Callable, audio, modelo: str, opcoes: Dict[str, Any],
+                       deslocamento: float) -> Dict[str, Any]:
+    """Transcreve um trecho e devolve os segmentos já em tempo absoluto"""
+    duracao = len(audio) / TAXA_WHISPER
+    modelo_whisper = obter_modelo(modelo)
+    inicio = time.time()
+    with etapa('inference'):
+        resultado = modelo_whisper.transcribe(audio, **opcoes)
+    tempo_inferencia = time.time() - inicio
+
+    segmentos = []
+    for seg in resultado.get('segments', []):
+        if seg['start'] >= duracao:
+            continue  # alucinação depois do fim do trecho
+        segmentos.append({
+            'start': deslocamento + seg['start'],
+            'end': deslocamento + min(seg['end'], duracao),
+            'text': seg['text']
+        })
+
+    return {
+        'segments': segmentos,
+        'language': resultado.get('language'),
+        'offset': deslocamento,
+        'duration': duracao,
+        'inference_time': tempo_inferencia
+    }
+
+def _normalizar_palavra(palavra: str) -> str:
+    return re.sub(r'[^\w]', '', palavra.lower())
+
+def _remover_repeticao(texto_anterior: str, texto_atual: str,
+                       max_palavras: int = MAX_PALAVRAS_REPETIDAS) -> str:
+    """Remove do início de `texto_atual` as palavras que repetem o fim de `texto_anterior`"""
+    anteriores = [_normalizar_palavra(p) for p in texto_anterior.split()]
+    atuais = texto_atual.split()
+    normalizadas = [_normalizar_palavra(p) for p in atuais]
+
+    for k in range(min(max_palavras, len(anteriores), len(atuais)), 0, -1):
+        if anteriores[-k:] == normalizadas[:k] and any(anteriores[-k:]):
+            return ' ' + ' '.join(atuais[k:]) if atuais[k:] else ''
+    return texto_atual
+
+def costurar_segmentos(resultados: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Junta os resultados dos trechos (em qualquer ordem) num único resultado"""
+    segmentos: List[Dict[str, Any]] = []
+    for resultado in sorted(resultados, key=lambda r: r['offset']):
+        novos = list(resultado['segments'])
+        if segmentos and novos:
+            texto = _remover_repeticao(segmentos[-1]['text'], novos[0]['text'])
+            if texto.strip():
+                novos[0] = {**novos[0], 'text': texto}
+            else:
+                novos.pop(0)
+        segmentos.extend(novos)
+
+    idiomas = Counter(r['language'] for r in resultados if r.get('language'))
+    return {
+        'text': ''.join(seg['text'] for seg in segmentos),
+        'segments': segmentos,
+        'language': idiomas.most_common(1)[0][0] if idiomas else None,
+        'inference_time': sum(r['inference_time'] for r in resultados),
+        'chunks': len(resultados)
+    }
+
+def transcrever_em_paralelo(motor, audio, sr: int, modelo: str, opcoes: Dict[str, Any],
+                            workers: int) -> Dict[str, Any]:
+    """Corta o áudio no silêncio, transcreve os trechos no motor e costura o resultado"""
+    import numpy as np
+
+    duracao = len(audio) / sr
+    trechos = encontrar_cortes(audio, sr, numero_de_trechos(duracao, workers))
+
+    # np.asarray: um memmap do cache de PCM segue para o worker como array comum
+    futuros = [
+        motor.submeter(transcrever_trecho, np.asarray(audio[a:b]), modelo, opcoes, a / sr)
+        for a, b in trechos
+    ]
+    resultado = costurar_segmentos([futuro.result() for futuro in futuros])
+    resultado['duration'] = duracao
+    return resultado
+
+def transcrever_trecho_com_vad(obter_modelo: Callable, audio, modelo: str, opcoes: Dict[str, Any],
+                               deslocamento: float) -> Dict[str, Any]:
+    """transcrever_trecho() só nas regiões de fala do trecho (VAD por janela no modo streaming)"""
+    from deteccao_voz import aplicar_vad, remapear_resultado
+
+    audio_fala, mapa, info = aplicar_vad(audio, TAXA_WHISPER)
+    resultado = transcrever_trecho(obter_modelo, audio_fala, modelo, opcoes, 0.0)
+    remapear_resultado(resultado, mapa)
+    for seg in resultado['segments']:
+        seg['start'] += deslocamento
+        seg['end'] += deslocamento
+    resultado.update(offset=deslocamento, duration=len(audio) / TAXA_WHISPER, vad=info)
+    return resultado
+
+def _transcrever_sequencial(executar: Callable, janelas: Iterator[Tuple[Any, float]], modelo: str,
+                            opcoes: Dict[str, Any], retomar: Optional[Dict[str, Any]] = None,
+                            tarefa: Callable = transcrever_trecho) -> Iterator[Dict[str, Any]]:
+    """Transcreve (audio, deslocamento) em ordem, com o fim do texto anterior como prompt"""
+    opcoes = dict(opcoes)
+    contexto = ''
+    ultimo_texto = ''
+    if retomar:
+        segmentos_feitos = retomar.get('segments') or []
+        contexto = ''.join(seg['text'] for seg in segmentos_feitos)[-TAMANHO_PROMPT:]
+        ultimo_texto = segmentos_feitos[-1]['text'] if segmentos_feitos else ''
+        if opcoes.get('language') is None and retomar.get('language'):
+            opcoes['language'] = retomar['language']
+
+    for audio, deslocamento in janelas:
+        opcoes_janela = dict(opcoes)
+        if contexto:
+            opcoes_janela['initial_prompt'] = contexto[-TAMANHO_PROMPT:]
+        resultado = executar(tarefa, audio, modelo, opcoes_janela, deslocamento)
+
+        segmentos = list(resultado['segments'])
+        if ultimo_texto and segmentos:
+            texto = _remover_repeticao(ultimo_texto, segmentos[0]['text'])
+            if texto.strip():
+                segmentos[0] = {**segmentos[0], 'text': texto}
+            else:
+                segmentos.pop(0)
+        resultado['segments'] = segmentos
+
+        # Idioma detectado na primeira janela vale para as seguintes (e pula a detecção)
+        if opcoes.get('language') is None and resultado.get('language'):
+            opcoes['language'] = resultado['language']
+        if segmentos:
+            contexto = (contexto + ''.join(seg['text'] for seg in segmentos))[-TAMANHO_PROMPT:]
+            ultimo_texto = segmentos[-1]['text']
+        yield resultado
+
+def transcrever_em_janelas(executar: Callable, audio, sr: int, modelo: str, opcoes: Dict[str, Any],
+                           janela: float = JANELA_STREAM,
+                           retomar: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Transcreve janela a janela, em ordem, gerando o resultado de cada uma assim que fica pronto.
+    `executar(funcao, *args)` roda a tarefa: inline ou via motor.submeter(...).result().
+    `retomar` ({'offset', 'segments', 'language'} de um checkpoint) pula as janelas já feitas.
+    """
+    import numpy as np
+
+    n_janelas = max(1, math.ceil(len(audio) / sr / janela))
+    trechos = encontrar_cortes(audio, sr, n_janelas, janela_busca=2.0)
+    # Os cortes são determinísticos: as mesmas janelas da execução anterior
+    feito_ate = retomar['offset'] if retomar else 0.0
+
+    janelas = ((np.asarray(audio[a:b]), a / sr) for a, b in trechos if b / sr > feito_ate + 1e-3)
+    return _transcrever_sequencial(executar, janelas, modelo, opcoes, retomar)
+
+def _janelas_do_fluxo(blocos: Iterable, sr: int, janela: float, busca: float) -> Iterator[Tuple[Any, float]]:
+    """Reagrupa blocos de tamanho qualquer em janelas de ~`janela`s cortadas no silêncio"""
+    import numpy as np
+
+    tamanho_quadro = max(1, int(sr * QUADRO_ENERGIA))
+    minimo, maximo = int((janela - busca) * sr), int((janela + busca) * sr)
+    buffer = np.zeros(0, dtype=np.float32)
+    deslocamento = 0
+    for bloco in blocos:
+        buffer = np.concatenate((buffer, bloco)) if len(buffer) else np.asarray(bloco, dtype=np.float32)
+        while len(buffer) >= maximo:
+            energia = _energia_quadros(buffer[minimo:maximo], tamanho_quadro)
+            corte = minimo + int(energia.argmin()) * tamanho_quadro + tamanho_quadro // 2
+            yield buffer[:corte], deslocamento / sr
+            buffer = buffer[corte:].copy()  # libera o bloco antigo
+            deslocamento += corte
+    if len(buffer):
+        yield buffer, deslocamento / sr
+
+def transcrever_em_fluxo(executar: Callable, blocos: Iterable, sr: int, modelo: str, opcoes: Dict[str, Any],
+                         janela: float = JANELA_STREAM, vad: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Como transcrever_em_janelas(), mas consumindo os blocos de decodificar_em_blocos():
+    só ~uma janela + um bloco de áudio ficam em memória. Com `vad`, o VAD roda em cada janela.
+    """
+    tarefa = transcrever_trecho_com_vad if vad else transcrever_trecho
+    return _transcrever_sequencial(executar, _janelas_do_fluxo(blocos, sr, janela, 2.0), modelo, opcoes,
+                                   tarefa=tarefa)
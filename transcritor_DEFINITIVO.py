@@ -80,8 +80,9 @@ def transcrever_audio_definitivo(arquivo_mp3, modelo="base", salvar_wav=False):
         print("\n🔊 Processando áudio com Librosa...")
         print("  📥 Carregando arquivo MP3...")
         
-        # Carregar o áudio completo
-        audio_data, sample_rate = librosa.load(arquivo_mp3, sr=16000)
+        # Carregar o áudio completo (reamostrador: $TRANSCRITOR_RESAMPLER, padrão soxr_hq)
+        from decodificacao_audio import carregar_audio
+        audio_data, sample_rate = carregar_audio(arquivo_mp3, sr=16000)
         
         duracao_segundos = len(audio_data) / sample_rate
         print(f"  ✅ Áudio carregado: {duracao_segundos:.1f} segundos")
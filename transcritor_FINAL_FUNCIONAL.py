@@ -55,22 +55,18 @@ def transcrever_audio_sem_ffmpeg(arquivo_mp3, modelo="base"):
         # Processar áudio com Librosa
         print(f"\n🔊 Carregando áudio com Librosa...")
         
-        # Carregar áudio no formato que o Whisper espera
-        audio_data, sr = librosa.load(arquivo_mp3, sr=16000)
+        # Carregar áudio no formato que o Whisper espera (float32, [-1, 1]);
+        # se o arquivo já foi decodificado antes, o PCM vem do cache em disco
+        from decodificacao_audio import decodificar_audio
+        audio_data, sr, origem_audio = decodificar_audio(arquivo_mp3)
         duracao = len(audio_data) / sr
         
+        if origem_audio == 'pcm_cache':
+            print(f"💾 PCM decodificado lido do cache (sem decodificar o MP3)")
         print(f"✅ Áudio processado:")
         print(f"  📊 Duração: {duracao:.1f} segundos ({duracao/60:.1f} minutos)")
         print(f"  📊 Taxa: {sr} Hz")
         print(f"  📊 Amostras: {len(audio_data):,}")
-        
-        # Normalizar áudio se necessário
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
-        
-        # Garantir que está no range correto
-        audio_data = np.clip(audio_data, -1.0, 1.0)
-        
         print(f"✅ Áudio normalizado para Whisper")
         
         # Transcrever diretamente com os dados de áudio
@@ -15,48 +15,297 @@ Versão: 3.0
 
 import os
 import sys
+import hmac
 import json
-import base64
-import tempfile
+import hashlib
+import importlib.util
+import argparse
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable, Union, Iterator
 
 # Flask e componentes web
 try:
-    from flask import Flask, request, jsonify, render_template_string, send_file
+    from flask import (Flask, Request, Response, request, jsonify, render_template_string,
+                       send_file, stream_with_context)
     from werkzeug.utils import secure_filename
 except ImportError:
     print("❌ Flask não instalado. Execute: pip install flask")
     sys.exit(1)
 
+# WebSocket para legendas ao vivo (opcional)
+try:
+    from flask_sock import Sock
+    from simple_websocket import ConnectionClosed
+    WEBSOCKET_OK = True
+except ImportError:
+    WEBSOCKET_OK = False
+
 # Sistema avançado - verifica se está instalado
 try:
-    import librosa
-    import whisper
-    import numpy as np
+    # Só confere se estão instalados: quem importa torch/whisper/librosa são os
+    # workers do motor (ou o registro de modelos, na primeira transcrição inline)
+    for _modulo in ('whisper', 'librosa', 'numpy'):
+        if importlib.util.find_spec(_modulo) is None:
+            raise ImportError(f"No module named '{_modulo}'")
+    from motor_inferencia import MotorInferencia, ErroWorker, transcrever_arquivo, transcrever_arquivo_em_fluxo
+    from registro_modelos import RegistroModelos
+    from ingestao_upload import (ArquivoSpool, gravar_stream_em_spool,
+                                 ler_json_com_base64, ErroJSON, ErroBase64)
+    from cache_transcricao import CacheTranscricao, gerar_chave, hash_arquivo, DIRETORIO_CACHE_PADRAO
+    from cache_pcm import cache_pcm_padrao, configurar_cache_pcm
+    from decodificacao_audio import (decodificar_audio, decodificar_em_blocos, TAXA_WHISPER,
+                                     configurar_reamostrador, opcoes_reamostragem, reamostrador_atual)
+    from transcricao_longa import transcrever_em_paralelo, transcrever_em_janelas, transcrever_em_fluxo
+    from deteccao_voz import aplicar_vad, remapear_resultado
+    from tempo_real import TranscricaoTempoReal
+    from cronometro_etapas import CronometroEtapas
+    from perfilador import Perfilador, perfilar_tarefa
+    from metricas import (RegistroMetricas, TIPO_CONTEUDO as METRICS_CONTENT_TYPE,
+                          LIMITES_FATOR_TEMPO_REAL)
     DEPENDENCIES_OK = True
 except ImportError as e:
     print(f"❌ Dependências faltando: {e}")
     print("🔧 Execute: pip install librosa openai-whisper numpy flask")
     DEPENDENCIES_OK = False
 
+def parse_flag(value: Any, default: bool = False) -> bool:
+    """Booleano de JSON, form ou query string: aceita true/false e as strings 'true'/'false' (e 1/0)"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    return str(value).strip().lower() in ('true', '1', 'yes', 'on')
+
+class JobManager:
+    """Executa transcrições em background e guarda o estado de cada job"""
+    
+    def __init__(self, max_workers: int = 2, ttl_seconds: int = 3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='transcricao-job')
+        self.ttl_seconds = ttl_seconds
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        
+    def submit(self, func: Callable, *args, **kwargs) -> str:
+        """Enfileira func(*args, progress_callback=..., **kwargs) e retorna o ID do job"""
+        self.prune()
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'stage': 'queued',
+                'progress': 0.0,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'http_status': None,
+                'result': None,
+                '_finished_ts': None
+            }
+        self.executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+        
+    def _run(self, job_id: str, func: Callable, args: tuple, kwargs: dict):
+        self.update(job_id, status='running', started_at=datetime.now().isoformat())
+        
+        def progress(stage: str, value: float):
+            self.update(job_id, stage=stage, progress=round(value, 2))
+        
+        try:
+            body, http_status = func(*args, progress_callback=progress, **kwargs)
+        except Exception as e:
+            body, http_status = {'success': False, 'error': f'Erro interno: {str(e)}'}, 500
+            
+        self.update(
+            job_id,
+            status='completed' if http_status < 400 else 'failed',
+            stage='done',
+            progress=1.0,
+            http_status=http_status,
+            result=body,
+            finished_at=datetime.now().isoformat(),
+            _finished_ts=time.time()
+        )
+        
+    def update(self, job_id: str, **fields):
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields)
+                
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna uma cópia pública do estado do job (ou None)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if not k.startswith('_')}
+            
+    def prune(self):
+        """Descarta jobs finalizados há mais de ttl_seconds"""
+        limite = time.time() - self.ttl_seconds
+        with self.lock:
+            expirados = [job_id for job_id, job in self.jobs.items()
+                         if job['_finished_ts'] is not None and job['_finished_ts'] < limite]
+            for job_id in expirados:
+                del self.jobs[job_id]
+                
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            contagem = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+            for job in self.jobs.values():
+                contagem[job['status']] = contagem.get(job['status'], 0) + 1
+            return contagem
+
+class SpoolRequest(Request):
+    """Request que grava uploads multipart direto no spool (com SHA-256) em vez de memória"""
+    
+    @property
+    def spool_files(self) -> list:
+        return self.__dict__.setdefault('_spool_files', [])
+    
+    @property
+    def upload_seconds(self) -> float:
+        """Tempo gasto recebendo o corpo (multipart ou JSON base64) nesta requisição"""
+        return self.__dict__.get('_upload_seconds', 0.0)
+    
+    def add_upload_time(self, seconds: float):
+        self.__dict__['_upload_seconds'] = self.upload_seconds + seconds
+    
+    def _load_form_data(self):
+        inicio = time.perf_counter()
+        try:
+            super()._load_form_data()
+        finally:
+            self.add_upload_time(time.perf_counter() - inicio)
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool = ArquivoSpool(
+            sufixo=Path(filename or '').suffix.lower(),
+            tamanho_previsto=content_length or total_content_length
+        )
+        self.spool_files.append(spool)
+        return spool
+
 class TranscritorAPIFlask:
     """API Flask avançada para transcrição com Whisper"""
     
-    def __init__(self):
+    def __init__(self, job_workers: int = 2, inference_workers: int = 0, torch_threads: int = 1,
+                 model_budget_mb: Optional[float] = None, result_cache: Optional[CacheTranscricao] = None,
+                 live_window: float = 10.0, live_stride: float = 1.0, stream_decode_min_mb: float = 0.0,
+                 admin_token: Optional[str] = None, profile_dir: str = 'perfis'):
         if not DEPENDENCIES_OK:
             raise ImportError("Dependências não instaladas")
             
         self.app = Flask(__name__)
+        self.app.request_class = SpoolRequest
         self.app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max
         self.supported_formats = {'.mp3', '.mp4', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma', '.webm'}
-        self.whisper_models = {}
+        self.setup_metrics()
+        self.whisper_models = RegistroModelos(orcamento_mb=model_budget_mb, ao_carregar=self.observe_model_load)
+        self.jobs = JobManager(max_workers=max(job_workers, inference_workers))
+        self.result_cache = result_cache
+        self.ready = False
+        self.preload_stats: Dict[str, Any] = {}
+        self.live_window = live_window
+        self.live_stride = live_stride
+        self.live_connections = 0
+        self.live_lock = threading.Lock()  # cada WebSocket roda na sua própria thread
+        self.stream_decode_min_mb = stream_decode_min_mb  # 0 = sempre decodifica o arquivo inteiro
+        self.admin_token = admin_token  # sem token, profile=true fica desativado
+        self.profile_dir = profile_dir
+        
+        # Pool de processos opcional: inferência fora do processo web (sem GIL)
+        self.engine = None
+        if inference_workers > 0:
+            self.engine = MotorInferencia(
+                num_workers=inference_workers,
+                threads_por_worker=torch_threads,
+                orcamento_mb=model_budget_mb
+            )
+            self.engine.ao_carregar_modelo = self.observe_model_load
+        
         self.setup_routes()
         
+    def setup_metrics(self):
+        """Métricas Prometheus deste processo (GET /metrics)"""
+        self.metrics = RegistroMetricas()
+        self.metric_requests = self.metrics.contador(
+            'transcritor_http_requests_total', 'HTTP requests by endpoint, method and status',
+            ('endpoint', 'method', 'status'))
+        self.metric_in_flight = self.metrics.medidor(
+            'transcritor_http_requests_in_flight', 'HTTP requests (and live WebSockets) being served',
+            ('endpoint',))
+        self.metric_bytes = self.metrics.contador(
+            'transcritor_http_request_bytes_total', 'Request body bytes received', ('endpoint',))
+        self.metric_stage = self.metrics.histograma(
+            'transcritor_stage_duration_seconds',
+            'Time per pipeline stage (upload, decode, model_load, inference, serialization)', ('stage',))
+        self.metric_rtf = self.metrics.histograma(
+            'transcritor_real_time_factor', 'Inference time divided by audio duration', ('model',),
+            LIMITES_FATOR_TEMPO_REAL)
+        
+    def observe_model_load(self, model: str, seconds: float):
+        self.metric_stage.observar(seconds, stage='model_load')
+        
+    def observe_transcription(self, model: str, result: Dict[str, Any]):
+        """Etapas de uma transcrição efetivamente executada (não conta acertos de cache)"""
+        if result.get('decode_time') is not None:
+            self.metric_stage.observar(result['decode_time'], stage='decode')
+        inference_time = result.get('inference_time')
+        if inference_time is not None:
+            self.metric_stage.observar(inference_time, stage='inference')
+            if result.get('duration'):
+                self.metric_rtf.observar(inference_time / result['duration'], model=model)
+        
+    def json_response(self, body: Dict[str, Any], status: int = 200):
+        """jsonify cronometrado: respostas com segmentos de horas de áudio não são triviais"""
+        with self.metric_stage.cronometrar(stage='serialization'):
+            return jsonify(body), status
+        
     def setup_routes(self):
         """Configura todas as rotas da API"""
         
+        @self.app.before_request
+        def metrics_start():
+            request.metrics_endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            self.metric_in_flight.inc(endpoint=request.metrics_endpoint)
+        
+        @self.app.after_request
+        def metrics_status(response):
+            request.metrics_status = response.status_code
+            return response
+        
+        @self.app.teardown_request
+        def cleanup_spool(exc):
+            """Remove arquivos de upload que nenhum job assíncrono assumiu"""
+            for spool in request.spool_files:
+                if not spool.retido:
+                    spool.remover()
+        
+        @self.app.teardown_request
+        def metrics_finish(exc):
+            """Conta a requisição (após o fim do stream, no caso de SSE)"""
+            endpoint = getattr(request, 'metrics_endpoint', None)
+            if endpoint is None:
+                return
+            self.metric_in_flight.dec(endpoint=endpoint)
+            status = 500 if exc is not None else getattr(request, 'metrics_status', 500)
+            self.metric_requests.inc(endpoint=endpoint, method=request.method, status=status)
+            received = request.content_length or sum(spool.tamanho_bytes for spool in request.spool_files)
+            if received:
+                self.metric_bytes.inc(received, endpoint=endpoint)
+            if request.upload_seconds:
+                self.metric_stage.observar(request.upload_seconds, stage='upload')
+        
         @self.app.route('/')
         def index():
             """Página principal com interface web"""
@@ -72,14 +321,49 @@ class TranscritorAPIFlask:
             """Endpoint avançado com mais opções"""
             return self.handle_advanced_transcription()
             
+        @self.app.route('/api/v1/transcribe/stream', methods=['POST'])
+        def api_transcribe_stream():
+            """Mesmo upload do /api/v1/transcribe, com os segmentos enviados via SSE"""
+            return self.handle_stream_transcription()
+            
+        if WEBSOCKET_OK:
+            sock = Sock(self.app)
+            
+            @sock.route('/api/v1/transcribe/live')
+            def api_transcribe_live(ws):
+                """Legendas ao vivo: quadros PCM 16 kHz int16 mono → eventos partial/final"""
+                self.handle_live_transcription(ws)
+            
+        @self.app.route('/api/v1/jobs/<job_id>')
+        def job_status(job_id):
+            """Status, progresso e resultado de um job assíncrono"""
+            job = self.jobs.get(job_id)
+            if job is None:
+                return jsonify({'success': False, 'error': f'Job {job_id} não encontrado'}), 404
+            return jsonify(job)
+            
+        @self.app.route('/metrics')
+        def metrics():
+            """Métricas no formato de texto do Prometheus"""
+            return Response(self.metrics.renderizar(), mimetype=METRICS_CONTENT_TYPE)
+            
         @self.app.route('/health')
         def health():
             """Endpoint de saúde para monitoramento"""
             return jsonify({
-                'status': 'healthy',
+                'status': 'healthy' if self.ready else 'starting',
+                'ready': self.ready,
+                'preload': self.preload_stats,
                 'version': '3.0',
                 'system': 'Transcritor Avançado Flask',
-                'whisper_models_loaded': list(self.whisper_models.keys()),
+                'whisper_models_loaded': self.whisper_models.carregados(),
+                'model_registry': self.whisper_models.estatisticas(),
+                'jobs': self.jobs.stats(),
+                'live_connections': self.live_connections if WEBSOCKET_OK else None,
+                'result_cache': self.result_cache.estatisticas() if self.result_cache else None,
+                'pcm_cache': self.pcm_cache_stats(),
+                'resampler': reamostrador_atual(),
+                'inference_engine': self.engine.estatisticas() if self.engine else None,
                 'supported_formats': list(self.supported_formats),
                 'timestamp': datetime.now().isoformat()
             })
@@ -89,7 +373,9 @@ class TranscritorAPIFlask:
             """Lista modelos Whisper disponíveis"""
             return jsonify({
                 'available_models': ['tiny', 'base', 'small', 'medium', 'large'],
-                'loaded_models': list(self.whisper_models.keys()),
+                'loaded_models': self.whisper_models.carregados(),
+                'model_registry': self.whisper_models.estatisticas(),
+                'worker_registries': self.engine.estatisticas()['registros_modelos'] if self.engine else None,
                 'recommendations': {
                     'speed': 'tiny',
                     'balance': 'base', 
@@ -114,36 +400,47 @@ class TranscritorAPIFlask:
                 audio_file = request.files['audio']
                 if audio_file.filename == '':
                     return jsonify({'error': 'Nenhum arquivo selecionado'}), 400
-                audio_data = audio_file.read()
                 filename = secure_filename(audio_file.filename)
-            elif request.is_json and 'data' in request.json:
-                # Formato base64 como TranscreveAPI original
+                spool = self.spool_upload(audio_file)
+            elif request.is_json:
+                # Formato base64 como TranscreveAPI original, decodificado em stream
                 try:
-                    audio_data = base64.b64decode(request.json['data'])
                     filename = 'audio_upload.wav'
-                except Exception as e:
+                    data = self.read_json_upload({('data',)}, filename)
+                except ErroBase64 as e:
                     return jsonify({'error': f'Erro ao decodificar base64: {str(e)}'}), 400
+                except ErroJSON as e:
+                    return jsonify({'error': f'JSON inválido: {str(e)}', 'success': False}), 400
+                    
+                spool = data.get('data') if isinstance(data, dict) else None
+                if not isinstance(spool, ArquivoSpool):
+                    return jsonify({'error': 'Envie um arquivo via form-data ou dados base64 via JSON'}), 400
             else:
                 return jsonify({'error': 'Envie um arquivo via form-data ou dados base64 via JSON'}), 400
                 
             # Processa com configurações padrão (compatibilidade)
             result = self.process_audio(
-                audio_data=audio_data,
+                audio_source=spool.fonte(),
                 filename=filename,
                 model='base',
-                language='pt'
+                language='pt',
+                audio_sha256=spool.sha256,
+                upload_time=request.upload_seconds
             )
             
             if result['success']:
                 # Formato de resposta compatível com TranscreveAPI
-                return jsonify({
+                return self.json_response({
                     'transcription': result['transcription'],
                     'success': True,
                     'metadata': {
                         'duration': result['duration'],
                         'model': result['model'],
                         'language': result.get('language_detected', 'pt'),
-                        'processing_time': result['processing_time']
+                        'processing_time': result['processing_time'],
+                        'decode_path': result['decode_path'],
+                        'cache_hit': result['cache_hit'],
+                        'timings': result['timings']
                     }
                 })
             else:
@@ -152,92 +449,436 @@ class TranscritorAPIFlask:
         except Exception as e:
             return jsonify({'error': f'Erro interno: {str(e)}', 'success': False}), 500
 
+    def parse_advanced_request(self) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[Any, int]]]:
+        """Lê upload e parâmetros do /api/v1/transcribe; retorna (params, None) ou (None, resposta de erro)"""
+        if request.is_json:
+            # Base64 + metadados, decodificado em stream direto para o spool
+            try:
+                data = self.read_json_upload({('audio_file', 'content')})
+            except ErroBase64 as e:
+                return None, (jsonify({'error': f'Erro ao decodificar base64: {str(e)}'}), 400)
+            except ErroJSON as e:
+                return None, (jsonify({'success': False, 'error': f'JSON inválido: {str(e)}'}), 400)
+                
+            audio_json = data.get('audio_file') if isinstance(data, dict) else None
+            if not isinstance(audio_json, dict) or 'content' not in audio_json:
+                return None, (jsonify({'error': 'Formato JSON inválido. Use audio_file.content para base64'}), 400)
+            spool = audio_json['content']
+            if not isinstance(spool, ArquivoSpool):
+                return None, (jsonify({'error': 'Erro ao decodificar base64: audio_file.content deve ser uma string'}), 400)
+                
+            # Parâmetros opcionais
+            params = {
+                'spool': spool,
+                'filename': audio_json.get('filename', 'upload.wav'),
+                'model': data.get('model', 'base'),
+                'language': data.get('language', 'auto'),
+                'include_timestamps': parse_flag(data.get('timestamps'), default=True),
+                'label': data.get('label', 'api_upload'),
+                'async_mode': parse_flag(data.get('async')),
+                'parallel_chunks': data.get('parallel_chunks', 0),
+                'vad': parse_flag(data.get('vad')),
+                'profile': parse_flag(data.get('profile'))
+            }
+            
+        else:
+            # Form upload
+            if 'audio' not in request.files:
+                return None, (jsonify({'error': 'Campo audio necessário no form-data'}), 400)
+                
+            audio_file = request.files['audio']
+            if audio_file.filename == '':
+                return None, (jsonify({'error': 'Nenhum arquivo selecionado'}), 400)
+                
+            params = {
+                'spool': self.spool_upload(audio_file),
+                'filename': secure_filename(audio_file.filename),
+                'model': request.form.get('model', 'base'),
+                'language': request.form.get('language', 'auto'),
+                'include_timestamps': parse_flag(request.form.get('timestamps'), default=True),
+                'label': request.form.get('label', 'api_upload'),
+                'async_mode': parse_flag(request.form.get('async')),
+                'parallel_chunks': request.form.get('parallel_chunks', 0),
+                'vad': parse_flag(request.form.get('vad')),
+                'profile': parse_flag(request.form.get('profile'))
+            }
+        
+        params['async_mode'] = params['async_mode'] or parse_flag(request.args.get('async'))
+        params['profile'] = params['profile'] or parse_flag(request.args.get('profile'))
+        if params['profile'] and not self.is_admin():
+            return None, (jsonify({'success': False, 'error': 'profile=true requer o cabeçalho X-Admin-Token'}), 403)
+        
+        # Valida modelo
+        if params['model'] not in ['tiny', 'base', 'small', 'medium', 'large']:
+            return None, (jsonify({'error': f"Modelo {params['model']} inválido. Use: tiny, base, small, medium, large"}), 400)
+        
+        try:
+            params['parallel_chunks'] = int(params['parallel_chunks'])
+        except (TypeError, ValueError):
+            return None, (jsonify({'error': 'parallel_chunks deve ser um inteiro'}), 400)
+        
+        return params, None
+
     def handle_advanced_transcription(self) -> Dict[str, Any]:
         """Handler avançado com todas nossas funcionalidades"""
         try:
-            # Parse dos parâmetros avançados
-            if request.is_json:
-                data = request.json
-                if 'audio_file' in data and 'content' in data['audio_file']:
-                    # Base64 + metadados
-                    try:
-                        audio_data = base64.b64decode(data['audio_file']['content'])
-                        filename = data['audio_file'].get('filename', 'upload.wav')
-                    except Exception as e:
-                        return jsonify({'error': f'Erro ao decodificar base64: {str(e)}'}), 400
-                else:
-                    return jsonify({'error': 'Formato JSON inválido. Use audio_file.content para base64'}), 400
-                    
-                # Parâmetros opcionais
-                model = data.get('model', 'base')
-                language = data.get('language', 'auto')
-                include_timestamps = data.get('timestamps', True)
-                label = data.get('label', 'api_upload')
-                
-            else:
-                # Form upload
-                if 'audio' not in request.files:
-                    return jsonify({'error': 'Campo audio necessário no form-data'}), 400
-                    
-                audio_file = request.files['audio']
-                if audio_file.filename == '':
-                    return jsonify({'error': 'Nenhum arquivo selecionado'}), 400
-                    
-                audio_data = audio_file.read()
-                filename = secure_filename(audio_file.filename)
+            params, error = self.parse_advanced_request()
+            if error:
+                return error
+            spool = params['spool']
+            args = (spool, params['filename'], params['model'], params['language'],
+                    params['include_timestamps'], params['label'], params['parallel_chunks'], params['vad'],
+                    params['profile'])
+            
+            if params['async_mode']:
+                # Responde imediatamente; o resultado fica em /api/v1/jobs/<id>
+                spool.retido = True  # o job remove o arquivo ao terminar
+                job_id = self.jobs.submit(self.run_advanced_transcription, *args,
+                                          upload_time=request.upload_seconds)
+                return jsonify({
+                    'success': True,
+                    'job_id': job_id,
+                    'status': 'queued',
+                    'status_url': f'/api/v1/jobs/{job_id}'
+                }), 202
+            
+            body, http_status = self.run_advanced_transcription(*args, upload_time=request.upload_seconds)
+            return self.json_response(body, http_status)
                 
-                model = request.form.get('model', 'base')
-                language = request.form.get('language', 'auto')
-                include_timestamps = request.form.get('timestamps', 'true').lower() == 'true'
-                label = request.form.get('label', 'api_upload')
+        except Exception as e:
+            return jsonify({'success': False, 'error': f'Erro interno: {str(e)}'}), 500
+
+    def handle_stream_transcription(self):
+        """Responde em Server-Sent Events: start, um segment por trecho decodificado e done"""
+        try:
+            params, error = self.parse_advanced_request()
+            if error:
+                return error
+        except Exception as e:
+            return jsonify({'success': False, 'error': f'Erro interno: {str(e)}'}), 500
+        
+        file_ext = Path(params['filename']).suffix.lower()
+        if file_ext not in self.supported_formats:
+            return jsonify({
+                'success': False,
+                'error': f'Formato {file_ext} não suportado. Formatos aceitos: {", ".join(self.supported_formats)}'
+            }), 400
+        
+        # stream_with_context: o spool só é removido (teardown) quando o stream termina
+        return Response(
+            stream_with_context(self.stream_transcription(params)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @staticmethod
+    def sse_event(event: str, data: Dict[str, Any]) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    def stream_transcription(self, params: Dict[str, Any]) -> Iterator[str]:
+        """Gera os eventos SSE; cada janela de ~28s vira segmentos assim que o Whisper termina"""
+        start_time = time.time()
+        spool, filename, model = params['spool'], params['filename'], params['model']
+        language, vad = params['language'], params['vad']
+        # Ativado só em trechos sem yield: o gerador fica suspenso entre os eventos
+        timings = CronometroEtapas()
+        timings.adicionar('spool', request.upload_seconds)
+        yield self.sse_event('start', {'filename': filename, 'model': model})
+        
+        try:
+            transcribe_options = {
+                'language': None if language == 'auto' else language,
+                'word_timestamps': params['include_timestamps'],
+                'verbose': False
+            }
             
-            # Valida modelo
-            if model not in ['tiny', 'base', 'small', 'medium', 'large']:
-                return jsonify({'error': f'Modelo {model} inválido. Use: tiny, base, small, medium, large'}), 400
+            # Arquivo grande: blocos decodificados aos poucos em vez do array inteiro
+            stream_decode = (self.stream_decode_min_mb > 0
+                             and spool.tamanho_bytes / (1024 * 1024) >= self.stream_decode_min_mb)
             
-            # Processa com configurações avançadas
-            result = self.process_audio(
-                audio_data=audio_data,
-                filename=filename,
-                model=model,
-                language=language,
-                include_timestamps=include_timestamps,
-                label=label
-            )
+            # Janelas com prompt dão um resultado diferente do transcribe inteiro: chave própria
+            result = cache_key = None
+            if self.result_cache is not None:
+                cache_options = {**transcribe_options, 'sr': 16000, **opcoes_reamostragem(),
+                                 'mode': 'stream_decode' if stream_decode else 'stream'}
+                if vad:
+                    cache_options['vad'] = True
+                cache_key = gerar_chave(spool.sha256, model, cache_options)
+                result = self.result_cache.obter(cache_key)
+            cache_hit = result is not None
             
-            if result['success']:
-                response = {
-                    'success': True,
-                    'data': {
-                        'transcription': result['transcription'],
-                        'metadata': {
-                            'filename': filename,
-                            'duration_seconds': result['duration'],
-                            'model_used': result['model'],
-                            'language_detected': result.get('language_detected', language),
-                            'processing_time': result['processing_time'],
-                            'characters': len(result['transcription']),
-                            'words': len(result['transcription'].split()),
-                            'speed_ratio': round(result['duration'] / result['processing_time'], 2) if result['processing_time'] > 0 else 0
-                        }
-                    }
-                }
-                
-                if include_timestamps and 'segments' in result:
-                    response['data']['segments'] = result['segments']
-                    
-                return jsonify(response)
+            if cache_hit:
+                for seg in result['segments']:
+                    yield self.sse_event('segment', {
+                        'start': round(seg['start'], 2), 'end': round(seg['end'], 2), 'text': seg['text'].strip()
+                    })
             else:
-                return jsonify({'success': False, 'error': result['error']}), 500
+                if self.engine is None:
+                    with timings:
+                        self.get_whisper_model(model)
+                    run = lambda funcao, *args: funcao(self.get_whisper_model, *args)
+                else:
+                    run = lambda funcao, *args: self.engine.submeter(funcao, *args).result()
                 
+                vad_map = vad_info = decode_time = None
+                if stream_decode:
+                    decode_path, audio_duration = 'stream', 0.0
+                    blocks = decodificar_em_blocos(spool.fonte(), Path(filename).suffix.lower())
+                    windows = transcrever_em_fluxo(run, blocks, TAXA_WHISPER, model, transcribe_options, vad=vad)
+                    if vad:
+                        vad_info = {'speech_seconds': 0.0, 'skipped_seconds': 0.0, 'regions': 0, 'total_seconds': 0.0}
+                else:
+                    decode_start = time.perf_counter()
+                    with timings:
+                        audio_array, sample_rate, decode_path = decodificar_audio(spool.fonte(), Path(filename).suffix.lower(),
+                                                                                  sha256=spool.sha256)
+                    decode_time = time.perf_counter() - decode_start
+                    audio_duration = len(audio_array) / sample_rate
+                    if vad:
+                        with timings:
+                            audio_array, vad_map, vad_info = aplicar_vad(audio_array, sample_rate)
+                    windows = transcrever_em_janelas(run, audio_array, sample_rate, model, transcribe_options)
+                
+                segments, languages, inference_time = [], Counter(), 0.0
+                while True:
+                    # Sem o pool, decodificação em blocos, VAD e inferência da janela rodam nesta thread
+                    with timings:
+                        window = next(windows, None)
+                    if window is None:
+                        break
+                    if self.engine is not None:
+                        timings.adicionar('inference', window['inference_time'])
+                    if vad_map is not None:
+                        remapear_resultado(window, vad_map)
+                    if stream_decode:
+                        audio_duration = window['offset'] + window['duration']
+                        if vad_info is not None:
+                            for key in vad_info:
+                                vad_info[key] = round(vad_info[key] + window['vad'][key], 2)
+                    if window.get('language'):
+                        languages[window['language']] += 1
+                    inference_time += window['inference_time']
+                    for seg in window['segments']:
+                        segments.append(seg)
+                        yield self.sse_event('segment', {
+                            'start': round(seg['start'], 2), 'end': round(seg['end'], 2), 'text': seg['text'].strip()
+                        })
+                
+                result = {
+                    'text': ''.join(seg['text'] for seg in segments),
+                    'segments': segments,
+                    'language': languages.most_common(1)[0][0] if languages else None,
+                    'duration': audio_duration,
+                    'inference_time': inference_time,
+                    'decode_path': decode_path,
+                    'decode_time': decode_time,
+                    'vad': vad_info
+                }
+                self.observe_transcription(model, result)
+                if cache_key is not None:
+                    self.result_cache.guardar(cache_key, result)
+            
+            transcription = result['text'].strip()
+            processing_time = time.time() - start_time
+            yield self.sse_event('done', {
+                'success': True,
+                'transcription': transcription,
+                'metadata': {
+                    'filename': filename,
+                    'duration_seconds': result['duration'],
+                    'model_used': model,
+                    'language_detected': result.get('language') or language,
+                    'processing_time': processing_time,
+                    'decode_path': 'cache' if cache_hit else result['decode_path'],
+                    'cache_hit': cache_hit,
+                    'vad': result.get('vad'),
+                    'timings': timings.como_dict(),
+                    'characters': len(transcription),
+                    'words': len(transcription.split()),
+                    'speed_ratio': round(result['duration'] / processing_time, 2) if processing_time > 0 else 0
+                }
+            })
         except Exception as e:
-            return jsonify({'success': False, 'error': f'Erro interno: {str(e)}'}), 500
+            yield self.sse_event('error', {'success': False, 'error': str(e)})
 
-    def process_audio(self, audio_data: bytes, filename: str, model: str = 'base', 
+    def handle_live_transcription(self, ws):
+        """
+        Protocolo: query string com model, language, window e stride; depois
+        mensagens binárias com PCM int16 little-endian mono 16 kHz e, no fim,
+        a mensagem de texto EOF. Respostas em JSON: ready, partial, final, done, error.
+        """
+        def send(payload: Dict[str, Any]):
+            ws.send(json.dumps(payload, ensure_ascii=False))
+        
+        model = request.args.get('model', 'base')
+        language = request.args.get('language', 'auto')
+        if model not in ['tiny', 'base', 'small', 'medium', 'large']:
+            send({'type': 'error', 'error': f'Modelo {model} inválido. Use: tiny, base, small, medium, large'})
+            return
+        try:
+            window = float(request.args.get('window', self.live_window))
+            stride = float(request.args.get('stride', self.live_stride))
+            if not (0.2 <= stride <= window <= 30):
+                raise ValueError('use 0.2 <= stride <= window <= 30')
+        except ValueError as e:
+            send({'type': 'error', 'error': f'window/stride inválidos: {str(e)}'})
+            return
+        
+        if self.engine is None:
+            self.get_whisper_model(model)
+            run = lambda funcao, *args: funcao(self.get_whisper_model, *args)
+        else:
+            run = lambda funcao, *args: self.engine.submeter(funcao, *args).result()
+        
+        live = TranscricaoTempoReal(
+            run, model,
+            {'language': None if language == 'auto' else language, 'verbose': False},
+            janela=window, passo=stride
+        )
+        with self.live_lock:
+            self.live_connections += 1
+        try:
+            send({'type': 'ready', 'model': model, 'sample_rate': 16000, 'format': 'pcm_s16le',
+                  'window': window, 'stride': stride})
+            while True:
+                message = ws.receive()
+                if message is None or (isinstance(message, str) and message.strip().upper() == 'EOF'):
+                    break
+                if isinstance(message, bytes):
+                    for event in live.adicionar_pcm16(message):
+                        send(event)
+            
+            for event in live.finalizar():
+                send(event)
+            send({'type': 'done', 'stats': live.estatisticas()})
+        except ConnectionClosed:
+            pass  # cliente saiu; o buffer da conexão é descartado
+        except Exception as e:
+            send({'type': 'error', 'error': str(e)})
+        finally:
+            with self.live_lock:
+                self.live_connections -= 1
+
+    def run_advanced_transcription(self, spool: ArquivoSpool, filename: str, model: str,
+                                   language: str, include_timestamps: bool, label: str,
+                                   parallel_chunks: int = 0, vad: bool = False, profile: bool = False,
+                                   progress_callback: Optional[Callable[[str, float], None]] = None,
+                                   upload_time: float = 0.0) -> Tuple[Dict[str, Any], int]:
+        """Processa o áudio e monta a resposta do /api/v1/transcribe (síncrono ou job)"""
+        profile_base = self.profile_base(filename) if profile else None
+        # Sem o pool o trabalho roda nesta thread; com o pool, o worker perfila a tarefa (perfilar_tarefa)
+        profiler = Perfilador() if profile_base and self.engine is None else None
+        try:
+            with profiler or nullcontext():
+                result = self.process_audio(
+                    audio_source=spool.fonte(),
+                    filename=filename,
+                    model=model,
+                    language=language,
+                    include_timestamps=include_timestamps,
+                    label=label,
+                    progress_callback=progress_callback,
+                    audio_sha256=spool.sha256,
+                    parallel_chunks=parallel_chunks,
+                    vad=vad,
+                    upload_time=upload_time,
+                    profile_base=profile_base
+                )
+        finally:
+            spool.remover()
+        if profiler is not None and result['success']:
+            result['profile'] = {'files': profiler.gravar(profile_base), 'top': profiler.principais(),
+                                 'seconds': round(profiler.duracao, 3)}
+        
+        if not result['success']:
+            return {'success': False, 'error': result['error']}, 500
+            
+        response = {
+            'success': True,
+            'data': {
+                'transcription': result['transcription'],
+                'metadata': {
+                    'filename': filename,
+                    'duration_seconds': result['duration'],
+                    'model_used': result['model'],
+                    'language_detected': result.get('language_detected', language),
+                    'processing_time': result['processing_time'],
+                    'decode_path': result['decode_path'],
+                    'cache_hit': result['cache_hit'],
+                    'chunks': result.get('chunks', 1),
+                    'vad': result.get('vad'),
+                    'timings': result['timings'],
+                    'profile': result.get('profile'),
+                    'characters': len(result['transcription']),
+                    'words': len(result['transcription'].split()),
+                    'speed_ratio': round(result['duration'] / result['processing_time'], 2) if result['processing_time'] > 0 else 0
+                }
+            }
+        }
+        
+        if include_timestamps and 'segments' in result:
+            response['data']['segments'] = result['segments']
+            
+        return response, 200
+
+    def spool_upload(self, audio_file) -> ArquivoSpool:
+        """Garante o upload em disco (stream em blocos) e registra para limpeza"""
+        spool = gravar_stream_em_spool(audio_file.stream, sufixo=Path(audio_file.filename).suffix.lower())
+        if spool not in request.spool_files:
+            request.spool_files.append(spool)
+        return spool
+        
+    def is_admin(self) -> bool:
+        """Requisição com o X-Admin-Token configurado em --admin-token"""
+        token = request.headers.get('X-Admin-Token', '')
+        return bool(self.admin_token) and hmac.compare_digest(token.encode(), self.admin_token.encode())
+        
+    def profile_base(self, filename: str) -> str:
+        """Caminho (sem extensão) dos arquivos .pstats/.collapsed de uma requisição perfilada"""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return str(Path(self.profile_dir).resolve() / f"{Path(filename).stem}_{stamp}_{uuid.uuid4().hex[:8]}")
+        
+    def read_json_upload(self, base64_paths: set, filename: str = '') -> Any:
+        """Lê o corpo JSON em stream; os campos base64 indicados viram ArquivoSpool"""
+        inicio = time.perf_counter()
+        try:
+            data, spools = ler_json_com_base64(request.stream, base64_paths, sufixo=Path(filename).suffix.lower())
+        finally:
+            request.add_upload_time(time.perf_counter() - inicio)
+        request.spool_files.extend(spools)
+        return data
+
+    def pcm_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Estatísticas do cache de PCM deste processo (com o pool, cada worker tem o seu)"""
+        pcm_cache = cache_pcm_padrao()
+        if pcm_cache is None:
+            return None
+        stats = pcm_cache.estatisticas()
+        stats['scope'] = 'workers' if self.engine else 'process'
+        return stats
+
+    def process_audio(self, audio_source: Union[str, bytes], filename: str, model: str = 'base', 
                      language: str = 'auto', include_timestamps: bool = True,
-                     label: str = 'api') -> Dict[str, Any]:
-        """Processa áudio usando nosso sistema avançado"""
+                     label: str = 'api',
+                     progress_callback: Optional[Callable[[str, float], None]] = None,
+                     audio_sha256: Optional[str] = None,
+                     parallel_chunks: int = 0, vad: bool = False,
+                     upload_time: float = 0.0, profile_base: Optional[str] = None) -> Dict[str, Any]:
+        """Processa áudio usando nosso sistema avançado; `timings` separa o tempo por etapa"""
         start_time = datetime.now()
+        # Carga do modelo, decodificação e VAD desta thread registram aqui; as do worker vêm em result['timings']
+        timings = CronometroEtapas().ativar()
+        timings.adicionar('spool', upload_time)
+        
+        def progress(stage: str, value: float):
+            if progress_callback:
+                progress_callback(stage, value)
+        
+        def submit(funcao: Callable, *args):
+            """Envia ao pool; perfilado, o worker roda a tarefa sob o perfilador e grava os arquivos"""
+            if profile_base:
+                return self.engine.submeter(perfilar_tarefa, profile_base, funcao, *args)
+            return self.engine.submeter(funcao, *args)
         
         try:
             # Validação do formato
@@ -249,81 +890,155 @@ class TranscritorAPIFlask:
                 }
             
             # Validação do tamanho
-            file_size_mb = len(audio_data) / (1024 * 1024)
+            if isinstance(audio_source, (bytes, bytearray)):
+                file_size_mb = len(audio_source) / (1024 * 1024)
+            else:
+                file_size_mb = os.path.getsize(audio_source) / (1024 * 1024)
             if file_size_mb > 400:
                 return {
                     'success': False,
                     'error': f'Arquivo muito grande ({file_size_mb:.1f} MB). Máximo: 400 MB'
                 }
             
-            # Carrega modelo Whisper se necessário
-            if model not in self.whisper_models:
-                print(f"🤖 Carregando modelo Whisper '{model}'...")
-                try:
-                    self.whisper_models[model] = whisper.load_model(model)
-                    print(f"✅ Modelo '{model}' carregado!")
-                except Exception as e:
-                    return {'success': False, 'error': f'Erro ao carregar modelo {model}: {str(e)}'}
+            # Configurações de transcrição
+            transcribe_options = {
+                'language': None if language == 'auto' else language,
+                'word_timestamps': include_timestamps,
+                'verbose': False
+            }
             
-            # Salva arquivo temporário
-            with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
+            # Arquivos grandes: decodificação em blocos, memória limitada pela janela de 30s
+            stream_decode = (self.stream_decode_min_mb > 0 and file_size_mb >= self.stream_decode_min_mb
+                             and parallel_chunks <= 1)
             
-            try:
-                # Processa áudio com Librosa (sem FFmpeg - nossa vantagem!)
-                print(f"🔊 Processando áudio {filename}...")
-                audio_array, sample_rate = librosa.load(temp_path, sr=16000)
-                audio_duration = len(audio_array) / sample_rate
-                
-                print(f"✅ Áudio carregado: {audio_duration:.1f}s, {sample_rate}Hz")
-                
-                # Transcrição com Whisper
-                print("🎵 Transcrevendo...")
-                whisper_model = self.whisper_models[model]
-                
-                # Configurações de transcrição
-                transcribe_options = {
-                    'language': None if language == 'auto' else language,
-                    'word_timestamps': include_timestamps,
-                    'verbose': False
-                }
-                
-                result = whisper_model.transcribe(audio_array, **transcribe_options)
-                
-                processing_time = (datetime.now() - start_time).total_seconds()
-                print(f"✅ Transcrição concluída em {processing_time:.1f}s")
-                
-                response = {
-                    'success': True,
-                    'transcription': result['text'].strip(),
-                    'duration': audio_duration,
-                    'model': model,
-                    'processing_time': processing_time,
-                    'language_detected': result.get('language', language)
-                }
-                
-                if include_timestamps and 'segments' in result:
-                    response['segments'] = [
-                        {
-                            'start': round(seg['start'], 2),
-                            'end': round(seg['end'], 2),
-                            'text': seg['text'].strip()
-                        }
-                        for seg in result['segments']
-                    ]
+            # Trechos paralelos só fazem sentido com o pool de workers
+            if parallel_chunks > 1 and self.engine is None:
+                print("⚠️  parallel_chunks ignorado: inicie a API com --workers para transcrição em trechos")
+                parallel_chunks = 0
+            if self.engine is not None:
+                parallel_chunks = min(parallel_chunks, self.engine.num_workers)
+            if profile_base and parallel_chunks > 1:
+                print("⚠️  parallel_chunks ignorado: a requisição perfilada roda numa única tarefa")
+                parallel_chunks = 0
+            
+            # Cache de resultados: mesmo áudio + mesmas opções = mesma transcrição
+            result = None
+            cache_key = None
+            if self.result_cache is not None and profile_base is None:  # perfilar um acerto de cache não mede nada
+                if audio_sha256 is None:
+                    if isinstance(audio_source, (bytes, bytearray)):
+                        audio_sha256 = hashlib.sha256(audio_source).hexdigest()
+                    else:
+                        audio_sha256 = hash_arquivo(audio_source)
+                cache_options = {**transcribe_options, 'sr': 16000, **opcoes_reamostragem()}
+                if parallel_chunks > 1:
+                    cache_options['parallel_chunks'] = parallel_chunks  # cortes mudam o contexto do decoder
+                if vad:
+                    cache_options['vad'] = True
+                if stream_decode:
+                    cache_options['mode'] = 'stream_decode'  # janelas de 30s com prompt: resultado próprio
+                cache_key = gerar_chave(audio_sha256, model, cache_options)
+                result = self.result_cache.obter(cache_key)
+                if result is not None:
+                    print(f"💾 Resultado em cache para {filename} ({model})")
+            cache_hit = result is not None
+            
+            if result is None:
+                # Carrega modelo Whisper se necessário (no pool, cada worker já tem o seu)
+                progress('loading_model', 0.1)
+                if self.engine is None:
+                    try:
+                        self.get_whisper_model(model)
+                    except Exception as e:
+                        return {'success': False, 'error': f'Erro ao carregar modelo {model}: {str(e)}'}
                 
-                return response
+                # Librosa/SoundFile (sem FFmpeg - nossa vantagem!) + Whisper, no pool ou inline.
+                # Uploads pequenos chegam como bytes e são decodificados da memória;
+                # os grandes já estão no spool e só o caminho é repassado.
+                print(f"🔊 Processando áudio {filename}...")
+                progress('transcribing', 0.3)
+                if parallel_chunks > 1:
+                    # Áudio longo: decodifica aqui, corta no silêncio e espalha os trechos pelo pool
+                    decode_start = time.perf_counter()
+                    audio_array, sample_rate, decode_path = decodificar_audio(audio_source, file_ext, sha256=audio_sha256)
+                    decode_time = time.perf_counter() - decode_start
+                    vad_info = None
+                    if vad:
+                        audio_duration = len(audio_array) / sample_rate
+                        audio_array, vad_map, vad_info = aplicar_vad(audio_array, sample_rate)
+                    with timings.etapa('inference'):  # tempo de parede dos trechos em paralelo
+                        result = transcrever_em_paralelo(self.engine, audio_array, sample_rate, model,
+                                                         transcribe_options, parallel_chunks)
+                    if vad_info is not None:
+                        remapear_resultado(result, vad_map)
+                        result['duration'] = audio_duration
+                    result['decode_path'] = decode_path
+                    result['decode_time'] = decode_time
+                    result['vad'] = vad_info
+                elif stream_decode:
+                    print(f"🌊 Decodificação em blocos ({file_size_mb:.0f} MB >= {self.stream_decode_min_mb:.0f} MB)")
+                    if self.engine is not None:
+                        result = submit(
+                            transcrever_arquivo_em_fluxo, audio_source, model, transcribe_options, file_ext, vad
+                        ).result()
+                    else:
+                        result = transcrever_arquivo_em_fluxo(self.get_whisper_model, audio_source, model,
+                                                              transcribe_options, file_ext, vad)
+                elif self.engine is not None:
+                    result = submit(
+                        transcrever_arquivo, audio_source, model, transcribe_options, file_ext, audio_sha256, vad
+                    ).result()
+                else:
+                    result = transcrever_arquivo(self.get_whisper_model, audio_source, model,
+                                                 transcribe_options, file_ext, audio_sha256, vad)
                 
-            finally:
-                # Limpa arquivo temporário
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+                timings.mesclar(result.pop('timings', None))
+                self.observe_transcription(model, result)
+                if cache_key is not None:
+                    self.result_cache.guardar(cache_key, result)
+                    
+            audio_duration = result['duration']
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            print(f"✅ Transcrição concluída em {processing_time:.1f}s ({audio_duration:.1f}s de áudio)")
+            if result.get('vad'):
+                print(f"🗣️  VAD: {result['vad']['skipped_seconds']:.1f}s de silêncio pulados")
+            
+            response = {
+                'success': True,
+                'transcription': result['text'].strip(),
+                'duration': audio_duration,
+                'model': model,
+                'processing_time': processing_time,
+                'language_detected': result.get('language') or language,
+                'decode_path': 'cache' if cache_hit else result['decode_path'],
+                'cache_hit': cache_hit,
+                'chunks': result.get('chunks', 1),
+                'vad': result.get('vad'),
+                'timings': timings.como_dict(),
+                'profile': result.get('profile')
+            }
+            
+            if include_timestamps and 'segments' in result:
+                response['segments'] = [
+                    {
+                        'start': round(seg['start'], 2),
+                        'end': round(seg['end'], 2),
+                        'text': seg['text'].strip()
+                    }
+                    for seg in result['segments']
+                ]
+            
+            return response
                 
         except Exception as e:
             return {'success': False, 'error': f'Erro no processamento: {str(e)}'}
+        finally:
+            timings.desativar()
+
+    def get_whisper_model(self, model: str):
+        """Retorna o modelo Whisper do processo web (carga única, LRU por orçamento)"""
+        return self.whisper_models.obter(model)
 
     def get_web_interface(self) -> str:
         """Interface web moderna inspirada no TranscreveAPI"""
@@ -658,7 +1373,28 @@ class TranscritorAPIFlask:
                 <div class="endpoint">
                     <strong>POST /api/v1/transcribe</strong><br>
                     🚀 Endpoint avançado com todas nossas funcionalidades<br>
-                    Suporte a: timestamps, múltiplos modelos, idiomas, metadados
+                    Suporte a: timestamps, múltiplos modelos, idiomas, metadados<br>
+                    Modo assíncrono: async=true → 202 com job_id<br>
+                    Silêncio: vad=true → só as regiões com fala vão ao Whisper (metadata.vad mostra o que foi pulado)<br>
+                    Áudios longos: parallel_chunks=N → trechos cortados no silêncio em N workers (requer --workers)<br>
+                    Diagnóstico: profile=true + X-Admin-Token → .pstats/.collapsed no servidor (metadata.profile traz o top)
+                </div>
+                
+                <div class="endpoint">
+                    <strong>POST /api/v1/transcribe/stream</strong><br>
+                    📡 Mesmos parâmetros, resposta em Server-Sent Events<br>
+                    Eventos: start → segment (start, end, text) a cada trecho → done (metadados) | error
+                </div>
+                
+                <div class="endpoint">
+                    <strong>WS /api/v1/transcribe/live</strong><br>
+                    🎙️ Legendas ao vivo: envie PCM 16 kHz int16 mono, receba segmentos partial/final<br>
+                    Query: model, language, window, stride · Teste: python cliente_tempo_real.py --file audio.wav
+                </div>
+                
+                <div class="endpoint">
+                    <strong>GET /api/v1/jobs/&lt;job_id&gt;</strong><br>
+                    ⏳ Status, progresso e resultado de jobs assíncronos
                 </div>
                 
                 <div class="endpoint">
@@ -671,6 +1407,11 @@ class TranscritorAPIFlask:
                     💚 Status de saúde da API para monitoramento
                 </div>
                 
+                <div class="endpoint">
+                    <strong>GET /metrics</strong><br>
+                    📈 Métricas Prometheus: requisições, latência por etapa e fator de tempo real
+                </div>
+                
                 <h4>Exemplo de uso (compatível com TranscreveAPI):</h4>
                 <div class="endpoint">
 curl -X POST -F 'audio=@meuaudio.mp3' http://localhost:5000/transcrever
@@ -750,39 +1491,70 @@ curl -X POST -F 'audio=@meuaudio.mp3' http://localhost:5000/transcrever
                 formData.append('timestamps', document.getElementById('timestamps').value);
                 formData.append('label', document.getElementById('label').value);
                 
-                const response = await fetch('/api/v1/transcribe', {
+                // Stream SSE: cada segmento aparece assim que o Whisper termina o trecho
+                const response = await fetch('/api/v1/transcribe/stream', {
                     method: 'POST',
                     body: formData
                 });
                 
-                const data = await response.json();
+                if (!response.ok) {
+                    const data = await response.json();
+                    throw new Error(data.error || `HTTP ${response.status}`);
+                }
                 
                 loading.style.display = 'none';
                 result.style.display = 'block';
+                result.className = 'result success';
+                result.innerHTML = `
+                    <h4 id="streamStatus">🎵 Transcrevendo...</h4>
+                    <div class="transcription-text" id="streamText"></div>
+                    <div class="metadata" id="streamMetadata"></div>
+                `;
+                const streamText = document.getElementById('streamText');
                 
-                if (data.success) {
-                    result.className = 'result success';
-                    const speedRatio = data.data.metadata.speed_ratio;
-                    const speedText = speedRatio > 1 ? `${speedRatio}x mais rápido que tempo real` : 'Processamento em tempo real';
-                    
-                    result.innerHTML = `
-                        <h4>✅ Transcrição Concluída com Sucesso!</h4>
-                        <div class="transcription-text">
-                            ${data.data.transcription}
-                        </div>
-                        <div class="metadata">
-                            <span><strong>⏱️ Duração:</strong> ${data.data.metadata.duration_seconds.toFixed(1)}s</span>
-                            <span><strong>🤖 Modelo:</strong> ${data.data.metadata.model_used}</span>
-                            <span><strong>🌍 Idioma:</strong> ${data.data.metadata.language_detected}</span>
-                            <span><strong>⚡ Tempo:</strong> ${data.data.metadata.processing_time.toFixed(1)}s</span>
-                            <span><strong>📝 Palavras:</strong> ${data.data.metadata.words}</span>
-                            <span><strong>📊 Chars:</strong> ${data.data.metadata.characters}</span>
+                const handleEvent = (event, data) => {
+                    if (event === 'segment') {
+                        const span = document.createElement('span');
+                        span.title = `${data.start.toFixed(1)}s - ${data.end.toFixed(1)}s`;
+                        span.textContent = data.text + ' ';
+                        streamText.appendChild(span);
+                    } else if (event === 'done') {
+                        const meta = data.metadata;
+                        const speedText = meta.speed_ratio > 1 ? `${meta.speed_ratio}x mais rápido que tempo real` : 'Processamento em tempo real';
+                        document.getElementById('streamStatus').textContent = '✅ Transcrição Concluída com Sucesso!';
+                        document.getElementById('streamMetadata').innerHTML = `
+                            <span><strong>⏱️ Duração:</strong> ${meta.duration_seconds.toFixed(1)}s</span>
+                            <span><strong>🤖 Modelo:</strong> ${meta.model_used}</span>
+                            <span><strong>🌍 Idioma:</strong> ${meta.language_detected}</span>
+                            <span><strong>⚡ Tempo:</strong> ${meta.processing_time.toFixed(1)}s</span>
+                            <span><strong>📝 Palavras:</strong> ${meta.words}</span>
+                            <span><strong>📊 Chars:</strong> ${meta.characters}</span>
                             <span><strong>🚀 Velocidade:</strong> ${speedText}</span>
-                        </div>
-                    `;
-                } else {
-                    result.className = 'result error';
-                    result.innerHTML = `<h4>❌ Erro na Transcrição</h4><p>${data.error}</p>`;
+                        `;
+                    } else if (event === 'error') {
+                        throw new Error(data.error);
+                    }
+                };
+                
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\\n\\n')) >= 0) {
+                        const raw = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        let event = 'message', payload = '';
+                        for (const line of raw.split('\\n')) {
+                            if (line.startsWith('event:')) event = line.slice(6).trim();
+                            else if (line.startsWith('data:')) payload += line.slice(5).trim();
+                        }
+                        if (payload) handleEvent(event, JSON.parse(payload));
+                    }
                 }
                 
             } catch (error) {
@@ -809,7 +1581,31 @@ curl -X POST -F 'audio=@meuaudio.mp3' http://localhost:5000/transcrever
 </html>
         '''
 
-    def run(self, host='0.0.0.0', port=5000, debug=False):
+    def preload_models(self, models: Optional[list] = None):
+        """Carrega e aquece os modelos antes de aceitar requisições"""
+        models = list(models or [])
+        inicio = time.time()
+        
+        if models:
+            print(f"🔥 Pré-carregando modelos: {', '.join(models)}")
+            
+        if self.engine is not None:
+            # Cada worker carrega e aquece os seus modelos ao subir
+            self.engine.modelos_precarregar = models
+            self.engine.iniciar()
+            self.preload_stats = {
+                'models': models,
+                'workers': {str(indice): tempos for indice, tempos in self.engine.preload.items()}
+            }
+        elif models:
+            self.preload_stats = {'models': models, 'process': self.whisper_models.precarregar(models)}
+            
+        if models:
+            self.preload_stats['total_time'] = round(time.time() - inicio, 2)
+            print(f"✅ Pré-carga concluída em {self.preload_stats['total_time']:.1f}s")
+        self.ready = True
+
+    def run(self, host='0.0.0.0', port=5000, debug=False, preload_models: Optional[list] = None):
         """Inicia o servidor Flask"""
         print("🚀 INICIANDO TRANSCRITOR AVANÇADO - API FLASK")
         print("=" * 55)
@@ -817,7 +1613,13 @@ curl -X POST -F 'audio=@meuaudio.mp3' http://localhost:5000/transcrever
         print(f"📚 Interface: http://localhost:{port}")
         print(f"🎯 API Principal: http://localhost:{port}/transcrever")
         print(f"⚡ API Avançada: http://localhost:{port}/api/v1/transcribe")
+        print(f"⏳ Jobs: http://localhost:{port}/api/v1/jobs/<job_id>")
+        if WEBSOCKET_OK:
+            print(f"🎙️  Ao vivo (WebSocket): ws://localhost:{port}/api/v1/transcribe/live")
+        else:
+            print("🎙️  Ao vivo desativado: pip install flask-sock")
         print(f"💚 Health Check: http://localhost:{port}/health")
+        print(f"📈 Métricas: http://localhost:{port}/metrics")
         print("=" * 55)
         print("🔥 VANTAGENS sobre TranscreveAPI original:")
         print("   ✅ 100% Offline (sem Google API)")
@@ -828,10 +1630,144 @@ curl -X POST -F 'audio=@meuaudio.mp3' http://localhost:5000/transcrever
         print("   ✅ Compatibilidade total")
         print("=" * 55)
         
-        self.app.run(host=host, port=port, debug=debug)
+        try:
+            self.preload_models(preload_models)
+        except ErroWorker as e:
+            # Sem workers não há como atender: melhor sair do que ficar em 'starting' para sempre
+            print(f"❌ Servidor não iniciado: {e}")
+            sys.exit(1)
+        
+        try:
+            # Threaded: requisições esperam o pool em paralelo
+            self.app.run(host=host, port=port, debug=debug, threaded=True)
+        finally:
+            if self.engine is not None:
+                self.engine.encerrar()
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria parser de argumentos do servidor"""
+    parser = argparse.ArgumentParser(description="🎯 Transcritor Avançado - API Flask")
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=int(os.environ.get('TRANSCRITOR_WORKERS', '0')),
+        help='Processos de inferência (0 = inferência no processo web; padrão: $TRANSCRITOR_WORKERS ou 0)'
+    )
+    
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=int(os.environ.get('TRANSCRITOR_TORCH_THREADS', '1')),
+        help='Threads do torch por worker (padrão: $TRANSCRITOR_TORCH_THREADS ou 1)'
+    )
+    
+    parser.add_argument(
+        '--preload',
+        default=os.environ.get('TRANSCRITOR_PRELOAD', ''),
+        help='Modelos a carregar e aquecer antes de aceitar requisições, separados por vírgula (ex: tiny,base)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Diretório do cache de resultados (padrão: $TRANSCRITOR_CACHE_DIR ou ~/.cache/transcritor/resultados)'
+    )
+    
+    parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        default=1024,
+        help='Tamanho máximo do cache de resultados em disco, em MB (padrão: 1024)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Desativa o cache de resultados'
+    )
+    
+    parser.add_argument(
+        '--pcm-cache-dir',
+        default=None,
+        help='Diretório do cache de PCM decodificado (padrão: $TRANSCRITOR_PCM_CACHE_DIR ou ~/.cache/transcritor/pcm)'
+    )
+    
+    parser.add_argument(
+        '--pcm-cache-max-mb',
+        type=float,
+        default=None,
+        help='Tamanho máximo do cache de PCM em disco, em MB (padrão: 4096)'
+    )
+    
+    parser.add_argument(
+        '--pcm-dtype',
+        choices=['float32', 'float16'],
+        default=None,
+        help='Precisão do PCM em cache: float32 (leitura sem cópia) ou float16 (metade do disco)'
+    )
+    
+    parser.add_argument(
+        '--pcm-cache',
+        action='store_true',
+        help='Reutiliza o PCM decodificado de uploads repetidos (.npy em disco; padrão: desligado, '
+             'ou $TRANSCRITOR_PCM_CACHE=1)'
+    )
+    
+    parser.add_argument(
+        '--resampler',
+        choices=['soxr_hq', 'soxr_mq', 'soxr_qq', 'polyphase', 'none'],
+        default=os.environ.get('TRANSCRITOR_RESAMPLER') or None,
+        help='Reamostrador para 16 kHz: soxr_hq (padrão), soxr_mq, soxr_qq, polyphase ou none (fontes já em 16 kHz)'
+    )
+    
+    parser.add_argument(
+        '--stream-decode-min-mb',
+        type=float,
+        default=0.0,
+        help='Arquivos a partir deste tamanho são decodificados em blocos de 30s e transcritos em janelas, '
+             'com memória limitada (padrão: 0 = nunca; ex.: 50)'
+    )
+    
+    parser.add_argument(
+        '--live-window',
+        type=float,
+        default=10.0,
+        help='Segundos de áudio instável re-decodificados no WebSocket ao vivo (padrão: 10)'
+    )
+    
+    parser.add_argument(
+        '--live-stride',
+        type=float,
+        default=1.0,
+        help='Segundos de áudio novo entre decodificações ao vivo; menor = menos latência, mais CPU (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--admin-token',
+        default=os.environ.get('TRANSCRITOR_ADMIN_TOKEN') or None,
+        help='Token do cabeçalho X-Admin-Token para profile=true no /api/v1/transcribe (padrão: $TRANSCRITOR_ADMIN_TOKEN; sem token, desativado)'
+    )
+    
+    parser.add_argument(
+        '--profile-dir',
+        default=os.environ.get('TRANSCRITOR_PROFILE_DIR', 'perfis'),
+        help='Onde gravar os .pstats/.collapsed das requisições perfiladas (padrão: $TRANSCRITOR_PROFILE_DIR ou ./perfis)'
+    )
+    
+    parser.add_argument(
+        '--model-budget-mb',
+        type=float,
+        default=float(os.environ['TRANSCRITOR_MODEL_BUDGET_MB']) if os.environ.get('TRANSCRITOR_MODEL_BUDGET_MB') else None,
+        help='Memória máxima de modelos residentes por processo, em MB (padrão: sem limite)'
+    )
+    
+    return parser
 
 def main():
     """Função principal"""
+    args = criar_parser().parse_args()
+    
     print("🎯 TRANSCRITOR AVANÇADO - API FLASK v3.0")
     print("Inspirado em: https://github.com/erickythierry/transcreveAPI")
     print("Mas MUITO mais poderoso! 🚀\n")
@@ -847,8 +1783,33 @@ def main():
     
     # Inicia API
     try:
-        api = TranscritorAPIFlask()
-        api.run(debug=False)
+        result_cache = None
+        if not args.no_cache:
+            result_cache = CacheTranscricao(args.cache_dir or DIRETORIO_CACHE_PADRAO, max_disco_mb=args.cache_max_mb)
+        
+        # Antes de criar o pool: os workers herdam a configuração pelo ambiente
+        configurar_cache_pcm(ativo=True if args.pcm_cache else None, diretorio=args.pcm_cache_dir,
+                             max_disco_mb=args.pcm_cache_max_mb, dtype=args.pcm_dtype)
+        if args.resampler:
+            configurar_reamostrador(args.resampler)
+        
+        api = TranscritorAPIFlask(
+            inference_workers=args.workers,
+            torch_threads=args.torch_threads,
+            model_budget_mb=args.model_budget_mb,
+            result_cache=result_cache,
+            live_window=args.live_window,
+            live_stride=args.live_stride,
+            stream_decode_min_mb=args.stream_decode_min_mb,
+            admin_token=args.admin_token,
+            profile_dir=args.profile_dir
+        )
+        preload = [m.strip() for m in args.preload.split(',') if m.strip()]
+        invalidos = [m for m in preload if m not in ['tiny', 'base', 'small', 'medium', 'large']]
+        if invalidos:
+            print(f"❌ Modelos inválidos em --preload: {', '.join(invalidos)}")
+            return
+        api.run(debug=False, preload_models=preload)
     except KeyboardInterrupt:
         print("\n🛑 Servidor interrompido pelo usuário")
     except Exception as e:
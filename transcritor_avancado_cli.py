@@ -5,6 +5,11 @@ Versão melhorada inspirada nas melhores práticas de projetos GitHub
 Mantém nossa abordagem sem FFmpeg + funcionalidades CLI profissionais
 Autor: Sistema de Transcrição Inteligente
 Data: 2025
+
+Início rápido: o módulo só importa a biblioteca padrão. --help,
+--list-models e a validação dos argumentos rodam sem carregar torch,
+librosa ou whisper; esses entram só no caminho da transcrição
+(orçamento verificado em teste_rapido.py --inicio-cli).
 """
 
 import os
@@ -12,10 +17,10 @@ import sys
 import time
 import argparse
 import traceback
-import numpy as np
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterator
 
 # Configurações padrão
 FORMATOS_SUPORTADOS = ['.mp3', '.mp4', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma', '.webm']
@@ -23,27 +28,10 @@ MODELOS_WHISPER = ['tiny', 'base', 'small', 'medium', 'large']
 DIRETORIO_SAIDA_PADRAO = "transcricoes"
 
 def verificar_dependencias():
-    """Verifica se todas as dependências estão instaladas"""
-    dependencias = {'librosa': False, 'whisper': False, 'numpy': False}
-    
-    try:
-        import librosa
-        dependencias['librosa'] = True
-    except ImportError:
-        pass
-    
-    try:
-        import whisper
-        dependencias['whisper'] = True
-    except ImportError:
-        pass
-    
-    try:
-        import numpy as np
-        dependencias['numpy'] = True
-    except ImportError:
-        pass
+    """Verifica se todas as dependências estão instaladas (find_spec: sem importar torch/librosa)"""
+    from importlib.util import find_spec
     
+    dependencias = {nome: find_spec(nome) is not None for nome in ('librosa', 'whisper', 'numpy')}
     todas_ok = all(dependencias.values())
     
     if not todas_ok:
@@ -145,6 +133,116 @@ def estimar_tempo_processamento(tamanho_mb: float, modelo: str) -> Dict:
         'humano': f"{tempo_estimado:.1f} min" if tempo_estimado >= 1 else f"{tempo_estimado*60:.0f}s"
     }
 
+def montar_opcoes_whisper(idioma: str, temperatura: float, incluir_timestamps: bool) -> Dict:
+    """Opções de model.transcribe usadas pelo CLI"""
+    opcoes = {
+        'language': idioma if idioma != 'auto' else None,
+        'fp16': False,
+        'verbose': False,
+        'temperature': temperatura
+    }
+    
+    if incluir_timestamps:
+        opcoes['word_timestamps'] = True
+    return opcoes
+
+def opcoes_chave_cache(opcoes: Dict, trechos_paralelos: int = 0, usar_vad: bool = False,
+                       bloco_checkpoint: float = 0.0) -> Dict:
+    """Tudo que muda o resultado entra na chave do cache"""
+    from decodificacao_audio import opcoes_reamostragem
+    
+    opcoes_chave = {**opcoes, 'sr': 16000, **opcoes_reamostragem()}
+    if trechos_paralelos > 1:
+        opcoes_chave['parallel_chunks'] = trechos_paralelos  # cortes mudam o contexto do decoder
+    if usar_vad:
+        opcoes_chave['vad'] = True
+    if bloco_checkpoint > 0 and trechos_paralelos <= 1:  # com trechos paralelos o checkpoint não é usado
+        opcoes_chave['checkpoint_every'] = bloco_checkpoint  # blocos com prompt, não um transcribe só
+    return opcoes_chave
+
+def salvar_resultado(arquivo: str, arquivo_saida: str, modelo: str, resultado: Dict,
+                     tempo_processamento: float, tamanho_mb: float,
+                     label: str, incluir_timestamps: bool) -> Dict:
+    """Calcula as estatísticas e grava a transcrição no formato completo"""
+    from cronometro_etapas import etapa
+    
+    texto = resultado["text"]
+    duracao = resultado["duration"]
+    stats = {
+        'duracao_audio': duracao,
+        'tempo_processamento': tempo_processamento,
+        'velocidade': duracao / tempo_processamento if tempo_processamento > 0 else 0,
+        'palavras': len(texto.split()),
+        'caracteres': len(texto),
+        'idioma_detectado': resultado.get("language") or "desconhecido",
+        'tamanho_arquivo_mb': tamanho_mb,
+        'vad': resultado.get('vad'),
+        'etapas': resultado.get('timings') or {}
+    }
+    with etapa('output'):
+        salvar_transcricao_completa(
+            arquivo_saida, arquivo, modelo, texto, resultado.get("segments", []),
+            stats, label, incluir_timestamps
+        )
+    return stats
+
+def transcrever_em_trechos(audio_data, sr: int, modelo: str, opcoes: Dict,
+                           workers: int, verboso: bool = True) -> Dict:
+    """Transcreve trechos cortados no silêncio em paralelo, um processo por worker"""
+    from motor_inferencia import MotorInferencia
+    from transcricao_longa import transcrever_em_paralelo
+    
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    if verboso:
+        print(f"🧩 Modo paralelo: {workers} workers x {threads} threads")
+    
+    motor = MotorInferencia(num_workers=workers, threads_por_worker=threads, modelos_precarregar=[modelo])
+    try:
+        motor.iniciar()
+        resultado = transcrever_em_paralelo(motor, audio_data, sr, modelo, opcoes, workers)
+    finally:
+        motor.encerrar()
+    
+    if verboso:
+        print(f"✅ {resultado['chunks']} trechos costurados")
+    return resultado
+
+def transcrever_com_checkpoint(model, audio_data, sr: int, modelo: str, opcoes: Dict, chave: str,
+                               bloco: float, diretorio_checkpoint: Optional[str] = None,
+                               verboso: bool = True) -> Dict:
+    """Transcreve em blocos de `bloco` segundos, gravando um checkpoint após cada um"""
+    from checkpoint_transcricao import CheckpointTranscricao
+    from transcricao_longa import transcrever_em_janelas
+    
+    duracao = len(audio_data) / sr
+    checkpoint = CheckpointTranscricao(chave, diretorio_checkpoint)
+    estado = checkpoint.carregar()
+    if verboso:
+        if estado:
+            print(f"📌 Retomando do checkpoint: {estado['offset']:.0f}s de {duracao:.0f}s já transcritos")
+        else:
+            print(f"📌 Checkpoint a cada {bloco:.0f}s de áudio em {checkpoint.caminho}")
+    
+    def executar(funcao, *args):
+        return funcao(lambda _nome: model, *args)
+    
+    for resultado_bloco in transcrever_em_janelas(executar, audio_data, sr, modelo, opcoes,
+                                                  janela=bloco, retomar=estado):
+        checkpoint.atualizar(resultado_bloco)
+        if verboso:
+            feito = checkpoint.estado['offset']
+            print(f"  📌 {feito:.0f}s / {duracao:.0f}s ({feito / duracao * 100:.0f}%) salvos")
+    
+    segmentos = checkpoint.estado['segments']
+    resultado = {
+        'text': ''.join(seg['text'] for seg in segmentos),
+        'segments': segmentos,
+        'language': checkpoint.estado['language'],
+        'duration': duracao
+    }
+    checkpoint.remover()
+    return resultado
+
 def transcrever_audio_avancado(
     arquivo: str,
     modelo: str = "base",
@@ -153,11 +251,25 @@ def transcrever_audio_avancado(
     idioma: str = "pt",
     incluir_timestamps: bool = True,
     temperatura: float = 0.0,
-    verboso: bool = True
+    verboso: bool = True,
+    usar_cache: bool = True,
+    diretorio_cache: Optional[str] = None,
+    usar_cache_pcm: bool = False,
+    trechos_paralelos: int = 0,
+    usar_vad: bool = False,
+    bloco_checkpoint: float = 0.0,
+    diretorio_checkpoint: Optional[str] = None
 ) -> Optional[Dict]:
     """
-    Função principal de transcrição com funcionalidades avançadas
+    Função principal de transcrição com funcionalidades avançadas.
+    Com `bloco_checkpoint` > 0, áudios mais longos que esse número de segundos
+    são transcritos em blocos com checkpoint e retomados após uma queda.
+    O tempo de cada etapa (carga do modelo, decodificação, reamostragem,
+    VAD, inferência, alinhamento, gravação) vai para o cabeçalho da saída.
     """
+    from cronometro_etapas import CronometroEtapas, etapa
+    
+    cronometro = CronometroEtapas().ativar()
     
     if verboso:
         print("🎯 TRANSCRITOR AVANÇADO COM CLI")
@@ -171,10 +283,6 @@ def transcrever_audio_avancado(
         print("=" * 70)
     
     try:
-        import librosa
-        import whisper
-        import numpy as np
-        
         # Verificar arquivo
         verificacao = verificar_arquivo(arquivo)
         if not verificacao['valido']:
@@ -195,64 +303,116 @@ def transcrever_audio_avancado(
         dir_saida = criar_diretorio_saida(diretorio_saida, label)
         arquivo_saida = gerar_nome_arquivo_saida(arquivo, label, dir_saida)
         
-        if verboso:
-            print(f"\n🤖 Carregando modelo Whisper '{modelo}'...")
-        
-        # Carregar modelo
-        model = whisper.load_model(modelo)
-        if verboso:
-            print("✅ Modelo carregado!")
-        
-        # Processar áudio
-        if verboso:
-            print(f"\n🔊 Processando áudio...")
-        
-        audio_data, sr = librosa.load(arquivo, sr=16000)
-        duracao = len(audio_data) / sr
-        
-        # Normalizar para Whisper
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
-        audio_data = np.clip(audio_data, -1.0, 1.0)
-        
-        if verboso:
-            print(f"✅ Áudio processado:")
-            print(f"  📊 Duração: {duracao:.1f}s ({duracao/60:.1f} min)")
-            print(f"  📊 Taxa: {sr} Hz")
-            print(f"  📊 Amostras: {len(audio_data):,}")
-        
-        # Transcrever
-        if verboso:
-            print(f"\n🎵 Transcrevendo...")
-            print(f"⏳ Aguarde ~{estimativa['humano']}")
-        
-        inicio = time.time()
-        
         # Configurar opções de transcrição
-        opcoes = {
-            'language': idioma if idioma != 'auto' else None,
-            'fp16': False,
-            'verbose': False,
-            'temperature': temperatura
-        }
-        
-        if incluir_timestamps:
-            opcoes['word_timestamps'] = True
+        opcoes = montar_opcoes_whisper(idioma, temperatura, incluir_timestamps)
         
-        resultado = model.transcribe(audio_data, **opcoes)
+        # Cache de resultados: mesmo arquivo + mesmas opções não passa de novo pelo Whisper
+        cache = chave_cache = resultado = sha256 = None
+        if usar_cache:
+            from cache_transcricao import cache_padrao, gerar_chave, hash_arquivo
+            cache = cache_padrao(diretorio_cache)
+            sha256 = hash_arquivo(arquivo)
+            chave_cache = gerar_chave(sha256, modelo, opcoes_chave_cache(opcoes, trechos_paralelos, usar_vad,
+                                                                          bloco_checkpoint))
+            resultado = cache.obter(chave_cache)
         
-        fim = time.time()
-        duracao_processamento = fim - inicio
+        if resultado is not None:
+            duracao = resultado['duration']
+            duracao_processamento = resultado['inference_time']
+            if verboso:
+                print(f"\n💾 Resultado encontrado no cache (transcrição original: {duracao_processamento:.1f}s)")
+        else:
+            # Carregar modelo (no modo paralelo cada worker carrega o seu)
+            if trechos_paralelos <= 1:
+                if verboso:
+                    print(f"\n🤖 Carregando modelo Whisper '{modelo}'...")
+                import whisper
+                from cronometro_etapas import instrumentar_whisper
+                with etapa('model_load'):
+                    model = whisper.load_model(modelo)
+                instrumentar_whisper()
+                if verboso:
+                    print("✅ Modelo carregado!")
+            
+            # Processar áudio (PCM já decodificado vem do cache mapeado em memória)
+            if verboso:
+                print(f"\n🔊 Processando áudio...")
+            
+            from decodificacao_audio import decodificar_audio
+            if usar_cache_pcm:
+                from cache_pcm import configurar_cache_pcm
+                configurar_cache_pcm(ativo=True)
+            audio_data, sr, origem_audio = decodificar_audio(arquivo, sha256=sha256)
+            duracao = len(audio_data) / sr
+            
+            if verboso:
+                if origem_audio == 'pcm_cache':
+                    print(f"💾 PCM decodificado lido do cache")
+                print(f"✅ Áudio processado:")
+                print(f"  📊 Duração: {duracao:.1f}s ({duracao/60:.1f} min)")
+                print(f"  📊 Taxa: {sr} Hz")
+                print(f"  📊 Amostras: {len(audio_data):,}")
+            
+            # VAD: só as regiões com fala seguem para o Whisper
+            mapa_vad = info_vad = None
+            if usar_vad:
+                from deteccao_voz import aplicar_vad
+                audio_data, mapa_vad, info_vad = aplicar_vad(audio_data, sr)
+                if verboso:
+                    print(f"🗣️  VAD: {info_vad['regions']} regiões de fala, "
+                          f"{info_vad['skipped_seconds']:.1f}s de silêncio pulados "
+                          f"({info_vad['skipped_seconds'] / duracao * 100 if duracao else 0:.0f}%)")
+            
+            # Transcrever
+            if verboso:
+                print(f"\n🎵 Transcrevendo...")
+                print(f"⏳ Aguarde ~{estimativa['humano']}")
+            
+            inicio = time.time()
+            
+            if trechos_paralelos > 1:
+                with etapa('inference'):  # tempo de parede: os trechos rodam em paralelo nos workers
+                    resultado = transcrever_em_trechos(audio_data, sr, modelo, opcoes, trechos_paralelos, verboso)
+            elif bloco_checkpoint > 0 and len(audio_data) / sr > bloco_checkpoint:
+                from cache_transcricao import gerar_chave, hash_arquivo
+                chave_checkpoint = chave_cache or gerar_chave(
+                    sha256 or hash_arquivo(arquivo), modelo,
+                    opcoes_chave_cache(opcoes, usar_vad=usar_vad, bloco_checkpoint=bloco_checkpoint)
+                )
+                resultado = transcrever_com_checkpoint(model, audio_data, sr, modelo, opcoes, chave_checkpoint,
+                                                       bloco_checkpoint, diretorio_checkpoint, verboso)
+            else:
+                with etapa('inference'):
+                    resultado_whisper = model.transcribe(audio_data, **opcoes)
+                
+                # Mesmo formato usado pela API (motor_inferencia.transcrever_arquivo)
+                resultado = {
+                    'text': resultado_whisper['text'],
+                    'segments': [
+                        {'start': seg['start'], 'end': seg['end'], 'text': seg['text']}
+                        for seg in resultado_whisper.get('segments', [])
+                    ],
+                    'language': resultado_whisper.get('language'),
+                    'duration': duracao
+                }
+            
+            fim = time.time()
+            duracao_processamento = fim - inicio
+            
+            if mapa_vad is not None:
+                from deteccao_voz import remapear_resultado
+                remapear_resultado(resultado, mapa_vad)
+            resultado['duration'] = duracao
+            resultado['inference_time'] = duracao_processamento
+            resultado['vad'] = info_vad
+            if cache is not None:
+                cache.guardar(chave_cache, resultado)
+            resultado['timings'] = cronometro.como_dict()
         
-        # Extrair dados
+        # Salvar resultado
+        stats = salvar_resultado(arquivo, arquivo_saida, modelo, resultado, duracao_processamento,
+                                 verificacao['tamanho_mb'], label, incluir_timestamps)
         texto = resultado["text"]
-        segmentos = resultado.get("segments", [])
-        idioma_detectado = resultado.get("language", "desconhecido")
-        
-        # Estatísticas
-        palavras = len(texto.split())
-        chars = len(texto)
-        velocidade = duracao / duracao_processamento if duracao_processamento > 0 else 0
         
         if verboso:
             print(f"\n{'='*70}")
@@ -260,25 +420,12 @@ def transcrever_audio_avancado(
             print(f"{'='*70}")
             print(f"⏱️  Tempo: {duracao_processamento:.1f}s ({duracao_processamento/60:.1f} min)")
             print(f"🎵 Áudio: {duracao:.1f}s ({duracao/60:.1f} min)")
-            print(f"⚡ Velocidade: {velocidade:.1f}x tempo real")
-            print(f"🌍 Idioma detectado: {idioma_detectado}")
-            print(f"📝 Caracteres: {chars:,}")
-            print(f"🔤 Palavras: {palavras:,}")
-        
-        # Salvar resultado
-        salvar_transcricao_completa(
-            arquivo_saida, arquivo, modelo, texto, segmentos,
-            {
-                'duracao_audio': duracao,
-                'tempo_processamento': duracao_processamento,
-                'velocidade': velocidade,
-                'palavras': palavras,
-                'caracteres': chars,
-                'idioma_detectado': idioma_detectado,
-                'tamanho_arquivo_mb': verificacao['tamanho_mb']
-            },
-            label, incluir_timestamps
-        )
+            print(f"⚡ Velocidade: {stats['velocidade']:.1f}x tempo real")
+            print(f"🌍 Idioma detectado: {stats['idioma_detectado']}")
+            print(f"📝 Caracteres: {stats['caracteres']:,}")
+            print(f"🔤 Palavras: {stats['palavras']:,}")
+            if cronometro.tempos:
+                print(f"🧭 Etapas: {cronometro.formatar()}")
         
         if verboso:
             print(f"\n📂 Resultado salvo em:")
@@ -298,10 +445,12 @@ def transcrever_audio_avancado(
             'estatisticas': {
                 'duracao_audio': duracao,
                 'tempo_processamento': duracao_processamento,
-                'velocidade': velocidade,
-                'palavras': palavras,
-                'caracteres': chars,
-                'idioma_detectado': idioma_detectado
+                'velocidade': stats['velocidade'],
+                'palavras': stats['palavras'],
+                'caracteres': stats['caracteres'],
+                'idioma_detectado': stats['idioma_detectado'],
+                'silencio_pulado': resultado['vad']['skipped_seconds'] if resultado.get('vad') else 0.0,
+                'etapas': cronometro.como_dict()
             }
         }
         
@@ -313,6 +462,330 @@ def transcrever_audio_avancado(
             print(f"\nDetalhes:")
             print(traceback.format_exc())
         return None
+    finally:
+        cronometro.desativar()
+
+def listar_arquivos_lote(diretorio: str, padrao: str = '*') -> List[str]:
+    """Arquivos suportados no diretório que casam com o padrão glob (ex: '**/*.mp3')"""
+    return [
+        str(caminho) for caminho in sorted(Path(diretorio).glob(padrao))
+        if caminho.is_file() and caminho.suffix.lower() in FORMATOS_SUPORTADOS
+    ]
+
+def _resultados_futuros(pendentes: Dict) -> Iterator:
+    """(contexto, resultado, erro) de cada futuro, na ordem de conclusão"""
+    from concurrent.futures import as_completed
+    
+    for futuro in as_completed(pendentes):
+        try:
+            yield pendentes[futuro], futuro.result(), None
+        except Exception as e:
+            erro = str(e).strip()
+            yield pendentes[futuro], None, erro.splitlines()[0] if erro else type(e).__name__
+
+def transcrever_lote(
+    arquivos: List[str],
+    modelo: str = "base",
+    diretorio_saida: str = DIRETORIO_SAIDA_PADRAO,
+    label: str = "",
+    idioma: str = "pt",
+    incluir_timestamps: bool = True,
+    temperatura: float = 0.0,
+    jobs: int = 1,
+    verboso: bool = True,
+    usar_cache: bool = True,
+    diretorio_cache: Optional[str] = None,
+    usar_cache_pcm: bool = False,
+    usar_vad: bool = False,
+    caminho_manifesto: Optional[str] = None,
+    usar_manifesto: bool = True,
+    decodificadores: int = 2
+) -> Dict:
+    """
+    Modo lote: cada worker do pool carrega o modelo uma vez e os arquivos
+    são processados em paralelo; a saída usa o mesmo formato do modo arquivo único.
+    Com o manifesto, uma nova execução pula os arquivos já concluídos.
+    Com `decodificadores` > 0, threads decodificam os próximos arquivos
+    enquanto os workers transcrevem (pipeline_lote).
+    """
+    from motor_inferencia import MotorInferencia, transcrever_arquivo
+    from cache_transcricao import cache_padrao, gerar_chave, hash_arquivo
+    from manifesto_lote import ManifestoLote, NOME_MANIFESTO, STATUS_CONCLUIDO, STATUS_FALHOU
+    
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    print("🎯 TRANSCRITOR AVANÇADO - MODO LOTE")
+    print("=" * 70)
+    print(f"📁 Arquivos: {len(arquivos)}")
+    print(f"🤖 Modelo: {modelo}")
+    print(f"⚙️  Workers: {jobs} x {threads} threads")
+    print(f"📂 Saída: {diretorio_saida}")
+    print("=" * 70)
+    
+    opcoes = montar_opcoes_whisper(idioma, temperatura, incluir_timestamps)
+    opcoes_chave = opcoes_chave_cache(opcoes, usar_vad=usar_vad)
+    dir_saida = criar_diretorio_saida(diretorio_saida, label)
+    cache = cache_padrao(diretorio_cache) if usar_cache else None
+    if usar_cache_pcm:
+        from cache_pcm import configurar_cache_pcm
+        configurar_cache_pcm(ativo=True)  # antes de criar o pool: os workers herdam o ambiente
+    manifesto = ManifestoLote(caminho_manifesto or dir_saida / NOME_MANIFESTO) if usar_manifesto else None
+    if manifesto is not None:
+        print(f"📒 Manifesto: {manifesto.caminho}")
+    
+    resumo = {'arquivos': len(arquivos), 'sucesso': 0, 'falhas': 0, 'cache': 0, 'pulados': 0,
+              'duracao_audio': 0.0, 'saidas': []}
+    
+    def concluir(arquivo: str, resultado: Dict, tamanho_mb: float, origem: str,
+                 saida_anterior: Optional[str] = None, sha256: Optional[str] = None):
+        # Refazendo um item do manifesto: sobrescreve a saída registrada em vez de criar _1, _2...
+        arquivo_saida = saida_anterior or gerar_nome_arquivo_saida(arquivo, label, dir_saida)
+        stats = salvar_resultado(arquivo, arquivo_saida, modelo, resultado, resultado['inference_time'],
+                                 tamanho_mb, label, incluir_timestamps)
+        if manifesto is not None:
+            manifesto.registrar(arquivo, modelo, opcoes_chave, STATUS_CONCLUIDO, saida=arquivo_saida, sha256=sha256)
+        resumo['sucesso'] += 1
+        resumo['duracao_audio'] += stats['duracao_audio']
+        resumo['saidas'].append(arquivo_saida)
+        if verboso:
+            feitos = resumo['sucesso'] + resumo['falhas'] + resumo['pulados']
+            print(f"[{feitos}/{len(arquivos)}] {origem} {Path(arquivo).name} "
+                  f"({stats['duracao_audio']:.0f}s, {stats['velocidade']:.1f}x) → {arquivo_saida}")
+    
+    def falhar(arquivo: str, erro: str, sha256: Optional[str] = None):
+        if manifesto is not None:
+            manifesto.registrar(arquivo, modelo, opcoes_chave, STATUS_FALHOU, erro=erro, sha256=sha256)
+        resumo['falhas'] += 1
+        print(f"[{resumo['sucesso'] + resumo['falhas'] + resumo['pulados']}/{len(arquivos)}] ❌ {Path(arquivo).name}: {erro}")
+    
+    inicio = time.time()
+    motor = pipeline = None
+    a_transcrever = []
+    try:
+        for arquivo in arquivos:
+            saida_anterior = sha256 = None
+            if manifesto is not None:
+                estado = manifesto.verificar(arquivo, modelo, opcoes_chave)
+                if estado['concluido']:
+                    resumo['pulados'] += 1
+                    resumo['saidas'].append(estado['saida'])
+                    continue
+                saida_anterior, sha256 = estado['saida'], estado['sha256']
+            
+            verificacao = verificar_arquivo(arquivo)
+            if not verificacao['valido']:
+                falhar(arquivo, verificacao['erro'])
+                continue
+            
+            chave_cache = None
+            if cache is not None:
+                sha256 = sha256 or hash_arquivo(arquivo)
+                chave_cache = gerar_chave(sha256, modelo, opcoes_chave)
+                resultado = cache.obter(chave_cache)
+                if resultado is not None:
+                    resumo['cache'] += 1
+                    concluir(arquivo, resultado, verificacao['tamanho_mb'], '💾', saida_anterior, sha256)
+                    continue
+            
+            a_transcrever.append((arquivo, sha256, (arquivo, verificacao['tamanho_mb'], chave_cache, saida_anterior, sha256)))
+        
+        # Pool criado só quando há trabalho de verdade (lote todo em cache = nenhum modelo carregado)
+        if a_transcrever:
+            motor = MotorInferencia(num_workers=jobs, threads_por_worker=threads, modelos_precarregar=[modelo])
+            motor.iniciar()
+        
+        if not a_transcrever:
+            concluidos = []  # lote todo pulado (manifesto) ou em cache: sem pool nem pipeline
+        elif decodificadores > 0:
+            from pipeline_lote import PipelineLote
+            pipeline = PipelineLote(motor, modelo, opcoes, decodificadores=decodificadores, vad=usar_vad)
+            concluidos = pipeline.executar(a_transcrever)
+        else:
+            pendentes = {
+                motor.submeter(transcrever_arquivo, arquivo, modelo, opcoes, '', sha256, usar_vad): contexto
+                for arquivo, sha256, contexto in a_transcrever
+            }
+            concluidos = _resultados_futuros(pendentes)
+        
+        for (arquivo, tamanho_mb, chave_cache, saida_anterior, sha256), resultado, erro in concluidos:
+            if erro is not None:
+                falhar(arquivo, erro, sha256)
+                continue
+            if cache is not None:
+                cache.guardar(chave_cache, resultado)
+            concluir(arquivo, resultado, tamanho_mb, '✅', saida_anterior, sha256)
+    finally:
+        if motor is not None:
+            motor.encerrar()
+        if manifesto is not None:
+            manifesto.fechar()
+    
+    tempo_total = time.time() - inicio
+    resumo['tempo_total'] = tempo_total
+    resumo['arquivos_por_hora'] = resumo['sucesso'] / tempo_total * 3600 if tempo_total > 0 else 0.0
+    resumo['horas_audio_por_hora'] = resumo['duracao_audio'] / tempo_total if tempo_total > 0 else 0.0
+    
+    print(f"\n{'='*70}")
+    print("📊 RESUMO DO LOTE")
+    print(f"{'='*70}")
+    print(f"✅ Sucesso: {resumo['sucesso']}/{resumo['arquivos']} (💾 {resumo['cache']} do cache)")
+    if resumo['pulados']:
+        print(f"⏭️  Já concluídos (manifesto): {resumo['pulados']}")
+    if resumo['falhas']:
+        print(f"❌ Falhas: {resumo['falhas']}")
+    print(f"⏱️  Tempo total: {tempo_total:.1f}s ({tempo_total/60:.1f} min)")
+    print(f"🎵 Áudio: {resumo['duracao_audio']/3600:.2f} h")
+    print(f"🚀 Vazão: {resumo['arquivos_por_hora']:.0f} arquivos/h, "
+          f"{resumo['horas_audio_por_hora']:.1f} h de áudio/h")
+    if pipeline is not None and a_transcrever:
+        etapas = pipeline.estatisticas()
+        resumo['pipeline'] = etapas
+        print(f"🏭 Pipeline: decodificação {etapas['utilizacao_decodificacao']:.0%} "
+              f"({etapas['decodificadores']} threads), inferência {etapas['utilizacao_inferencia']:.0%} "
+              f"({etapas['workers_inferencia']} workers) → gargalo: {etapas['gargalo']}")
+        print(f"   Espera média na fila: {etapas['tempo_fila'] / max(1, etapas['arquivos']):.1f}s, "
+              f"máx. {etapas['max_em_voo']} arquivos em memória")
+    return resumo
+
+def mover_para(arquivo: str, diretorio: Path) -> str:
+    """Move o arquivo processado sem sobrescrever outro de mesmo nome"""
+    import shutil
+    
+    diretorio.mkdir(parents=True, exist_ok=True)
+    destino = diretorio / Path(arquivo).name
+    if destino.exists():
+        destino = diretorio / f"{Path(arquivo).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{Path(arquivo).suffix}"
+    return shutil.move(arquivo, destino)
+
+def vigiar_pasta(
+    diretorio: str,
+    modelo: str = "base",
+    diretorio_saida: str = DIRETORIO_SAIDA_PADRAO,
+    label: str = "",
+    idioma: str = "pt",
+    incluir_timestamps: bool = True,
+    temperatura: float = 0.0,
+    jobs: int = 1,
+    dir_concluidos: Optional[str] = None,
+    dir_falhas: Optional[str] = None,
+    estabilidade: float = 2.0,
+    intervalo: float = 1.0,
+    usar_cache: bool = True,
+    diretorio_cache: Optional[str] = None,
+    usar_cache_pcm: bool = False,
+    usar_vad: bool = False
+):
+    """
+    Modo daemon: o modelo fica residente nos workers e cada arquivo novo
+    (depois de parar de crescer) é transcrito e movido para concluídos/falhas
+    """
+    from motor_inferencia import MotorInferencia, transcrever_arquivo
+    from cache_transcricao import cache_padrao, gerar_chave, hash_arquivo
+    from vigia_pasta import VigiaPasta
+    
+    def log(mensagem: str):
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {mensagem}", flush=True)
+    
+    pasta_concluidos = Path(dir_concluidos) if dir_concluidos else Path(diretorio) / 'concluidos'
+    pasta_falhas = Path(dir_falhas) if dir_falhas else Path(diretorio) / 'falhas'
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    opcoes = montar_opcoes_whisper(idioma, temperatura, incluir_timestamps)
+    dir_saida = criar_diretorio_saida(diretorio_saida, label)
+    cache = cache_padrao(diretorio_cache) if usar_cache else None
+    if usar_cache_pcm:
+        from cache_pcm import configurar_cache_pcm
+        configurar_cache_pcm(ativo=True)  # antes de criar o pool: os workers herdam o ambiente
+    
+    print("🎯 TRANSCRITOR AVANÇADO - MODO VIGIA")
+    print("=" * 70)
+    print(f"👀 Pasta: {diretorio}")
+    print(f"🤖 Modelo: {modelo} ({jobs} workers x {threads} threads)")
+    print(f"📂 Saída: {diretorio_saida}")
+    print(f"✅ Concluídos: {pasta_concluidos}")
+    print(f"❌ Falhas: {pasta_falhas}")
+    print("=" * 70)
+    
+    motor = MotorInferencia(num_workers=jobs, threads_por_worker=threads, modelos_precarregar=[modelo])
+    motor.iniciar()
+    vigia = VigiaPasta(diretorio, extensoes=FORMATOS_SUPORTADOS, estabilidade=estabilidade)
+    log(f"👀 Aguardando arquivos (detecção: {vigia.modo}, estabilidade: {estabilidade:.0f}s) - Ctrl+C para sair")
+    
+    em_andamento = {}  # futuro -> (arquivo, detectado_em, enviado_em, tamanho_mb, chave_cache)
+    stats = {'concluidos': 0, 'falhas': 0}
+    ultima_fila = None
+    
+    def finalizar(arquivo: str, detectado_em: float, resultado: Optional[Dict], tamanho_mb: float,
+                  erro: str = '', espera: float = 0.0):
+        latencia = time.time() - detectado_em  # detecção → transcrição salva
+        try:
+            if resultado is not None:
+                arquivo_saida = gerar_nome_arquivo_saida(arquivo, label, dir_saida)
+                info = salvar_resultado(arquivo, arquivo_saida, modelo, resultado, resultado['inference_time'],
+                                        tamanho_mb, label, incluir_timestamps)
+                mover_para(arquivo, pasta_concluidos)
+                stats['concluidos'] += 1
+                log(f"✅ {Path(arquivo).name}: {info['duracao_audio']:.0f}s de áudio, latência {latencia:.1f}s "
+                    f"(espera no pool {espera:.1f}s) → {arquivo_saida}")
+            else:
+                mover_para(arquivo, pasta_falhas)
+                stats['falhas'] += 1
+                log(f"❌ {Path(arquivo).name}: {erro} (latência {latencia:.1f}s)")
+        except OSError as e:
+            # Arquivo apagado, disco cheio, sem permissão: um arquivo ruim não derruba o vigia
+            stats['falhas'] += 1
+            log(f"❌ {Path(arquivo).name}: {erro + '; ' if erro else ''}{type(e).__name__}: {e}")
+            vigia.esquecer(arquivo)
+    
+    try:
+        while True:
+            vigia.aguardar(intervalo)
+            
+            for arquivo, detectado_em in vigia.prontos():
+                verificacao = verificar_arquivo(arquivo)
+                if not verificacao['valido']:
+                    finalizar(arquivo, detectado_em, None, 0.0, verificacao['erro'])
+                    continue
+                
+                chave_cache = sha256 = None
+                if cache is not None:
+                    try:
+                        sha256 = hash_arquivo(arquivo)
+                        chave_cache = gerar_chave(sha256, modelo, opcoes_chave_cache(opcoes, usar_vad=usar_vad))
+                        resultado = cache.obter(chave_cache)
+                    except OSError as e:
+                        finalizar(arquivo, detectado_em, None, verificacao['tamanho_mb'], f"{type(e).__name__}: {e}")
+                        continue
+                    if resultado is not None:
+                        finalizar(arquivo, detectado_em, resultado, verificacao['tamanho_mb'])
+                        continue
+                
+                futuro = motor.submeter(transcrever_arquivo, arquivo, modelo, opcoes,
+                                        verificacao['extensao'], sha256, usar_vad)
+                em_andamento[futuro] = (arquivo, detectado_em, time.time(), verificacao['tamanho_mb'], chave_cache)
+            
+            for futuro in [f for f in em_andamento if f.done()]:
+                arquivo, detectado_em, enviado_em, tamanho_mb, chave_cache = em_andamento.pop(futuro)
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    erro = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+                    finalizar(arquivo, detectado_em, None, tamanho_mb, erro)
+                    continue
+                if cache is not None:
+                    cache.guardar(chave_cache, resultado)
+                espera = max(0.0, time.time() - enviado_em - resultado['inference_time'])
+                finalizar(arquivo, detectado_em, resultado, tamanho_mb, espera=espera)
+            
+            # Profundidade da fila: só registra quando muda
+            fila = (vigia.crescendo, len(em_andamento))
+            if fila != ultima_fila:
+                log(f"📥 Fila: {fila[0]} crescendo, {fila[1]} em transcrição "
+                    f"({stats['concluidos']} concluídos, {stats['falhas']} falhas)")
+                ultima_fila = fila
+    except KeyboardInterrupt:
+        log(f"🛑 Encerrando ({len(em_andamento)} arquivos em andamento ficam na pasta para a próxima execução)")
+    finally:
+        vigia.fechar()
+        motor.encerrar()
 
 def salvar_transcricao_completa(arquivo_saida, arquivo_original, modelo, texto, segmentos, stats, label, incluir_timestamps):
     """Salva transcrição com metadados completos"""
@@ -331,6 +804,12 @@ def salvar_transcricao_completa(arquivo_saida, arquivo_original, modelo, texto,
         f.write(f"⚡ Velocidade: {stats['velocidade']:.1f}x tempo real\n")
         f.write(f"📊 Arquivo: {stats['tamanho_arquivo_mb']:.2f} MB\n")
         f.write(f"📊 Estatísticas: {stats['caracteres']:,} chars, {stats['palavras']:,} palavras\n")
+        if stats.get('vad'):
+            f.write(f"🗣️  VAD: {stats['vad']['skipped_seconds']:.1f}s de silêncio pulados ({stats['vad']['regions']} regiões de fala)\n")
+        if stats.get('etapas'):
+            # A gravação deste arquivo (output) termina depois do cabeçalho e não entra aqui
+            etapas = ' | '.join(f"{nome} {segundos:.2f}s" for nome, segundos in stats['etapas'].items())
+            f.write(f"🧭 Etapas: {etapas}\n")
         f.write("=" * 80 + "\n\n")
         
         # Transcrição principal
@@ -356,6 +835,17 @@ def salvar_transcricao_completa(arquivo_saida, arquivo_original, modelo, texto,
         f.write(f"\n" + "=" * 80 + "\n")
         f.write("Gerado por: Transcritor Avançado CLI v2.0\n")
 
+def salvar_perfil(perfil, base: str, verboso: bool = True) -> Dict[str, str]:
+    """Grava <base>.pstats e <base>.collapsed e mostra as funções mais quentes"""
+    arquivos = perfil.gravar(base)
+    if verboso:
+        perfil.imprimir_principais()
+    print(f"\n🔬 Perfil salvo em:")
+    if 'pstats' in arquivos:
+        print(f"   {arquivos['pstats']}  (python -m pstats / snakeviz)")
+    print(f"   {arquivos['collapsed']}  (flamegraph.pl / speedscope)")
+    return arquivos
+
 def criar_parser():
     """Cria parser de argumentos CLI"""
     parser = argparse.ArgumentParser(
@@ -367,6 +857,10 @@ Exemplos de uso:
   python transcritor_avancado_cli.py --file video.mp4 --model small --label reuniao
   python transcritor_avancado_cli.py --file podcast.wav --out-dir ./transcricoes --language en
   python transcritor_avancado_cli.py --file aula.m4a --label aula01 --no-timestamps
+  python transcritor_avancado_cli.py --file podcast_2h.mp3 --parallel-chunks 4
+  python transcritor_avancado_cli.py --input-dir ./gravacoes --glob '**/*.mp3' --jobs 4
+  python transcritor_avancado_cli.py --watch /srv/gravador --jobs 2
+  python transcritor_avancado_cli.py --file aula.mp3 --profile
   python transcritor_avancado_cli.py --list-models
         """
     )
@@ -376,6 +870,79 @@ Exemplos de uso:
         help='Caminho do arquivo de áudio/vídeo para transcrever'
     )
     
+    parser.add_argument(
+        '--input-dir', '-i',
+        help='Modo lote: transcreve todos os arquivos suportados do diretório'
+    )
+    
+    parser.add_argument(
+        '--glob',
+        default='*',
+        help="Padrão de arquivos no modo lote, relativo a --input-dir (padrão: '*'; recursivo: '**/*')"
+    )
+    
+    parser.add_argument(
+        '--checkpoint-every',
+        type=float,
+        default=0.0,
+        metavar='SEGUNDOS',
+        help='Áudios mais longos que isso são transcritos em blocos com checkpoint para retomar após queda '
+             '(padrão: 0 = desliga; ex.: 300)'
+    )
+    
+    parser.add_argument(
+        '--checkpoint-dir',
+        help='Diretório dos checkpoints (padrão: ~/.cache/transcritor/checkpoints)'
+    )
+    
+    parser.add_argument(
+        '--decoders',
+        type=int,
+        default=2,
+        help='Modo lote: threads que decodificam os próximos arquivos durante a inferência (padrão: 2, 0 = decodifica no worker)'
+    )
+    
+    parser.add_argument(
+        '--manifest',
+        help='Modo lote: manifesto SQLite para retomar execuções (padrão: <out-dir>/.manifesto_lote.sqlite3)'
+    )
+    
+    parser.add_argument(
+        '--no-manifest',
+        action='store_true',
+        help='Modo lote: não registra nem pula arquivos já concluídos'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        metavar='DIR',
+        help='Modo daemon: vigia o diretório e transcreve cada arquivo novo com o modelo residente'
+    )
+    
+    parser.add_argument(
+        '--done-dir',
+        help='Modo vigia: para onde mover os arquivos transcritos (padrão: DIR/concluidos)'
+    )
+    
+    parser.add_argument(
+        '--failed-dir',
+        help='Modo vigia: para onde mover os arquivos com erro (padrão: DIR/falhas)'
+    )
+    
+    parser.add_argument(
+        '--settle-seconds',
+        type=float,
+        default=2.0,
+        help='Modo vigia: segundos sem crescer antes de transcrever um arquivo (padrão: 2)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Modos lote/vigia: processos de inferência, cada um com o modelo carregado uma vez (padrão: 1)'
+    )
+    
     parser.add_argument(
         '--model', '-m',
         choices=MODELOS_WHISPER,
@@ -420,6 +987,53 @@ Exemplos de uso:
         help='Modo silencioso (menos output)'
     )
     
+    parser.add_argument(
+        '--resampler',
+        choices=['soxr_hq', 'soxr_mq', 'soxr_qq', 'polyphase', 'none'],
+        default=None,
+        help='Reamostrador para 16 kHz: soxr_hq (padrão), soxr_mq, soxr_qq (mais rápido), polyphase ou none (fonte já em 16 kHz)'
+    )
+    
+    parser.add_argument(
+        '--parallel-chunks',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Corta áudios longos no silêncio e transcreve os trechos em N processos (padrão: desativado)'
+    )
+    
+    parser.add_argument(
+        '--vad',
+        action='store_true',
+        help='Detecta as regiões com fala e pula o silêncio antes do Whisper'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Não consultar/gravar o cache de resultados'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Diretório do cache de resultados (padrão: $TRANSCRITOR_CACHE_DIR ou ~/.cache/transcritor/resultados)'
+    )
+    
+    parser.add_argument(
+        '--pcm-cache',
+        action='store_true',
+        help='Reutiliza o PCM decodificado de execuções anteriores (.npy em $TRANSCRITOR_PCM_CACHE_DIR '
+             'ou ~/.cache/transcritor/pcm; padrão: desligado)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Perfila a transcrição (cProfile + amostras de pilha): grava .pstats e .collapsed junto da saída '
+             'e mostra as funções mais quentes. Ignora o cache de resultados; só com --file'
+    )
+    
     parser.add_argument(
         '--list-models',
         action='store_true',
@@ -460,26 +1074,112 @@ def main():
         return
     
     # Verificar se arquivo foi especificado
-    if not args.file:
-        print("❌ ERRO: Especifique um arquivo com --file")
+    if not args.file and not args.input_dir and not args.watch:
+        print("❌ ERRO: Especifique um arquivo com --file ou um diretório com --input-dir/--watch")
         print("Use --help para ver todas as opções")
         sys.exit(1)
     
+    # Validar argumentos antes de qualquer import pesado
+    if args.file and not args.input_dir and not args.watch:
+        verificacao = verificar_arquivo(args.file)
+        if not verificacao['valido']:
+            print(f"❌ {verificacao['erro']}")
+            sys.exit(1)
+    for diretorio in (args.input_dir, args.watch):
+        if diretorio and not os.path.isdir(diretorio):
+            print(f"❌ Diretório não encontrado: {diretorio}")
+            sys.exit(1)
+    if args.profile and (args.input_dir or args.watch):
+        print("❌ --profile funciona com --file: nos modos lote/vigia a inferência roda em outros processos")
+        sys.exit(1)
+    
     # Verificar dependências
     if not verificar_dependencias():
         sys.exit(1)
     
+    if args.resampler:
+        from decodificacao_audio import configurar_reamostrador
+        configurar_reamostrador(args.resampler)  # via ambiente: vale também para os workers
+    
+    if args.watch:
+        vigiar_pasta(
+            args.watch,
+            modelo=args.model,
+            diretorio_saida=args.out_dir,
+            label=args.label,
+            idioma=args.language,
+            incluir_timestamps=not args.no_timestamps,
+            temperatura=args.temperature,
+            jobs=max(1, args.jobs),
+            dir_concluidos=args.done_dir,
+            dir_falhas=args.failed_dir,
+            estabilidade=args.settle_seconds,
+            usar_cache=not args.no_cache,
+            diretorio_cache=args.cache_dir,
+            usar_cache_pcm=args.pcm_cache,
+            usar_vad=args.vad
+        )
+        sys.exit(0)
+    
+    if args.input_dir:
+        arquivos = listar_arquivos_lote(args.input_dir, args.glob)
+        if not arquivos:
+            print(f"❌ Nenhum arquivo suportado em {args.input_dir} com o padrão '{args.glob}'")
+            sys.exit(1)
+        
+        resumo = transcrever_lote(
+            arquivos,
+            modelo=args.model,
+            diretorio_saida=args.out_dir,
+            label=args.label,
+            idioma=args.language,
+            incluir_timestamps=not args.no_timestamps,
+            temperatura=args.temperature,
+            jobs=max(1, args.jobs),
+            verboso=not args.quiet,
+            usar_cache=not args.no_cache,
+            diretorio_cache=args.cache_dir,
+            usar_cache_pcm=args.pcm_cache,
+            usar_vad=args.vad,
+            caminho_manifesto=args.manifest,
+            usar_manifesto=not args.no_manifest,
+            decodificadores=max(0, args.decoders)
+        )
+        sys.exit(0 if resumo['falhas'] == 0 else 1)
+    
+    perfil = None
+    if args.profile:
+        from perfilador import Perfilador
+        perfil = Perfilador()
+        if args.parallel_chunks > 1:
+            print("⚠️  --profile com --parallel-chunks: o perfil cobre só este processo, não os workers")
+    
     # Executar transcrição
-    resultado = transcrever_audio_avancado(
-        arquivo=args.file,
-        modelo=args.model,
-        diretorio_saida=args.out_dir,
-        label=args.label,
-        idioma=args.language,
-        incluir_timestamps=not args.no_timestamps,
-        temperatura=args.temperature,
-        verboso=not args.quiet
-    )
+    with perfil or nullcontext():
+        resultado = transcrever_audio_avancado(
+            arquivo=args.file,
+            modelo=args.model,
+            diretorio_saida=args.out_dir,
+            label=args.label,
+            idioma=args.language,
+            incluir_timestamps=not args.no_timestamps,
+            temperatura=args.temperature,
+            verboso=not args.quiet,
+            usar_cache=not args.no_cache and not args.profile,  # um acerto de cache não diz nada sobre o tempo
+            diretorio_cache=args.cache_dir,
+            usar_cache_pcm=args.pcm_cache,
+            trechos_paralelos=args.parallel_chunks,
+            usar_vad=args.vad,
+            bloco_checkpoint=args.checkpoint_every,
+            diretorio_checkpoint=args.checkpoint_dir
+        )
+    
+    if perfil is not None:
+        if resultado and resultado['sucesso']:
+            base = os.path.splitext(resultado['arquivo_saida'])[0]
+        else:
+            base = os.path.join(args.out_dir, f"perfil_{Path(args.file).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        salvar_perfil(perfil, base, verboso=not args.quiet)
     
     if resultado and resultado['sucesso']:
         if not args.quiet:
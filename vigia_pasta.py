@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+👀 VIGIA DE PASTA
+=================
+Detecta arquivos novos num diretório e só os entrega quando pararam de
+crescer (gravadores e cópias de rede escrevem aos poucos):
+- Linux com inotify_simple: eventos CLOSE_WRITE/MOVED_TO, sem varrer a pasta
+  (MOVED_FROM/DELETE tiram o arquivo da lista de já entregues)
+- Demais casos: varredura periódica com os.scandir
+
+Nos dois modos um arquivo só fica pronto depois de `estabilidade` segundos
+com tamanho e mtime inalterados.
+
+Uso:
+    vigia = VigiaPasta('/gravacoes', extensoes={'.mp3', '.wav'})
+    while True:
+        vigia.aguardar(1.0)
+        for caminho, detectado_em in vigia.prontos():
+            ...
+"""
+
+import os
+import time
+from typing import Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_DISPONIVEL = True
+except ImportError:
+    INOTIFY_DISPONIVEL = False
+
+class VigiaPasta:
+    """Fila de arquivos novos no diretório, liberados quando estáveis"""
+
+    def __init__(self, diretorio: str, extensoes: Optional[Iterable[str]] = None,
+                 estabilidade: float = 2.0, usar_inotify: bool = True):
+        self.diretorio = os.path.abspath(diretorio)
+        self.extensoes = {ext.lower() for ext in extensoes} if extensoes else None
+        self.estabilidade = estabilidade
+        self._candidatos: Dict[str, Dict[str, Any]] = {}
+        self._entregues: Set[str] = set()  # evita reentregar enquanto o arquivo não sai da pasta
+        self._inotify = None
+
+        if usar_inotify and INOTIFY_DISPONIVEL:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(self.diretorio, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+                                        | inotify_flags.MOVED_FROM | inotify_flags.DELETE)
+            except OSError:
+                self._inotify = None  # ex.: limite de watches, sistema de arquivos de rede
+
+        # Arquivos que já estavam na pasta também entram na fila
+        self._varrer()
+
+    @property
+    def modo(self) -> str:
+        return 'inotify' if self._inotify is not None else 'polling'
+
+    @property
+    def crescendo(self) -> int:
+        """Arquivos detectados que ainda não estabilizaram"""
+        return len(self._candidatos)
+
+    def _aceitar(self, nome: str) -> bool:
+        if nome.startswith('.'):
+            return False
+        return self.extensoes is None or os.path.splitext(nome)[1].lower() in self.extensoes
+
+    def _adicionar(self, caminho: str):
+        if caminho not in self._candidatos and caminho not in self._entregues:
+            self._candidatos[caminho] = {'tamanho': -1, 'mtime': -1, 'desde': time.time(),
+                                         'detectado': time.time()}
+
+    def _varrer(self):
+        presentes = set()
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and self._aceitar(entrada.name):
+                    presentes.add(entrada.path)
+                    self._adicionar(entrada.path)
+        # Arquivo removido/movido pode voltar com o mesmo nome
+        self._entregues &= presentes
+
+    def aguardar(self, timeout: float):
+        """Espera eventos (inotify) ou o intervalo de varredura (polling)"""
+        if self._inotify is None:
+            time.sleep(timeout)
+            self._varrer()
+            return
+
+        for evento in self._inotify.read(timeout=int(timeout * 1000)):
+            if evento.name and self._aceitar(evento.name):
+                caminho = os.path.join(self.diretorio, evento.name)
+                self._entregues.discard(caminho)
+                if evento.mask & (inotify_flags.MOVED_FROM | inotify_flags.DELETE):
+                    # Saiu da pasta (ex.: mover_para após processar): nada mais a lembrar
+                    self._candidatos.pop(caminho, None)
+                else:
+                    self._adicionar(caminho)
+
+    def prontos(self) -> Iterator[Tuple[str, float]]:
+        """Gera (caminho, instante da detecção) dos arquivos que pararam de crescer"""
+        agora = time.time()
+        for caminho, estado in list(self._candidatos.items()):
+            try:
+                info = os.stat(caminho)
+            except OSError:
+                del self._candidatos[caminho]  # sumiu antes de estabilizar
+                continue
+
+            if (info.st_size, info.st_mtime) != (estado['tamanho'], estado['mtime']):
+                estado.update(tamanho=info.st_size, mtime=info.st_mtime, desde=agora)
+                continue
+            if info.st_size > 0 and agora - estado['desde'] >= self.estabilidade:
+                del self._candidatos[caminho]
+                self._entregues.add(caminho)
+                yield caminho, estado['detectado']
+
+    def esquecer(self, caminho: str):
+        """
+        Para de acompanhar um arquivo que não pôde ser processado. Se ele ainda
+        está na pasta (não deu para movê-lo), continua como entregue e não volta
+        a ser oferecido até ser substituído.
+        """
+        self._candidatos.pop(caminho, None)
+        if os.path.exists(caminho):
+            self._entregues.add(caminho)
+        else:
+            self._entregues.discard(caminho)
+
+    def fechar(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None